@@ -10,6 +10,7 @@ import { miscService } from './services/misc.service';
 import { ajaxService } from './services/ajax.service';
 import { authService } from './services/auth.service';
 import { searchService } from './services/search.service';
+import { metadataService } from './services/metadata.service';
 
 export const api = {
 	client,
@@ -23,7 +24,8 @@ export const api = {
 	misc: miscService,
 	ajax: ajaxService,
 	auth: authService,
-	search: searchService
+	search: searchService,
+	metadata: metadataService
 };
 
 export * from './types/alert.types';
@@ -32,5 +34,6 @@ export * from './types/doi.types';
 export * from './types/galaxy.types';
 export * from './types/instrument.types';
 export * from './types/icecube.types';
+export * from './types/metadata.types';
 export * from './types/misc.types';
 export * from './types/pointing.types';
@@ -10,6 +10,7 @@ import type {
 	GradeCalculatorResult,
 	IceCubeNotice,
 	EventGalaxiesResult,
+	EventGalaxyInfoResult,
 	ScimmaXRTResult,
 	CandidateResult,
 	DOIRequestResult,
@@ -121,6 +122,13 @@ export const ajaxService = {
 		return response.data;
 	},
 
+	getEventGalaxyInfoAjax: async (id: number): Promise<EventGalaxyInfoResult> => {
+		const response = await client.get<EventGalaxyInfoResult>('/ajax_event_galaxy_info', {
+			params: { id }
+		});
+		return response.data;
+	},
+
 	getScimmaXRT: async (graceid: string): Promise<ScimmaXRTResult> => {
 		const response = await client.get<ScimmaXRTResult>('/ajax_scimma_xrt', { params: { graceid } });
 		return response.data;
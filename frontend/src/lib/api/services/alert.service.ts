@@ -1,4 +1,5 @@
 import client from '../client';
+import { metadataService } from './metadata.service';
 import type {
 	GWAlertSchema,
 	GWAlertQueryResponse,
@@ -32,11 +33,8 @@ export const alertService = {
 	},
 
 	getAlertFilterOptions: async (): Promise<GWAlertFilterOptionsResponse> => {
-		const response = await client.get<GWAlertFilterOptionsResponse>(
-			'/api/v1/alert_filter_options',
-			{ headers: { 'skip-auth': 'true' } }
-		);
-		return response.data;
+		const bundle = await metadataService.getMetadata();
+		return bundle.alert_filter_options;
 	},
 
 	postAlert: async (alert: GWAlertSchema): Promise<GWAlertSchema> => {
@@ -0,0 +1,30 @@
+import client from '../client';
+import type { MetadataBundleResponse } from '../types/metadata.types';
+
+// Loaders called together (e.g. every form option) share one request
+let inFlight: Promise<MetadataBundleResponse> | null = null;
+
+export const metadataService = {
+	/**
+	 * Alert filter options, all enums and all instruments in one response.
+	 * The server sends an ETag with no-cache, so repeat loads are 304 revalidations.
+	 */
+	getMetadata: (): Promise<MetadataBundleResponse> => {
+		if (!inFlight) {
+			inFlight = client
+				.get<MetadataBundleResponse>('/api/v1/metadata', {
+					headers: { 'skip-auth': 'true' }
+				})
+				.then((response) => response.data)
+				.finally(() => {
+					inFlight = null;
+				});
+		}
+		return inFlight;
+	},
+
+	getEnumOptions: async (enumType: string) => {
+		const bundle = await metadataService.getMetadata();
+		return bundle.enums[enumType] ?? [];
+	}
+};
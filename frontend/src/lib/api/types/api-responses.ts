@@ -173,6 +173,11 @@ export interface EventGalaxiesResult {
 	};
 }
 
+export interface EventGalaxyInfoResult {
+	name: string;
+	info: string;
+}
+
 // SCIMMA XRT types
 export interface ScimmaXRTSource {
 	name: string;
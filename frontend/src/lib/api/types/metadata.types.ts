@@ -0,0 +1,14 @@
+import type { GWAlertFilterOptionsResponse } from './alert.types';
+import type { InstrumentSchema } from './instrument.types';
+
+export interface EnumOptionSchema {
+	name: string;
+	value: string;
+	description?: string;
+}
+
+export interface MetadataBundleResponse {
+	alert_filter_options: GWAlertFilterOptionsResponse;
+	enums: Record<string, EnumOptionSchema[]>;
+	instruments: InstrumentSchema[];
+}
@@ -135,8 +135,9 @@ export async function submitInstrument(
  */
 export async function getInstruments(): Promise<InstrumentOption[]> {
 	try {
-		const response = await api.client.get(API_ENDPOINTS.instruments);
-		return response.data;
+		const bundle = await api.metadata.getMetadata();
+		// InstrumentOption predates the typed schema; the rows are the same
+		return bundle.instruments as unknown as InstrumentOption[];
 	} catch (error) {
 		console.error('Failed to load instruments:', error);
 		return [];
@@ -147,42 +148,36 @@ export async function getInstruments(): Promise<InstrumentOption[]> {
  * Get instrument type options
  */
 export async function getInstrumentTypeOptions(): Promise<EnumOption[]> {
-	const response = await api.client.get('/api/v1/enums/instrument_type');
-	return response.data.options.map(
-		(option: { name: string; value: string; description?: string }) => ({
-			name: option.name,
-			value: option.value,
-			description: option.description
-		})
-	);
+	const options = await api.metadata.getEnumOptions('instrument_type');
+	return options.map((option) => ({
+		name: option.name,
+		value: option.value,
+		description: option.description
+	}));
 }
 
 /**
  * Get footprint type options
  */
 export async function getFootprintTypeOptions(): Promise<EnumOption[]> {
-	const response = await api.client.get('/api/v1/enums/footprint_type');
-	return response.data.options.map(
-		(option: { name: string; value: string; description?: string }) => ({
-			name: option.name,
-			value: option.value,
-			description: option.description
-		})
-	);
+	const options = await api.metadata.getEnumOptions('footprint_type');
+	return options.map((option) => ({
+		name: option.name,
+		value: option.value,
+		description: option.description
+	}));
 }
 
 /**
  * Get footprint unit options
  */
 export async function getFootprintUnitOptions(): Promise<EnumOption[]> {
-	const response = await api.client.get('/api/v1/enums/footprint_unit');
-	return response.data.options.map(
-		(option: { name: string; value: string; description?: string }) => ({
-			name: option.name,
-			value: option.value,
-			description: option.description
-		})
-	);
+	const options = await api.metadata.getEnumOptions('footprint_unit');
+	return options.map((option) => ({
+		name: option.name,
+		value: option.value,
+		description: option.description
+	}));
 }
 
 /**
@@ -147,8 +147,17 @@ export async function loadPointingById(pointingId: number): Promise<PointingData
  * Get available Grace IDs
  */
 export async function getGraceIds(): Promise<GraceIdOption[]> {
-	const response = await api.client.get(`${API_ENDPOINTS.queryAlerts}?role=observation`);
-	const data = response.data;
+	// query_alerts returns at most 1000 alerts per response; follow the
+	// X-Next-Cursor continuation token until every page has been read
+	const data: { graceid: string; alternateid?: string }[] = [];
+	let cursor: string | undefined;
+	do {
+		const response = await api.client.get(API_ENDPOINTS.queryAlerts, {
+			params: { role: 'observation', cursor }
+		});
+		data.push(...response.data);
+		cursor = response.headers['x-next-cursor'];
+	} while (cursor);
 
 	// Process alerts to get unique Grace IDs
 	const graceIds = new Map<string, GraceIdOption>();
@@ -178,16 +187,17 @@ export async function getGraceIds(): Promise<GraceIdOption[]> {
  * Get available instruments
  */
 export async function getInstruments(): Promise<InstrumentOption[]> {
-	const response = await api.client.get(API_ENDPOINTS.instruments);
-	return response.data;
+	const bundle = await api.metadata.getMetadata();
+	// InstrumentOption predates the typed schema; the rows are the same
+	return bundle.instruments as unknown as InstrumentOption[];
 }
 
 /**
  * Get available bandpass options
  */
 export async function getBandpassOptions(): Promise<BandpassOption[]> {
-	const response = await api.client.get('/api/v1/enums/bandpass');
-	return response.data.options.map((option: { name: string; value: string }) => ({
+	const options = await api.metadata.getEnumOptions('bandpass');
+	return options.map((option) => ({
 		name: option.name,
 		value: option.value
 	}));
@@ -197,8 +207,8 @@ export async function getBandpassOptions(): Promise<BandpassOption[]> {
  * Get available depth unit options
  */
 export async function getDepthUnitOptions(): Promise<DepthUnitOption[]> {
-	const response = await api.client.get('/api/v1/enums/depth_unit');
-	return response.data.options.map((option: { name: string; value: string }) => ({
+	const options = await api.metadata.getEnumOptions('depth_unit');
+	return options.map((option) => ({
 		name: option.name,
 		value: option.value
 	}));
@@ -208,8 +218,8 @@ export async function getDepthUnitOptions(): Promise<DepthUnitOption[]> {
  * Get available pointing status options
  */
 export async function getPointingStatusOptions(): Promise<StatusOption[]> {
-	const response = await api.client.get('/api/v1/enums/pointing_status');
-	return response.data.options.map((option: { name: string; value: string }) => ({
+	const options = await api.metadata.getEnumOptions('pointing_status');
+	return options.map((option) => ({
 		name: option.name,
 		value: option.value
 	}));
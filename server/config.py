@@ -55,6 +55,9 @@ class Settings(BaseSettings):
     RECAPTCHA_PUBLIC_KEY: str = Field("", env="RECAPTCHA_PUBLIC_KEY")
     RECAPTCHA_PRIVATE_KEY: str = Field("", env="RECAPTCHA_PRIVATE_KEY")
     ZENODO_ACCESS_KEY: str = Field("", env="ZENODO_ACCESS_KEY")
+    # Run the DOI minting worker (which also purges expired idempotency keys)
+    # inside this API process
+    DOI_WORKER_ENABLED: bool = Field(True, env="DOI_WORKER_ENABLED")
 
     # AWS settings
     AWS_ACCESS_KEY_ID: str = Field("", env="AWS_ACCESS_KEY_ID")
@@ -75,14 +78,40 @@ class Settings(BaseSettings):
     OS_USER_DOMAIN_NAME: str = Field("Default", env="OS_USER_DOMAIN_NAME")
     OS_PROJECT_DOMAIN_NAME: str = Field("Default", env="OS_PROJECT_DOMAIN_NAME")
     OS_PROJECT_NAME: str = Field("", env="OS_PROJECT_NAME")
+    # Account/container Temp-URL-Key, needed to sign Swift TempURLs
+    OS_TEMP_URL_KEY: str = Field("", env="OS_TEMP_URL_KEY")
 
     # Storage settings
     STORAGE_BUCKET_SOURCE: str = Field("s3", env="STORAGE_BUCKET_SOURCE")
+    # Answer artifact downloads with a 302 to a pre-signed storage URL
+    STORAGE_REDIRECT_DOWNLOADS: bool = Field(False, env="STORAGE_REDIRECT_DOWNLOADS")
+    # Lifetime of pre-signed download URLs, in seconds
+    STORAGE_PRESIGN_EXPIRES: int = Field(300, env="STORAGE_PRESIGN_EXPIRES")
 
     # Development settings
     DEVELOPMENT_MODE: bool = Field(False, env="DEVELOPMENT_MODE")
     DEVELOPMENT_STORAGE_DIR: str = Field("./dev_storage", env="DEVELOPMENT_STORAGE_DIR")
 
+    # Alert product settings
+    # Build derived skymap products and GRB overlays when an alert is posted
+    ALERT_PRECOMPUTE_ENABLED: bool = Field(True, env="ALERT_PRECOMPUTE_ENABLED")
+    # NSIDEs of the float32 maps built on ingest (/gw_skymap_healpix)
+    SKYMAP_PRECOMPUTE_NSIDES: List[int] = [64, 128, 256]
+
+    # Directory of the memory-mapped GLADE index snapshot (/glade_top), built
+    # with `python -m server.utils.glade_index`; /glade_top is off when unset
+    GLADE_INDEX_DIR: str = Field("", env="GLADE_INDEX_DIR")
+
+    # Fermi TLE settings
+    # Directory of TLE files bulk-loaded at first use; downloaded sets are saved here
+    FERMI_TLE_DIR: str = Field("", env="FERMI_TLE_DIR")
+    # Never contact CelesTrak; use only the TLE files in FERMI_TLE_DIR
+    FERMI_TLE_OFFLINE: bool = Field(False, env="FERMI_TLE_OFFLINE")
+    # Download a fresh TLE when the closest stored epoch is further than this
+    FERMI_TLE_MAX_AGE_DAYS: float = Field(3.0, env="FERMI_TLE_MAX_AGE_DAYS")
+    # HEALPix order of the GBM/LAT visibility MOCs (8 is ~0.23 deg cells)
+    FERMI_MOC_ORDER: int = Field(8, env="FERMI_MOC_ORDER")
+
     # CORS settings
     CORS_ORIGINS: List[str] = ["*"]
     CORS_METHODS: List[str] = ["*"]
@@ -1,9 +1,123 @@
 """FastAPI database initialization script."""
 
 import os
+import logging
 from sqlalchemy import create_engine, text
 from server.db.database import Base, engine as default_engine
 from server.db.models import *  # Import all models to register them
+from server.db.migrations import run_migrations
+
+logger = logging.getLogger(__name__)
+
+# Schema additions that create_all() cannot apply to tables which already exist.
+# Every statement must be idempotent so it can run on each application start,
+# and cheap: columns and indexes on large tables belong in server.db.migrations.
+SCHEMA_STATEMENTS = [
+    # Performance index for pointing queries (matches Flask version)
+    "CREATE INDEX IF NOT EXISTS idx_pointing_status_id ON public.pointing(status, id);",
+    # Expiry scan for the idempotency key purge (the table only holds a day of keys)
+    "CREATE INDEX IF NOT EXISTS idx_idempotency_key_datecreated ON public.idempotency_key(datecreated);",
+    # Version counter for the /metadata bundle, bumped by every writer
+    "CREATE SEQUENCE IF NOT EXISTS public.metadata_version_seq;",
+    # Keyset pagination order for query_alerts
+    "DROP INDEX IF EXISTS public.idx_gw_alert_datecreated_id;",
+    "CREATE INDEX IF NOT EXISTS idx_gw_alert_datecreated_id_nulls_last "
+    "ON public.gw_alert(datecreated DESC NULLS LAST, id DESC);",
+    # Backfill the latest-alert-per-graceid table for events it does not cover
+    # yet (alerts loaded directly with SQL rather than through post_alert)
+    """
+    CREATE OR REPLACE FUNCTION public.backfill_gw_alert_head() RETURNS void
+    LANGUAGE sql AS $$
+    INSERT INTO public.gw_alert_head (graceid, alert_id, alert_type, alert_type_index,
+        path_info, skymap_path, contour_path, role, time_of_signal, datecreated)
+    SELECT h.graceid, h.id, h.alert_type, h.alert_type_index, h.path_info,
+        h.directory || '/' || h.path_info || '.fits.gz',
+        h.directory || '/' || h.path_info || '-contours-smooth.json',
+        h.role, h.time_of_signal, h.datecreated
+    FROM (
+        SELECT l.*,
+            CASE WHEN l.role = 'test' THEN 'test' ELSE 'fit' END AS directory,
+            l.graceid || '-' || l.alert_type ||
+                CASE WHEN l.alert_type_index > 0 THEN l.alert_type_index::text ELSE '' END
+                AS path_info
+        FROM (
+            SELECT DISTINCT ON (a.graceid) a.id, a.graceid, a.alert_type, a.role,
+                a.time_of_signal, a.datecreated,
+                (SELECT greatest(count(*) - 1, 0) FROM public.gw_alert b
+                 WHERE b.graceid = a.graceid AND b.alert_type = a.alert_type)
+                    AS alert_type_index
+            FROM public.gw_alert a
+            WHERE NOT EXISTS (
+                SELECT 1 FROM public.gw_alert_head e WHERE e.graceid = a.graceid
+            )
+            ORDER BY a.graceid, a.datecreated DESC, a.id DESC
+        ) l
+    ) h
+    ON CONFLICT (graceid) DO NOTHING;
+    $$;
+    """,
+    "SELECT public.backfill_gw_alert_head();",
+    # Rebuild the per-event pointing counters from pointing/pointing_event. Run
+    # when the table is empty (first deploy), after a rollout (old workers write
+    # pointings without counting them) or after loading pointings with SQL.
+    # The EXCLUSIVE lock waits for writers that already counted to commit and
+    # holds new ones back until the rebuild commits, so no delta is lost.
+    """
+    CREATE OR REPLACE FUNCTION public.rebuild_pointing_count() RETURNS void
+    LANGUAGE sql AS $$
+    LOCK TABLE public.pointing_count IN EXCLUSIVE MODE;
+    DELETE FROM public.pointing_count;
+    INSERT INTO public.pointing_count (graceid, instrumentid, status, count)
+    SELECT pe.graceid, p.instrumentid, p.status, count(*)
+    FROM public.pointing_event pe
+    JOIN public.pointing p ON p.id = pe.pointingid
+    WHERE pe.graceid IS NOT NULL AND p.instrumentid IS NOT NULL AND p.status IS NOT NULL
+    GROUP BY pe.graceid, p.instrumentid, p.status;
+    $$;
+    """,
+    "SELECT public.rebuild_pointing_count() "
+    "WHERE NOT EXISTS (SELECT 1 FROM public.pointing_count);",
+    # Trigram indexes for substring name lookups (LIKE '%x%') on the small
+    # tables; the glade_2p3 ones are built by server.db.migrations
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm;",
+    "CREATE INDEX IF NOT EXISTS idx_users_username_trgm ON public.users USING gin (username gin_trgm_ops);",
+    "CREATE INDEX IF NOT EXISTS idx_users_firstname_trgm ON public.users USING gin (firstname gin_trgm_ops);",
+    "CREATE INDEX IF NOT EXISTS idx_users_lastname_trgm ON public.users USING gin (lastname gin_trgm_ops);",
+    "CREATE INDEX IF NOT EXISTS idx_instrument_name_trgm ON public.instrument USING gin (instrument_name gin_trgm_ops);",
+    "CREATE INDEX IF NOT EXISTS idx_instrument_nickname_trgm ON public.instrument USING gin (nickname gin_trgm_ops);",
+]
+
+
+def apply_schema_statements(engine):
+    """
+    Apply the idempotent columns and indexes listed in SCHEMA_STATEMENTS.
+
+    Each statement runs in its own transaction so that one failure (e.g. a
+    missing privilege for CREATE EXTENSION) does not block the others.
+
+    Returns:
+        List of statements that failed
+    """
+    failed = []
+    for statement in SCHEMA_STATEMENTS:
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(statement))
+        except Exception as e:
+            logger.warning(f"Schema statement failed: {statement} ({e})")
+            failed.append(statement)
+    return failed
+
+
+def rebuild_pointing_count(engine=default_engine):
+    """
+    Recount every pointing_count row from pointing/pointing_event.
+
+    Run once a rollout has finished, since workers of the previous release
+    insert pointings without updating the counters.
+    """
+    with engine.begin() as conn:
+        conn.execute(text("SELECT public.rebuild_pointing_count();"))
 
 
 def create_database_tables():
@@ -50,12 +164,9 @@ def create_database_tables():
     # Create all tables using FastAPI models (equivalent to Flask's db.create_all())
     Base.metadata.create_all(bind=engine_with_postgis)
 
-    # Create additional indexes (exactly matching Flask setup)
-    with engine.connect() as conn:
-        conn.execute(
-            text("CREATE INDEX idx_pointing_status_id ON public.pointing(status, id);")
-        )
-        conn.commit()
+    # Create additional columns and indexes
+    apply_schema_statements(engine)
+    run_migrations(engine)
 
     print("FastAPI database schema created successfully")
     print(f"Created tables: {list(Base.metadata.tables.keys())}")
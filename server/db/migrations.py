@@ -0,0 +1,113 @@
+"""
+One-off schema migrations for existing databases.
+
+Unlike SCHEMA_STATEMENTS in init_db, these rewrite or index large tables, so
+they are not run on application start. Run them once against each existing
+database before rolling out the release that needs them:
+
+    python -m server.db.migrations
+
+Indexes are built with CREATE INDEX CONCURRENTLY, so reads and writes carry on
+while they build. Every step is idempotent and the script can be re-run, e.g.
+after an interrupted build.
+"""
+
+import logging
+
+from sqlalchemy import text
+
+from server.db.database import engine as default_engine
+
+logger = logging.getLogger(__name__)
+
+# How long an ALTER TABLE waits for its lock before failing, rather than
+# queueing every other query on the table behind it
+MIGRATION_LOCK_TIMEOUT = "10s"
+
+# Column changes. Adding a stored generated column rewrites the table while
+# holding an ACCESS EXCLUSIVE lock, so run these in a quiet period.
+COLUMN_STATEMENTS = [
+    # Stored wavelength range backing Pointing.inSpectralRange
+    "ALTER TABLE public.pointing ADD COLUMN IF NOT EXISTS wave_min double precision "
+    "GENERATED ALWAYS AS (central_wave - bandwidth / 2.0) STORED;",
+    "ALTER TABLE public.pointing ADD COLUMN IF NOT EXISTS wave_max double precision "
+    "GENERATED ALWAYS AS (central_wave + bandwidth / 2.0) STORED;",
+]
+
+# Indexes on large tables as (name, definition), built concurrently
+INDEXES = [
+    # GiST indexes backing cone/polygon searches (ST_DWithin / ST_Intersects)
+    ("idx_pointing_position", "ON public.pointing USING gist (position)"),
+    ("idx_gw_candidate_position", "ON public.gw_candidate USING gist (position)"),
+    ("idx_pointing_wave_range", "ON public.pointing(wave_min, wave_max)"),
+    # Event galaxy markers, read per list in rank order
+    ("idx_gw_galaxy_entry_listid_rank", "ON public.gw_galaxy_entry(listid, rank)"),
+    # KNN (<->) nearest-galaxy search over the galaxies /glade serves
+    (
+        "idx_glade_2p3_position_near",
+        "ON public.glade_2p3 USING gist (position) "
+        "WHERE pgc_number <> -1 AND distance > 0 AND distance < 100",
+    ),
+    # Trigram indexes for substring name lookups, partial to the same galaxies
+    (
+        "idx_glade_2p3_2mass_name_trgm",
+        "ON public.glade_2p3 USING gin (_2mass_name gin_trgm_ops) "
+        "WHERE pgc_number <> -1 AND distance > 0 AND distance < 100",
+    ),
+    (
+        "idx_glade_2p3_gwgc_name_trgm",
+        "ON public.glade_2p3 USING gin (gwgc_name gin_trgm_ops) "
+        "WHERE pgc_number <> -1 AND distance > 0 AND distance < 100",
+    ),
+    (
+        "idx_glade_2p3_hyperleda_name_trgm",
+        "ON public.glade_2p3 USING gin (hyperleda_name gin_trgm_ops) "
+        "WHERE pgc_number <> -1 AND distance > 0 AND distance < 100",
+    ),
+    (
+        "idx_glade_2p3_sdssdr12_name_trgm",
+        "ON public.glade_2p3 USING gin (sdssdr12_name gin_trgm_ops) "
+        "WHERE pgc_number <> -1 AND distance > 0 AND distance < 100",
+    ),
+]
+
+INVALID_INDEX_SQL = text("""
+    SELECT 1 FROM pg_index i
+    JOIN pg_class c ON c.oid = i.indexrelid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = 'public' AND c.relname = :name AND NOT i.indisvalid
+    """)
+
+
+def run_migrations(engine=default_engine):
+    """
+    Apply COLUMN_STATEMENTS, then build any missing INDEXES concurrently.
+
+    CREATE INDEX CONCURRENTLY cannot run inside a transaction, so the
+    connection autocommits. A concurrent build that was interrupted leaves an
+    invalid index behind, which is dropped and built again.
+    """
+    with engine.connect() as conn:
+        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm;"))
+
+        conn.execute(text(f"SET lock_timeout = '{MIGRATION_LOCK_TIMEOUT}';"))
+        for statement in COLUMN_STATEMENTS:
+            logger.info(f"Applying: {statement}")
+            conn.execute(text(statement))
+        conn.execute(text("RESET lock_timeout;"))
+
+        for name, definition in INDEXES:
+            if conn.execute(INVALID_INDEX_SQL, {"name": name}).first():
+                logger.info(f"Dropping invalid index {name}")
+                conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS public.{name};"))
+            logger.info(f"Building index {name}")
+            conn.execute(
+                text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} {definition};")
+            )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run_migrations()
+    print("Migrations applied successfully")
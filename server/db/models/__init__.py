@@ -1,13 +1,15 @@
 from .users import Users, UserGroups, Groups, UserActions
 from .instrument import Instrument, FootprintCCD
-from .pointing import Pointing
+from .pointing import Pointing, PointingCount
 from .pointing_event import PointingEvent
-from .gw_alert import GWAlert
+from .gw_alert import GWAlert, GWAlertHead
 from .gw_galaxy import GWGalaxy, EventGalaxy, GWGalaxyScore, GWGalaxyList, GWGalaxyEntry
 from .glade import Glade2P3
 from .icecube import IceCubeNotice, IceCubeNoticeCoincEvent
 from .candidate import GWCandidate
 from .doi_author import DOIAuthorGroup, DOIAuthor
+from .idempotency_key import IdempotencyKey
+from .doi_task import DOITask
 
 __all__ = [
     "Users",
@@ -17,8 +19,10 @@ __all__ = [
     "Instrument",
     "FootprintCCD",
     "Pointing",
+    "PointingCount",
     "PointingEvent",
     "GWAlert",
+    "GWAlertHead",
     "GWGalaxy",
     "EventGalaxy",
     "GWGalaxyScore",
@@ -30,4 +34,6 @@ __all__ = [
     "GWCandidate",
     "DOIAuthorGroup",
     "DOIAuthor",
+    "IdempotencyKey",
+    "DOITask",
 ]
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Text
+from ..database import Base
+
+
+class DOITask(Base):
+    """
+    Queued DOI minting request.
+    Processed out of band by the DOI worker, which fills in the DOI on the
+    target pointings or galaxy list when minting completes.
+    """
+
+    __tablename__ = "doi_task"
+    __table_args__ = {"schema": "public"}
+
+    id = Column(Integer, primary_key=True)
+    target_type = Column(String(20), nullable=False)  # pointings or galaxy_list
+    target_ids = Column(JSON, nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(String(20), nullable=False, index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, index=True)
+    last_error = Column(Text)
+    doi_id = Column(Integer)
+    doi_url = Column(String(100))
+    submitterid = Column(Integer)
+    datecreated = Column(DateTime)
+    dateupdated = Column(DateTime)
@@ -1,4 +1,5 @@
 from sqlalchemy import Column, Integer, Float, String, DateTime
+from typing import Optional
 from ..database import Base
 from datetime import datetime
 
@@ -126,3 +127,91 @@ class GWAlert(Base):
             if match:
                 return match.alternateid
         return graceid
+
+
+class GWAlertHead(Base):
+    """
+    Latest alert per graceid, maintained when alerts are posted or deleted.
+    Holds what artifact lookups need so they read one row instead of every
+    alert for the event.
+    """
+
+    __tablename__ = "gw_alert_head"
+    __table_args__ = {"schema": "public"}
+
+    graceid = Column(String(50), primary_key=True)
+    alert_id = Column(Integer, nullable=False, index=True)
+    alert_type = Column(String(50))
+    # Number of earlier alerts of the same type, used in the artifact file names
+    alert_type_index = Column(Integer, nullable=False, default=0)
+    path_info = Column(String(150))
+    skymap_path = Column(String(200))
+    contour_path = Column(String(200))
+    role = Column(String(20))
+    time_of_signal = Column(DateTime)
+    datecreated = Column(DateTime)
+
+    @staticmethod
+    def build_path_info(graceid: str, alert_type: str, alert_type_index: int) -> str:
+        """Artifact name for an alert, e.g. S190425z-Update1."""
+        suffix = str(alert_type_index) if alert_type_index > 0 else ""
+        return f"{graceid}-{alert_type}{suffix}"
+
+    @staticmethod
+    def refresh(graceid: str, db) -> Optional["GWAlertHead"]:
+        """
+        Recompute the head row for a graceid from its alerts. The caller commits.
+
+        Returns:
+            The updated head, or None if the graceid no longer has alerts
+        """
+        from sqlalchemy import func
+
+        latest = (
+            db.query(GWAlert)
+            .filter(GWAlert.graceid == graceid)
+            .order_by(GWAlert.datecreated.desc(), GWAlert.id.desc())
+            .first()
+        )
+        if latest is None:
+            db.query(GWAlertHead).filter(GWAlertHead.graceid == graceid).delete(
+                synchronize_session=False
+            )
+            return None
+
+        same_type = (
+            db.query(func.count(GWAlert.id))
+            .filter(GWAlert.graceid == graceid, GWAlert.alert_type == latest.alert_type)
+            .scalar()
+        )
+        alert_type_index = max(same_type - 1, 0)
+        path_info = GWAlertHead.build_path_info(
+            graceid, latest.alert_type, alert_type_index
+        )
+        directory = "test" if latest.role == "test" else "fit"
+
+        head = db.merge(
+            GWAlertHead(
+                graceid=graceid,
+                alert_id=latest.id,
+                alert_type=latest.alert_type,
+                alert_type_index=alert_type_index,
+                path_info=path_info,
+                skymap_path=f"{directory}/{path_info}.fits.gz",
+                contour_path=f"{directory}/{path_info}-contours-smooth.json",
+                role=latest.role,
+                time_of_signal=latest.time_of_signal,
+                datecreated=latest.datecreated,
+            )
+        )
+        return head
+
+    @staticmethod
+    def get(graceid: str, db) -> Optional["GWAlertHead"]:
+        """Get the head row for a graceid, building it first if it is missing."""
+        head = db.query(GWAlertHead).filter(GWAlertHead.graceid == graceid).first()
+        if head is None:
+            head = GWAlertHead.refresh(graceid, db)
+            if head is not None:
+                db.commit()
+        return head
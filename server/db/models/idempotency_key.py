@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, UniqueConstraint
+from ..database import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Stored result of a request made with an Idempotency-Key header.
+    A retry with the same key replays the response instead of re-running it.
+    """
+
+    __tablename__ = "idempotency_key"
+    __table_args__ = (
+        UniqueConstraint("userid", "endpoint", "key", name="uq_idempotency_key"),
+        {"schema": "public"},
+    )
+
+    id = Column(Integer, primary_key=True)
+    userid = Column(Integer, nullable=False)
+    endpoint = Column(String(100), nullable=False)
+    key = Column(String(255), nullable=False)
+    request_hash = Column(String(64), nullable=False)
+    status = Column(String(20), nullable=False)  # processing or completed
+    response = Column(JSON)
+    datecreated = Column(DateTime)
@@ -1,5 +1,23 @@
-from sqlalchemy import Column, Integer, Float, DateTime, Enum, String, and_
+from collections import Counter
+from typing import Dict, Iterable, Tuple
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Computed,
+    Index,
+    Integer,
+    Float,
+    DateTime,
+    Enum,
+    String,
+    and_,
+    false,
+    func,
+)
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.hybrid import hybrid_method
+from sqlalchemy.orm import deferred
 from geoalchemy2 import Geography
 from ..database import Base
 from server.core.enums.bandpass import Bandpass
@@ -10,7 +28,10 @@ from server.utils.spectral import SpectralRangeHandler
 
 class Pointing(Base):
     __tablename__ = "pointing"
-    __table_args__ = {"schema": "public"}
+    __table_args__ = (
+        Index("idx_pointing_wave_range", "wave_min", "wave_max"),
+        {"schema": "public"},
+    )
 
     id = Column(Integer, primary_key=True)
     status = Column(Enum(pointing_status_enum, name="pointing_status"))
@@ -31,6 +52,15 @@ class Pointing(Base):
     doi_id = Column(Integer)
     central_wave = Column(Float)
     bandwidth = Column(Float)
+    # Stored wavelength range (Angstroms) so spectral filters can use an index.
+    # Added to existing databases by server.db.migrations; deferred so loading
+    # pointings does not depend on it
+    wave_min = deferred(
+        Column(Float, Computed("central_wave - bandwidth / 2.0", persisted=True))
+    )
+    wave_max = deferred(
+        Column(Float, Computed("central_wave + bandwidth / 2.0", persisted=True))
+    )
 
     @hybrid_method
     def inSpectralRange(self, spectral_min, spectral_max, spectral_type):
@@ -67,21 +97,110 @@ class Pointing(Base):
     @inSpectralRange.expression
     def inSpectralRange(cls, spectral_min, spectral_max, spectral_type):
         """
-        SQLAlchemy expression version of inSpectralRange for database queries
+        SQLAlchemy expression version of inSpectralRange for database queries.
+
+        Energy and frequency ranges are translated to wavelength bounds so the
+        comparison runs against the indexed wave_min/wave_max columns.
         """
-        if spectral_type == SpectralRangeHandler.spectralrangetype.wavelength:
-            thismin, thismax = SpectralRangeHandler.wavetoWaveRange(
-                cls.central_wave, cls.bandwidth
-            )
-        elif spectral_type == SpectralRangeHandler.spectralrangetype.energy:
-            thismin, thismax = SpectralRangeHandler.wavetoEnergy(
-                cls.central_wave, cls.bandwidth
-            )
-        elif spectral_type == SpectralRangeHandler.spectralrangetype.frequency:
-            thismin, thismax = SpectralRangeHandler.wavetoFrequency(
-                cls.central_wave, cls.bandwidth
+        bounds = SpectralRangeHandler.wavelengthBounds(
+            spectral_min, spectral_max, spectral_type
+        )
+        if bounds is None:
+            return false()
+
+        wave_low, wave_high = bounds
+        conditions = [cls.wave_min >= wave_low]
+        if wave_high is not None:
+            conditions.append(cls.wave_max <= wave_high)
+
+        return and_(*conditions)
+
+
+class PointingCount(Base):
+    """
+    Number of pointing/pointing_event rows per (graceid, instrumentid, status).
+
+    Kept current in the same transaction as the pointing writes, so per-event
+    and per-instrument totals are read here instead of aggregating the
+    pointing table on every request.
+    """
+
+    __tablename__ = "pointing_count"
+    __table_args__ = {"schema": "public"}
+
+    graceid = Column(String, primary_key=True)
+    instrumentid = Column(Integer, primary_key=True)
+    status = Column(
+        Enum(pointing_status_enum, name="pointing_status"), primary_key=True
+    )
+    count = Column(BigInteger, nullable=False, default=0)
+
+    @staticmethod
+    def apply(deltas: Dict[Tuple[str, int, pointing_status_enum], int], db) -> None:
+        """
+        Add deltas keyed by (graceid, instrumentid, status). The caller commits.
+
+        Uses INSERT ... ON CONFLICT so concurrent writers add to the same row
+        instead of racing on a read-modify-write.
+        """
+        rows = [
+            {"graceid": g, "instrumentid": i, "status": s, "count": n}
+            for (g, i, s), n in deltas.items()
+            if n and g is not None and i is not None and s is not None
+        ]
+        if not rows:
+            return
+        stmt = insert(PointingCount).values(rows)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["graceid", "instrumentid", "status"],
+                set_={"count": PointingCount.count + stmt.excluded.count},
             )
-        else:
-            return False
+        )
+
+    @staticmethod
+    def status_change_deltas(
+        pointings: Iterable["Pointing"], old_status: pointing_status_enum, db
+    ) -> Counter:
+        """
+        Deltas for pointings moved from old_status to their current status,
+        counted once per event each pointing is linked to.
+        """
+        from .pointing_event import PointingEvent
 
-        return and_(thismin >= spectral_min, thismax <= spectral_max)
+        by_id = {p.id: p for p in pointings if p.status != old_status}
+        deltas = Counter()
+        if not by_id:
+            return deltas
+        events = db.query(PointingEvent.pointingid, PointingEvent.graceid).filter(
+            PointingEvent.pointingid.in_(list(by_id))
+        )
+        for pointingid, graceid in events:
+            p = by_id[pointingid]
+            deltas[(graceid, p.instrumentid, old_status)] -= 1
+            deltas[(graceid, p.instrumentid, p.status)] += 1
+        return deltas
+
+    @staticmethod
+    def refresh(graceids: Iterable[str], db) -> None:
+        """Recount the rows for the given graceids from scratch. The caller commits."""
+        from .pointing_event import PointingEvent
+
+        graceids = list(set(graceids))
+        if not graceids:
+            return
+        db.query(PointingCount).filter(PointingCount.graceid.in_(graceids)).delete(
+            synchronize_session=False
+        )
+        counts = (
+            db.query(
+                PointingEvent.graceid,
+                Pointing.instrumentid,
+                Pointing.status,
+                func.count(),
+            )
+            .join(Pointing, Pointing.id == PointingEvent.pointingid)
+            .filter(PointingEvent.graceid.in_(graceids))
+            .group_by(PointingEvent.graceid, Pointing.instrumentid, Pointing.status)
+        )
+        PointingCount.apply({(g, i, s): n for g, i, s, n in counts}, db)
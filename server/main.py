@@ -7,6 +7,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session
 
+import asyncio
 import datetime
 import uvicorn
 import logging
@@ -14,6 +15,8 @@ import logging
 from server.config import settings
 from server.db.database import get_db, engine, Base
 from server.db.models import Users, UserGroups, Groups, UserActions  # Import all models
+from server.db.init_db import apply_schema_statements
+from server.utils import doi_queue
 
 from server.routes.pointing.router import router as pointing_router
 from server.routes.instrument.router import router as instrument_router
@@ -28,6 +31,7 @@ from server.routes.ui.router import router as ui_router
 from server.routes.celestial.router import router as celestial_router
 from server.routes.auth.router import router as auth_router
 from server.routes.enums.router import router as enums_router
+from server.routes.metadata.router import router as metadata_router
 
 from contextlib import asynccontextmanager
 from server.utils.error_handling import ErrorDetail
@@ -47,28 +51,30 @@ async def lifespan_context(app: FastAPI):
         Base.metadata.create_all(bind=engine, checkfirst=True)
         logger.info("Database tables created/verified successfully!")
 
-        # Create indexes if they don't exist (production-safe)
-        with engine.connect() as conn:
-            try:
-                # Create performance index for pointing queries (matches Flask version)
-                conn.execute(
-                    """
-                    CREATE INDEX IF NOT EXISTS idx_pointing_status_id 
-                    ON public.pointing(status, id);
-                """
-                )
-                conn.commit()
-                logger.info("Database indexes created/verified successfully!")
-            except Exception as e:
-                logger.warning(f"Index creation warning (may already exist): {e}")
+        # Create cheap indexes and functions if they don't exist (production-safe);
+        # large-table changes are applied separately by server.db.migrations
+        failed = apply_schema_statements(engine)
+        if failed:
+            logger.warning(f"{len(failed)} schema statement(s) could not be applied")
+        else:
+            logger.info("Database indexes created/verified successfully!")
 
     except Exception as e:
         logger.error(f"Failed to initialise database: {e}")
         # Don't raise - allow app to start even if DB setup fails (for debugging)
 
+    # Mint queued DOIs in the background
+    doi_worker_stop = asyncio.Event()
+    doi_worker = None
+    if settings.DOI_WORKER_ENABLED:
+        doi_worker = asyncio.create_task(doi_queue.run_worker(doi_worker_stop))
+
     yield
 
     logger.info("Application is shutting down...")
+    if doi_worker is not None:
+        doi_worker_stop.set()
+        await doi_worker
 
 
 app = FastAPI(
@@ -89,6 +95,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=settings.CORS_METHODS,
     allow_headers=settings.CORS_HEADERS,
+    # Let browser clients read the query_alerts continuation token and ETags
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 
@@ -254,6 +262,7 @@ app.include_router(doi_router, prefix=API_V1_PREFIX)
 app.include_router(event, prefix=API_V1_PREFIX)
 app.include_router(celestial_router, prefix=API_V1_PREFIX)
 app.include_router(enums_router, prefix=API_V1_PREFIX)
+app.include_router(metadata_router, prefix=API_V1_PREFIX)
 
 app.include_router(admin_router, prefix="/admin")
 
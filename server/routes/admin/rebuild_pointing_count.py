@@ -0,0 +1,27 @@
+"""Pointing counter reconcile endpoint for admin users."""
+
+from fastapi import APIRouter, Depends
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from server.db.database import get_db
+from server.auth.auth import verify_admin
+
+router = APIRouter(tags=["admin"])
+
+
+@router.post("/rebuild_pointing_count")
+async def rebuild_pointing_count(
+    db: Session = Depends(get_db),
+    user=Depends(verify_admin),  # Only admin can use this endpoint
+):
+    """
+    Recount the per-event pointing counters (admin only).
+
+    Call once a rollout has finished: workers of the previous release insert
+    pointings without updating pointing_count, so its totals drift until
+    they are rebuilt.
+    """
+    db.execute(text("SELECT public.rebuild_pointing_count()"))
+    db.commit()
+    return {"message": "success"}
@@ -5,6 +5,7 @@ from fastapi import APIRouter
 # Import all individual route modules
 from .fixdata import router as fixdata_router
 from .get_users import router as get_users_router
+from .rebuild_pointing_count import router as rebuild_pointing_count_router
 
 # Create the main router that includes all admin routes
 router = APIRouter(tags=["admin"])
@@ -12,3 +13,4 @@ router = APIRouter(tags=["admin"])
 # Include all the individual routers
 router.include_router(fixdata_router)
 router.include_router(get_users_router)
+router.include_router(rebuild_pointing_count_router)
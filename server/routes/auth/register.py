@@ -19,6 +19,7 @@ from server.schemas.auth import (
 )
 from server.utils.email import send_verification_email
 from server.utils.tokens import generate_verification_token, decode_verification_token
+from server.utils.pointing import invalidate_name_lookups
 
 logger = logging.getLogger(__name__)
 
@@ -71,6 +72,7 @@ async def register(register_data: RegisterRequest, db: Session = Depends(get_db)
         new_user.verification_key = verification_token
         db.commit()
         db.refresh(new_user)
+        invalidate_name_lookups()
 
         email_sent = True
         try:
@@ -2,6 +2,9 @@
 
 import operator
 from fastapi import APIRouter, Depends
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import List
 from dateutil.parser import parse as date_parse
@@ -12,6 +15,9 @@ from server.db.models.gw_alert import GWAlert
 from server.db.models.candidate import GWCandidate
 from server.schemas.candidate import CandidateSchema, GetCandidateQueryParams
 from server.auth.auth import get_current_user
+from server.utils import spatial
+from server.utils.formatters import parse_field_list
+from server.utils.error_handling import validation_exception
 
 router = APIRouter(tags=["candidates"])
 
@@ -48,6 +54,16 @@ DATE_FILTERS = [
     ("discovery_date_before", GWCandidate.discovery_date, operator.le),
 ]
 
+# Selectable output fields; position is rendered as WKT in SQL
+CANDIDATE_FIELD_COLUMNS = {
+    name: (
+        func.ST_AsText(GWCandidate.position).label("position")
+        if name == "position"
+        else getattr(GWCandidate, name)
+    )
+    for name in CandidateSchema.model_fields
+}
+
 
 @router.get("/candidate", response_model=List[CandidateSchema])
 async def get_candidates(
@@ -104,6 +120,64 @@ async def get_candidates(
         if value is not None:
             filter_conditions.append(op(column, value))
 
+    # Spatial filters (GiST-indexed on gw_candidate.position)
+    if query_params.cone:
+        try:
+            ra, dec, radius = spatial.parse_cone(query_params.cone)
+        except (ValueError, TypeError) as e:
+            raise validation_exception(
+                message="Error parsing 'cone'",
+                errors=["Required format is a list: '[ra, dec, radius]'", str(e)],
+            )
+        filter_conditions.append(
+            spatial.cone_filter(GWCandidate.position, ra, dec, radius)
+        )
+
+    if query_params.polygon:
+        try:
+            polygon_wkt = spatial.parse_polygon(query_params.polygon)
+        except (ValueError, TypeError, IndexError) as e:
+            raise validation_exception(
+                message="Error parsing 'polygon'",
+                errors=[
+                    "Required format is WKT or a list: '[[ra1, dec1], [ra2, dec2]...]'",
+                    str(e),
+                ],
+            )
+        filter_conditions.append(
+            spatial.polygon_filter(GWCandidate.position, polygon_wkt)
+        )
+
+    if query_params.fields:
+        try:
+            requested_fields = parse_field_list(
+                query_params.fields, CANDIDATE_FIELD_COLUMNS
+            )
+        except ValueError as e:
+            raise validation_exception(
+                message="Error parsing 'fields'",
+                errors=[
+                    f"Valid fields are: {', '.join(CANDIDATE_FIELD_COLUMNS)}",
+                    str(e),
+                ],
+            )
+
+        rows = (
+            db.query(*[CANDIDATE_FIELD_COLUMNS[f] for f in requested_fields])
+            .filter(*filter_conditions)
+            .all()
+        )
+
+        content = []
+        for row in rows:
+            data = dict(row._mapping)
+            if data.get("magnitude_unit") is not None:
+                # Match CandidateSchema, which coerces the enum to its string value
+                data["magnitude_unit"] = str(data["magnitude_unit"].value)
+            content.append(data)
+
+        return JSONResponse(content=jsonable_encoder(content))
+
     candidates = db.query(GWCandidate).filter(*filter_conditions).all()
 
     for candidate in candidates:
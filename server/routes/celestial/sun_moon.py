@@ -1,11 +1,15 @@
 """Sun and moon position calculations using Astropy."""
 
-from datetime import datetime
-from typing import Optional
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
 from fastapi import APIRouter, Query, HTTPException
 from pydantic import BaseModel
 
+from server.utils.cache import TTLCache
+
 try:
+    import numpy as np
     import astropy.time
     from astropy.coordinates import get_body
 
@@ -16,6 +20,13 @@ except ImportError as e:
 
 router = APIRouter(tags=["celestial"])
 
+# Most timestamps accepted by one batch request; 2000 uncached minutes take
+# about a second and a half to evaluate
+SUN_MOON_BATCH_MAX = 2000
+
+# (sun_ra, sun_dec, moon_ra, moon_dec) per UTC minute; positions never change
+sun_moon_cache = TTLCache(None, 100000)
+
 
 @router.get("/test_celestial")
 async def test_celestial():
@@ -102,3 +113,152 @@ async def get_sun_moon_positions(
         raise HTTPException(
             status_code=500, detail=f"Failed to calculate celestial positions: {str(e)}"
         )
+
+
+class SunMoonBatchRequest(BaseModel):
+    """Batch sun and moon positions request model."""
+
+    times: List[str]
+    # Optional pointing positions, one per time, for sun/moon separations
+    ra: Optional[List[float]] = None
+    dec: Optional[List[float]] = None
+
+
+class SunMoonBatchPositions(BaseModel):
+    """Batch sun and moon positions response model, one entry per time."""
+
+    times: List[str]
+    sun_ra: List[float]
+    sun_dec: List[float]
+    moon_ra: List[float]
+    moon_dec: List[float]
+    sun_separation: Optional[List[float]] = None
+    moon_separation: Optional[List[float]] = None
+
+
+def _parse_minute(time_str: str) -> datetime:
+    """Parse an ISO timestamp to a naive UTC datetime rounded to the minute."""
+    dt = datetime.fromisoformat(time_str[:-1] if time_str.endswith("Z") else time_str)
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return (dt + timedelta(seconds=30)).replace(second=0, microsecond=0)
+
+
+def sun_moon_at_minutes(
+    minutes: List[datetime],
+) -> List[Tuple[float, float, float, float]]:
+    """
+    Sun and moon (ra, dec) for each UTC minute, memoized per minute.
+
+    Minutes not cached yet are evaluated together in one vectorized get_body
+    call per body. The result is built from a local copy, since storing new
+    minutes may evict ones read from the cache earlier.
+    """
+    positions = {}
+    for minute in set(minutes):
+        cached = sun_moon_cache.get(minute)
+        if cached is not None:
+            positions[minute] = cached
+
+    missing = sorted(set(minutes) - positions.keys())
+    if missing:
+        t = astropy.time.Time(missing, format="datetime", scale="utc")
+        sun = get_body("sun", t)
+        moon = get_body("moon", t)
+        for i, minute in enumerate(missing):
+            positions[minute] = (
+                float(sun.ra.deg[i]),
+                float(sun.dec.deg[i]),
+                float(moon.ra.deg[i]),
+                float(moon.dec.deg[i]),
+            )
+            sun_moon_cache.set(minute, positions[minute])
+    return [positions[m] for m in minutes]
+
+
+def angular_separation(ra1, dec1, ra2, dec2) -> "np.ndarray":
+    """Great-circle separation in degrees between arrays of (ra, dec) in degrees."""
+    ra1, dec1, ra2, dec2 = (np.radians(np.asarray(x)) for x in (ra1, dec1, ra2, dec2))
+    # Vincenty formula, stable at all separations
+    dra = ra2 - ra1
+    num = np.hypot(
+        np.cos(dec2) * np.sin(dra),
+        np.cos(dec1) * np.sin(dec2) - np.sin(dec1) * np.cos(dec2) * np.cos(dra),
+    )
+    den = np.sin(dec1) * np.sin(dec2) + np.cos(dec1) * np.cos(dec2) * np.cos(dra)
+    return np.degrees(np.arctan2(num, den))
+
+
+@router.post("/sun_moon_positions_batch", response_model=SunMoonBatchPositions)
+async def get_sun_moon_positions_batch(request: SunMoonBatchRequest):
+    """
+    Get sun and moon positions for many timestamps at once, e.g. every pointing
+    time of an event.
+
+    Positions are evaluated at the nearest UTC minute and memoized, and all
+    uncached minutes are computed in one vectorized Astropy call, in a worker
+    thread so the event loop keeps serving other requests.
+
+    Parameters:
+    - times: ISO timestamp strings
+    - ra, dec: Optional pointing positions in degrees, one per time
+
+    Returns arrays aligned with times: sun_ra, sun_dec, moon_ra, moon_dec and,
+    when ra/dec are given, sun_separation and moon_separation in degrees.
+    """
+    if not ASTROPY_AVAILABLE:
+        raise HTTPException(
+            status_code=500,
+            detail="Astropy library not available for celestial calculations",
+        )
+
+    if len(request.times) > SUN_MOON_BATCH_MAX:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {SUN_MOON_BATCH_MAX} times per request",
+        )
+    if (request.ra is None) != (request.dec is None) or (
+        request.ra is not None
+        and not len(request.ra) == len(request.dec) == len(request.times)
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail="ra and dec must be given together, with one value per time",
+        )
+
+    try:
+        minutes = [_parse_minute(t) for t in request.times]
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid time format: {str(e)}. Expected ISO format like '2019-04-25T08:18:26.000000Z'",
+        )
+
+    if not minutes:
+        return SunMoonBatchPositions(
+            times=[], sun_ra=[], sun_dec=[], moon_ra=[], moon_dec=[]
+        )
+
+    try:
+        positions = np.array(await asyncio.to_thread(sun_moon_at_minutes, minutes))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to calculate celestial positions: {str(e)}"
+        )
+
+    sun_ra, sun_dec, moon_ra, moon_dec = positions.T
+    result = SunMoonBatchPositions(
+        times=request.times,
+        sun_ra=sun_ra.tolist(),
+        sun_dec=sun_dec.tolist(),
+        moon_ra=moon_ra.tolist(),
+        moon_dec=moon_dec.tolist(),
+    )
+    if request.ra is not None:
+        result.sun_separation = angular_separation(
+            request.ra, request.dec, sun_ra, sun_dec
+        ).tolist()
+        result.moon_separation = angular_separation(
+            request.ra, request.dec, moon_ra, moon_dec
+        ).tolist()
+    return result
@@ -10,11 +10,13 @@ from server.utils.gwtm_io import list_gwtm_bucket, delete_gwtm_files
 from server.config import settings
 from server.core.enums.alertrole import AlertRole
 from server.utils.function import by_chunk
-from server.db.models.gw_alert import GWAlert
-from server.db.models.pointing import Pointing
+from server.db.models.gw_alert import GWAlert, GWAlertHead
+from server.db.models.pointing import Pointing, PointingCount
 from server.db.models.pointing_event import PointingEvent
 from server.db.models.gw_galaxy import GWGalaxyEntry
 from server.db.models.candidate import GWCandidate
+from server.routes.gw_alert.query_alerts import invalidate_alert_counts
+from server.routes.metadata.get_metadata import invalidate_metadata
 
 router = APIRouter(tags=["gw_alerts"])
 
@@ -61,6 +63,14 @@ async def del_test_alerts(
     pointing_ids = [x.pointingid for x in pointing_events]
     pointings = db.query(Pointing).filter(Pointing.id.in_(pointing_ids)).all()
 
+    # Every event a removed pointing is linked to needs its counts redone
+    counted_gids = set(gids_to_rm) | {
+        gid
+        for (gid,) in db.query(PointingEvent.graceid).filter(
+            PointingEvent.pointingid.in_(pointing_ids)
+        )
+    }
+
     # Query for galaxy lists and galaxy list entries from graceids
     try:
         from server.db.models.gw_alert import GWGalaxyList
@@ -103,9 +113,16 @@ async def del_test_alerts(
         for pe in pointing_events:
             db.delete(pe)
 
+    if len(pointings) > 0 or len(pointing_events) > 0:
+        db.flush()
+        PointingCount.refresh(counted_gids, db)
+
     if len(gwalerts) > 0:
         for ga in gwalerts:
             db.delete(ga)
+        db.flush()
+        for gid in set(gids_to_rm):
+            GWAlertHead.refresh(gid, db)
 
     # Delete files from storage
     try:
@@ -133,5 +150,7 @@ async def del_test_alerts(
 
     # Commit all changes
     db.commit()
+    invalidate_alert_counts()
+    invalidate_metadata(db)
 
     return {"message": "Successfully deleted test alerts and associated data"}
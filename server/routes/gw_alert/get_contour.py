@@ -1,22 +1,38 @@
 """Get GW contour endpoint."""
 
-from fastapi import APIRouter, Depends, Query
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import Response
 from sqlalchemy.orm import Session
 
 from server.db.database import get_db
-from server.db.models.gw_alert import GWAlert
+from server.db.models.gw_alert import GWAlert, GWAlertHead
 from server.auth.auth import get_current_user
 from server.utils.error_handling import not_found_exception
 from server.utils.gwtm_io import download_gwtm_file
+from server.utils.http_cache import (
+    version_etag,
+    cache_headers,
+    etag_matches,
+    not_modified,
+    storage_redirect,
+)
 from server.config import settings
 
 router = APIRouter(tags=["gw_alerts"])
 
+# Addressed by graceid, so revalidate in case a newer alert replaced the contour
+CONTOUR_CACHE_CONTROL = "public, no-cache"
+
 
 @router.get("/gw_contour")
 async def get_gw_contour(
+    request: Request,
     graceid: str = Query(..., description="Grace ID of the GW event"),
+    redirect: Optional[bool] = Query(
+        None,
+        description="Redirect to a pre-signed storage URL (default: server setting)",
+    ),
     db: Session = Depends(get_db),
 ):
     """
@@ -24,36 +40,29 @@ async def get_gw_contour(
 
     Parameters:
     - graceid: The Grace ID of the GW event
+    - redirect: Return a 302 to a pre-signed storage URL instead of the file
 
-    Returns the contour JSON file
+    Returns the contour JSON file, with an ETag identifying the alert it
+    belongs to; a matching If-None-Match gets a 304.
     """
     # Normalize the graceid
     graceid = GWAlert.graceidfromalternate(graceid, db)
 
     # Get the latest alert for this graceid
-    alerts = (
-        db.query(GWAlert)
-        .filter(GWAlert.graceid == graceid)
-        .order_by(GWAlert.datecreated.desc())
-        .all()
-    )
+    head = GWAlertHead.get(graceid, db)
 
-    if not alerts:
+    if head is None:
         raise not_found_exception(f"No alert found with graceid: {graceid}")
 
-    # Extract alert info
-    alert = alerts[0]
-    alert_types = [x.alert_type for x in alerts]
-    latest_alert_type = alert.alert_type
-    num = len([x for x in alert_types if x == latest_alert_type]) - 1
-    alert_type = latest_alert_type if num < 1 else latest_alert_type + str(num)
+    contour_path = head.contour_path
+
+    etag = version_etag("contour", head.alert_id, contour_path)
+    if etag_matches(request, etag):
+        return not_modified(etag, CONTOUR_CACHE_CONTROL)
 
-    # Build path info
-    path_info = f"{graceid}-{alert_type}"
-    if alert.role != "test":
-        contour_path = f"fit/{path_info}-contours-smooth.json"
-    else:
-        contour_path = f"test/{path_info}-contours-smooth.json"
+    redirect_response = storage_redirect(contour_path, redirect)
+    if redirect_response is not None:
+        return redirect_response
 
     try:
         file_content = download_gwtm_file(
@@ -61,7 +70,11 @@ async def get_gw_contour(
             source=settings.STORAGE_BUCKET_SOURCE,
             config=settings,
         )
-        return Response(content=file_content, media_type="application/json")
+        return Response(
+            content=file_content,
+            media_type="application/json",
+            headers=cache_headers(etag, head.datecreated, CONTOUR_CACHE_CONTROL),
+        )
     except Exception as e:
         # Include detailed error information for debugging
         error_msg = (
@@ -1,6 +1,7 @@
 """Get GRB MOC file endpoint."""
 
-from fastapi import APIRouter, Depends, Query
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import Response
 from sqlalchemy.orm import Session
 
@@ -8,16 +9,32 @@ from server.db.database import get_db
 from server.db.models.gw_alert import GWAlert
 from server.auth.auth import get_current_user
 from server.utils.error_handling import not_found_exception, validation_exception
-from server.utils.gwtm_io import download_gwtm_file
+from server.utils.gwtm_io import download_gwtm_file, get_gwtm_file_info
+from server.utils.http_cache import (
+    strong_etag,
+    quote_etag,
+    cache_headers,
+    etag_matches,
+    not_modified,
+    storage_redirect,
+)
 from server.config import settings
 
 router = APIRouter(tags=["gw_alerts"])
 
+# MOC files can be regenerated in place, so always revalidate against storage
+GRB_MOC_CACHE_CONTROL = "private, no-cache"
+
 
 @router.get("/grb_moc_file")
 async def get_grbmoc(
+    request: Request,
     graceid: str = Query(..., description="Grace ID of the GW event"),
     instrument: str = Query(..., description="Instrument name (gbm, lat, or bat)"),
+    redirect: Optional[bool] = Query(
+        None,
+        description="Redirect to a pre-signed storage URL (default: server setting)",
+    ),
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
@@ -27,8 +44,10 @@ async def get_grbmoc(
     Parameters:
     - graceid: The Grace ID of the GW event
     - instrument: Instrument name (gbm, lat, or bat)
+    - redirect: Return a 302 to a pre-signed storage URL instead of the file
 
-    Returns the MOC file
+    Returns the MOC file. The ETag and Last-Modified come from the stored
+    object, so a matching If-None-Match gets a 304 without downloading it.
     """
     # Normalize the graceid
     graceid = GWAlert.graceidfromalternate(graceid, db)
@@ -55,13 +74,36 @@ async def get_grbmoc(
     else:
         moc_filepath = f"test/{graceid}-{instrument_dictionary[instrument]}.json"
 
+    info = get_gwtm_file_info(
+        moc_filepath, source=settings.STORAGE_BUCKET_SOURCE, config=settings
+    )
+    etag = quote_etag(info["etag"]) if info is not None else None
+    if etag is not None and etag_matches(request, etag):
+        return not_modified(etag, GRB_MOC_CACHE_CONTROL)
+
+    # Only redirect to objects known to exist, so a missing MOC is still a 404
+    if info is not None:
+        redirect_response = storage_redirect(moc_filepath, redirect, check_exists=False)
+        if redirect_response is not None:
+            return redirect_response
+
     try:
         file_content = download_gwtm_file(
             filename=moc_filepath,
             source=settings.STORAGE_BUCKET_SOURCE,
             config=settings,
         )
-        return Response(content=file_content, media_type="application/json")
+        last_modified = info["last_modified"] if info is not None else None
+        if etag is None:
+            # No object metadata from this backend; validate on the bytes instead
+            etag = strong_etag(file_content.encode())
+            if etag_matches(request, etag):
+                return not_modified(etag, GRB_MOC_CACHE_CONTROL)
+        return Response(
+            content=file_content,
+            media_type="application/json",
+            headers=cache_headers(etag, last_modified, GRB_MOC_CACHE_CONTROL),
+        )
     except Exception as e:
         # Include detailed error information for debugging
         error_msg = (
@@ -2,21 +2,32 @@
 
 import io
 import logging
-from fastapi import APIRouter, Depends, Query
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from server.db.database import get_db
-from server.db.models.gw_alert import GWAlert
+from server.db.models.gw_alert import GWAlert, GWAlertHead
 from server.auth.auth import get_current_user
 from server.utils.error_handling import not_found_exception
 from server.utils.gwtm_io import download_gwtm_file
+from server.utils.http_cache import (
+    version_etag,
+    cache_headers,
+    etag_matches,
+    not_modified,
+    storage_redirect,
+)
 from server.config import settings
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["gw_alerts"])
 
+# Addressed by graceid, so revalidate in case a newer alert replaced the skymap
+SKYMAP_CACHE_CONTROL = "private, no-cache"
+
 
 @router.get(
     "/gw_skymap",
@@ -26,11 +37,18 @@ router = APIRouter(tags=["gw_alerts"])
             "content": {"application/fits": {}},
             "description": "The skymap FITS file for the specified gravitational wave event",
         },
+        302: {"description": "Redirect to a short-lived pre-signed storage URL"},
+        304: {"description": "Skymap unchanged since the ETag sent"},
         404: {"description": "Skymap not found for the specified event"},
     },
 )
 async def get_gw_skymap(
+    request: Request,
     graceid: str = Query(..., description="Grace ID of the GW event"),
+    redirect: Optional[bool] = Query(
+        None,
+        description="Redirect to a pre-signed storage URL (default: server setting)",
+    ),
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
@@ -39,37 +57,34 @@ async def get_gw_skymap(
 
     Parameters:
     - graceid: The Grace ID of the GW event
+    - redirect: Return a 302 to a pre-signed storage URL instead of the file
+      (defaults to STORAGE_REDIRECT_DOWNLOADS; ignored for local storage)
 
     Returns:
     - A binary response containing the FITS file with the skymap data
+
+    The ETag identifies the alert the skymap belongs to, so a client sending
+    it as If-None-Match gets a 304 until a newer alert is posted.
     """
     # Normalize the graceid
     graceid = GWAlert.graceidfromalternate(graceid, db)
 
     # Get the latest alert for this graceid
-    alerts = (
-        db.query(GWAlert)
-        .filter(GWAlert.graceid == graceid)
-        .order_by(GWAlert.datecreated.desc())
-        .all()
-    )
-
-    if not alerts:
+    head = GWAlertHead.get(graceid, db)
+
+    if head is None:
         raise not_found_exception(f"No alert found with graceid: {graceid}")
 
-    # Extract alert info
-    alert = alerts[0]
-    alert_types = [x.alert_type for x in alerts]
-    latest_alert_type = alert.alert_type
-    num = len([x for x in alert_types if x == latest_alert_type]) - 1
-    alert_type = latest_alert_type if num < 1 else latest_alert_type + str(num)
+    skymap_path = head.skymap_path
+
+    # Each alert writes its own skymap file, so the alert identifies the bytes
+    etag = version_etag("skymap", head.alert_id, skymap_path)
+    if etag_matches(request, etag):
+        return not_modified(etag, SKYMAP_CACHE_CONTROL)
 
-    # Build path info
-    path_info = f"{graceid}-{alert_type}"
-    if alert.role != "test":
-        skymap_path = f"fit/{path_info}.fits.gz"
-    else:
-        skymap_path = f"test/{path_info}.fits.gz"
+    redirect_response = storage_redirect(skymap_path, redirect)
+    if redirect_response is not None:
+        return redirect_response
 
     # Download and return the file
     try:
@@ -88,6 +103,7 @@ async def get_gw_skymap(
             headers={
                 "Content-Disposition": f"attachment; filename={filename}",
                 "Content-Type": "application/fits",
+                **cache_headers(etag, head.datecreated, SKYMAP_CACHE_CONTROL),
             },
         )
     except Exception as e:
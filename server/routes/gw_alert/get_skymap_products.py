@@ -0,0 +1,171 @@
+"""Resampled skymap and credible-region MOC endpoints."""
+
+import asyncio
+import logging
+from typing import Callable
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import Response
+from sqlalchemy.orm import Session
+
+from server.db.database import get_db
+from server.db.models.gw_alert import GWAlert, GWAlertHead
+from server.auth.auth import get_current_user
+from server.utils.error_handling import not_found_exception, validation_exception
+from server.services.alert_products import (
+    SkymapProducts,
+    healpix_product,
+    moc_product,
+)
+from server.utils.http_cache import (
+    version_etag,
+    cache_headers,
+    etag_matches,
+    not_modified,
+)
+from server.utils.skymap import SKYMAP_MAX_NSIDE
+from server.config import settings
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["gw_alerts"])
+
+# Addressed by graceid, so revalidate in case a newer alert replaced the skymap
+SKYMAP_PRODUCT_CACHE_CONTROL = "private, no-cache"
+
+
+def _get_head(graceid: str, db: Session) -> GWAlertHead:
+    graceid = GWAlert.graceidfromalternate(graceid, db)
+    head = GWAlertHead.get(graceid, db)
+    if head is None:
+        raise not_found_exception(f"No alert found with graceid: {graceid}")
+    return head
+
+
+async def _serve_product(
+    request: Request,
+    head: GWAlertHead,
+    product: str,
+    load: Callable[[SkymapProducts], bytes],
+    media_type: str,
+    headers: dict,
+) -> Response:
+    etag = version_etag(product, head.alert_id, head.skymap_path)
+    if etag_matches(request, etag):
+        return not_modified(etag, SKYMAP_PRODUCT_CACHE_CONTROL)
+
+    # One cached product per alert version, since each alert has its own skymap
+    products = SkymapProducts(head.path_info, head.skymap_path)
+    try:
+        content = await asyncio.to_thread(load, products)
+    except Exception as e:
+        logger.warning(
+            "Could not build skymap product %s from %s: %s: %s",
+            products.key(product),
+            head.skymap_path,
+            type(e).__name__,
+            str(e),
+        )
+        raise not_found_exception(
+            f"Error retrieving skymap file: {head.skymap_path} "
+            f"from {settings.STORAGE_BUCKET_SOURCE} storage. "
+            f"{type(e).__name__}: {str(e)}"
+        )
+
+    return Response(
+        content=content,
+        media_type=media_type,
+        headers={
+            **headers,
+            **cache_headers(etag, head.datecreated, SKYMAP_PRODUCT_CACHE_CONTROL),
+        },
+    )
+
+
+@router.get(
+    "/gw_skymap_healpix",
+    responses={
+        200: {
+            "content": {"application/octet-stream": {}},
+            "description": "Little-endian float32 probability per pixel, RING ordered",
+        },
+        304: {"description": "Map unchanged since the ETag sent"},
+        404: {"description": "Skymap not found for the specified event"},
+    },
+)
+async def get_gw_skymap_healpix(
+    request: Request,
+    graceid: str = Query(..., description="Grace ID of the GW event"),
+    nside: int = Query(
+        ..., description=f"HEALPix NSIDE (power of 2, max {SKYMAP_MAX_NSIDE})"
+    ),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """
+    Get the latest skymap for a GW event resampled to a requested NSIDE.
+
+    Parameters:
+    - graceid: The Grace ID of the GW event
+    - nside: HEALPix NSIDE of the returned map (power of 2)
+
+    Returns the probability per pixel as raw little-endian float32 in RING
+    ordering (12 * nside**2 values), with the NSIDE and ordering repeated in
+    the X-HEALPix-NSIDE and X-HEALPix-Ordering headers. Each map is computed
+    once per alert and cached in storage.
+    """
+    if nside < 1 or nside > SKYMAP_MAX_NSIDE or nside & (nside - 1):
+        raise validation_exception(
+            message="Invalid nside",
+            errors=[f"nside must be a power of 2 between 1 and {SKYMAP_MAX_NSIDE}"],
+        )
+
+    head = _get_head(graceid, db)
+    return await _serve_product(
+        request,
+        head,
+        healpix_product(nside),
+        lambda products: products.healpix(nside),
+        "application/octet-stream",
+        {"X-HEALPix-NSIDE": str(nside), "X-HEALPix-Ordering": "RING"},
+    )
+
+
+@router.get("/gw_skymap_moc")
+async def get_gw_skymap_moc(
+    request: Request,
+    graceid: str = Query(..., description="Grace ID of the GW event"),
+    credible_level: float = Query(
+        0.9, description="Credible level of the region (between 0 and 1)"
+    ),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """
+    Get the MOC of a credible region of the latest skymap for a GW event.
+
+    Parameters:
+    - graceid: The Grace ID of the GW event
+    - credible_level: Fraction of the probability the region holds (default 0.9)
+
+    Returns the MOC JSON of the smallest set of skymap pixels holding at least
+    credible_level of the probability, computed once per alert and cached in
+    storage.
+    """
+    if not 0 < credible_level <= 1:
+        raise validation_exception(
+            message="Invalid credible_level",
+            errors=["credible_level must be greater than 0 and at most 1"],
+        )
+    # Levels are cached per percent
+    credible_level = round(credible_level, 2) or 0.01
+
+    head = _get_head(graceid, db)
+    return await _serve_product(
+        request,
+        head,
+        moc_product(credible_level),
+        lambda products: products.moc(credible_level),
+        "application/json",
+        {},
+    )
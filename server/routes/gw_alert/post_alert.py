@@ -1,12 +1,16 @@
 """Post GW alert endpoint."""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, BackgroundTasks, Depends
 from sqlalchemy.orm import Session
 
 from server.db.database import get_db
-from server.db.models.gw_alert import GWAlert
+from server.db.models.gw_alert import GWAlert, GWAlertHead
 from server.schemas.gw_alert import GWAlertSchema
 from server.auth.auth import verify_admin
+from server.routes.gw_alert.query_alerts import invalidate_alert_counts
+from server.routes.metadata.get_metadata import invalidate_metadata
+from server.services.alert_products import precompute_alert_products
+from server.config import settings
 
 router = APIRouter(tags=["gw_alerts"])
 
@@ -14,6 +18,7 @@ router = APIRouter(tags=["gw_alerts"])
 @router.post("/post_alert", response_model=GWAlertSchema)
 async def post_alert(
     alert_data: GWAlertSchema,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     user=Depends(verify_admin),  # Only admin can post alerts
 ):
@@ -23,13 +28,23 @@ async def post_alert(
     Parameters:
     - Alert data in the request body
 
-    Returns the created GW Alert object
+    Returns the created GW Alert object. Derived skymap products and GRB
+    overlays are then built in the background, so the alert page loads warm.
     """
     # Exclude computed fields that are not in the database model
     alert_dict = alert_data.dict(exclude={"pointing_count"})
     alert_instance = GWAlert(**alert_dict)
     db.add(alert_instance)
+    db.flush()
+
+    # Keep the latest-alert row for this graceid current
+    GWAlertHead.refresh(alert_instance.graceid, db)
     db.commit()
+    invalidate_alert_counts()
+    invalidate_metadata(db)
     db.refresh(alert_instance)
 
+    if settings.ALERT_PRECOMPUTE_ENABLED:
+        background_tasks.add_task(precompute_alert_products, alert_instance.graceid)
+
     return alert_instance
@@ -1,23 +1,41 @@
 """Query GW alerts endpoint."""
 
 from typing import List, Optional, Union
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 
 from server.db.database import get_db
-from server.db.models.gw_alert import GWAlert
-from server.db.models.pointing import Pointing
-from server.db.models.pointing_event import PointingEvent
+from server.db.models.gw_alert import GWAlert, GWAlertHead
+from server.db.models.pointing import PointingCount
 from server.core.enums.pointingstatus import PointingStatus as pointing_status
 from server.schemas.gw_alert import (
     GWAlertSchema,
     GWAlertQueryResponse,
     GWAlertFilterOptionsResponse,
 )
+from server.utils.cache import TTLCache
+from server.utils.error_handling import validation_exception
+from server.utils.pagination import (
+    encode_cursor,
+    decode_cursor,
+    keyset_after,
+    keyset_order,
+)
 
 router = APIRouter(tags=["gw_alerts"])
 
+# Most alerts returned by format=simple in one response; the rest are reached
+# through the X-Next-Cursor continuation token
+SIMPLE_FORMAT_MAX_RESULTS = 1000
+
+# Totals for format=paginated, keyed by filters; cleared when alerts change
+alert_count_cache = TTLCache(ttl_seconds=60, maxsize=512)
+
+
+def invalidate_alert_counts() -> None:
+    """Drop cached query_alerts totals after alerts are added or removed."""
+    alert_count_cache.invalidate()
+
 
 @router.get("/query_alerts")
 async def query_alerts(
@@ -52,6 +70,20 @@ async def query_alerts(
         le=100,
         description="Items per page (max 100, only used with format=paginated)",
     ),
+    cursor: Optional[str] = Query(
+        None,
+        description="Continuation token (next_cursor or X-Next-Cursor) to resume after",
+    ),
+    limit: int = Query(
+        SIMPLE_FORMAT_MAX_RESULTS,
+        ge=1,
+        le=SIMPLE_FORMAT_MAX_RESULTS,
+        description="Maximum alerts returned with format=simple",
+    ),
+    include_total: bool = Query(
+        True, description="Include the (cached) total with format=paginated"
+    ),
+    response: Response = None,
     db: Session = Depends(get_db),
 ) -> Union[List[GWAlertSchema], GWAlertQueryResponse]:
     """
@@ -69,6 +101,11 @@ async def query_alerts(
     - format: Response format - 'simple' returns list (default, backwards compatible), 'paginated' returns object with metadata
     - page: Page number (1-based, only used with format=paginated)
     - per_page: Items per page (max 100, only used with format=paginated)
+    - cursor: Continuation token; pages by (datecreated, id) instead of page number
+    - limit: Maximum alerts returned with format=simple (max 1000). When more
+      match, the X-Next-Cursor response header holds the token for the rest
+    - include_total: Include the total with format=paginated. Totals are cached
+      briefly, so they may lag newly posted alerts by up to a minute
 
     Returns either List[GWAlertSchema] (format=simple) or GWAlertQueryResponse (format=paginated)
     """
@@ -129,18 +166,17 @@ async def query_alerts(
         # When filtering by instrument or including pointing counts, we need to join with pointing tables
         if include_pointing_count and instrument_id is not None:
             # Special logic for getting events contributed - match Flask exactly
-            # First, get the count of pointings per graceid using a proper group by query
+            # Completed pointing counts per graceid come from the counter table
             pointing_counts_query = (
                 db.query(
-                    PointingEvent.graceid,
-                    func.count(Pointing.id).label("pointing_count"),
+                    PointingCount.graceid,
+                    PointingCount.count.label("pointing_count"),
                 )
-                .join(Pointing, PointingEvent.pointingid == Pointing.id)
                 .filter(
-                    Pointing.instrumentid == instrument_id,
-                    Pointing.status == pointing_status.completed,
+                    PointingCount.instrumentid == instrument_id,
+                    PointingCount.status == pointing_status.completed,
+                    PointingCount.count > 0,
                 )
-                .group_by(PointingEvent.graceid)
                 .all()
             )
 
@@ -151,28 +187,38 @@ async def query_alerts(
                     x.graceid: x.pointing_count for x in pointing_counts_query
                 }
 
-                # Query GWAlerts for these grace IDs, ordering by date to get the latest one first
-                results = (
-                    db.query(GWAlert)
-                    .filter(GWAlert.graceid.in_(gids))
-                    .filter(*filter_conditions)
-                    .order_by(
-                        GWAlert.graceid.desc(), GWAlert.datecreated.desc()
-                    )  # Get latest alert first for each graceid
-                    .all()
-                )
-
-                # Add pointing counts to each alert, ensuring uniqueness by graceid
+                if filter_conditions:
+                    # Latest alert per graceid among the alerts matching the filters
+                    results = (
+                        db.query(GWAlert)
+                        .filter(GWAlert.graceid.in_(gids))
+                        .filter(*filter_conditions)
+                        .order_by(
+                            GWAlert.graceid.desc(),
+                            GWAlert.datecreated.desc(),
+                            GWAlert.id.desc(),
+                        )
+                        .distinct(GWAlert.graceid)
+                        .all()
+                    )
+                else:
+                    # Latest alert per graceid, read through the maintained head rows
+                    results = (
+                        db.query(GWAlert)
+                        .join(GWAlertHead, GWAlertHead.alert_id == GWAlert.id)
+                        .filter(GWAlertHead.graceid.in_(gids))
+                        .order_by(GWAlert.graceid.desc())
+                        .all()
+                    )
+
+                # Add pointing counts to each alert
                 alerts_with_counts = []
-                seen_graceids = set()
                 for alert in results:
-                    if alert.graceid not in seen_graceids:
-                        alert_dict = {**alert.__dict__}
-                        alert_dict["pointing_count"] = pointing_counts_map.get(
-                            alert.graceid, 0
-                        )
-                        alerts_with_counts.append(GWAlertSchema(**alert_dict))
-                        seen_graceids.add(alert.graceid)
+                    alert_dict = {**alert.__dict__}
+                    alert_dict["pointing_count"] = pointing_counts_map.get(
+                        alert.graceid, 0
+                    )
+                    alerts_with_counts.append(GWAlertSchema(**alert_dict))
 
                 # Return processed results directly
                 return alerts_with_counts
@@ -186,118 +232,87 @@ async def query_alerts(
         # Standard query without instrument-specific logic
         base_query = db.query(GWAlert).filter(*filter_conditions)
 
-    # Apply has_pointings filter if requested
-    if has_pointings:
-        # Only include alerts that have completed pointings
-        # Use a subquery to find graceids with completed pointings
+    # Apply has_pointings filter if requested, or filter by instrument even if
+    # not requiring pointings. Both only include alerts with completed pointings,
+    # read from the counter table.
+    if has_pointings or instrument_id is not None:
+        pointing_subquery = db.query(PointingCount.graceid).filter(
+            PointingCount.status == pointing_status.completed,
+            PointingCount.count > 0,
+        )
         if instrument_id is not None:
             # Filter by specific instrument
-            pointing_subquery = (
-                db.query(PointingEvent.graceid)
-                .join(Pointing, Pointing.id == PointingEvent.pointingid)
-                .filter(
-                    Pointing.status == pointing_status.completed,
-                    Pointing.instrumentid == instrument_id,
-                )
-                .distinct()
-                .subquery()
-            )
-        else:
-            # Filter by any instrument
-            pointing_subquery = (
-                db.query(PointingEvent.graceid)
-                .join(Pointing, Pointing.id == PointingEvent.pointingid)
-                .filter(Pointing.status == pointing_status.completed)
-                .distinct()
-                .subquery()
+            pointing_subquery = pointing_subquery.filter(
+                PointingCount.instrumentid == instrument_id
             )
 
-        base_query = base_query.filter(
-            GWAlert.graceid.in_(db.query(pointing_subquery.c.graceid))
-        )
-    elif instrument_id is not None:
-        # Filter by instrument even if not requiring pointings
-        pointing_subquery = (
-            db.query(PointingEvent.graceid)
-            .join(Pointing, Pointing.id == PointingEvent.pointingid)
-            .filter(
-                Pointing.instrumentid == instrument_id,
-                Pointing.status == pointing_status.completed,
+        base_query = base_query.filter(GWAlert.graceid.in_(pointing_subquery))
+
+    # Keyset pagination on (datecreated, id), newest first and undated alerts last
+    ordered_query = base_query.order_by(*keyset_order(GWAlert.datecreated, GWAlert.id))
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise validation_exception(
+                message="Invalid cursor",
+                errors=["Use the next_cursor value returned by a previous query"],
             )
-            .distinct()
-            .subquery()
-        )
-
-        base_query = base_query.filter(
-            GWAlert.graceid.in_(db.query(pointing_subquery.c.graceid))
+        ordered_query = ordered_query.filter(
+            keyset_after(GWAlert.datecreated, GWAlert.id, after)
         )
 
-    # Get total count
-    total = base_query.count()
-
-    # Calculate pagination values
-    offset = (page - 1) * per_page
-    total_pages = (total + per_page - 1) // per_page  # Ceiling division
+    def next_cursor_for(rows, page_size):
+        if len(rows) <= page_size:
+            return None
+        last = rows[page_size - 1]
+        return encode_cursor(last.datecreated, last.id)
 
     # Return format based on format parameter
     if format == "paginated":
-        # Get paginated results
-        results = (
-            base_query.order_by(GWAlert.datecreated.desc())
-            .offset(offset)
-            .limit(per_page)
-            .all()
-        )
-
-        # Process results based on whether we have pointing counts
-        if include_pointing_count and instrument_id is not None:
-            alerts = []
-            for result in results:
-                alert = result[0]  # GWAlert object
-                pointing_count = result[1]  # pointing count
-                # Create alert dict and add pointing count
-                alert_dict = {**alert.__dict__}
-                alert_dict["pointing_count"] = pointing_count
-                alerts.append(GWAlertSchema(**alert_dict))
+        # Fetch one extra row to know whether another page follows
+        if cursor:
+            rows = ordered_query.limit(per_page + 1).all()
         else:
-            alerts = [GWAlertSchema.model_validate(alert) for alert in results]
+            rows = ordered_query.offset((page - 1) * per_page).limit(per_page + 1).all()
+        has_next = len(rows) > per_page
+
+        total = 0
+        total_pages = 0
+        if include_total:
+            count_key = (
+                graceid,
+                alert_type,
+                role,
+                observing_run,
+                far,
+                has_pointings,
+                instrument_id,
+            )
+            total = alert_count_cache.get_or_set(count_key, base_query.count)
+            total_pages = (total + per_page - 1) // per_page  # Ceiling division
 
         return GWAlertQueryResponse(
-            alerts=alerts,
+            alerts=[GWAlertSchema.model_validate(alert) for alert in rows[:per_page]],
             total=total,
             page=page,
             per_page=per_page,
             total_pages=total_pages,
-            has_next=page < total_pages,
-            has_prev=page > 1,
+            has_next=has_next,
+            has_prev=page > 1 or cursor is not None,
+            next_cursor=next_cursor_for(rows, per_page),
         )
     else:
-        # Simple format (backwards compatible) - return all results as list
-        results = base_query.order_by(GWAlert.datecreated.desc()).all()
-
-        # Process results based on whether we have pointing counts
-        if include_pointing_count and instrument_id is not None:
-            alerts = []
-            for result in results:
-                alert = result[0]  # GWAlert object
-                pointing_count = result[1]  # pointing count
-                # Create alert dict and add pointing count
-                alert_dict = {**alert.__dict__}
-                alert_dict["pointing_count"] = pointing_count
-                alerts.append(GWAlertSchema(**alert_dict))
-            return alerts
-        else:
-            return [GWAlertSchema.model_validate(alert) for alert in results]
+        # Simple format (backwards compatible list), capped at `limit` alerts
+        rows = ordered_query.limit(limit + 1).all()
+        next_cursor = next_cursor_for(rows, limit)
+        if next_cursor and response is not None:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return [GWAlertSchema.model_validate(alert) for alert in rows[:limit]]
 
 
-@router.get("/alert_filter_options", response_model=GWAlertFilterOptionsResponse)
-async def get_alert_filter_options(db: Session = Depends(get_db)):
-    """
-    Get available filter options for GW alerts.
-
-    Returns unique values for observing_runs, roles, and alert_types
-    from the database to populate filter dropdowns dynamically.
-    """
+def load_alert_filter_options(db: Session) -> GWAlertFilterOptionsResponse:
+    """Read the distinct observing runs, roles and alert types from gw_alert."""
     # Get unique observing runs
     observing_runs = (
         db.query(GWAlert.observing_run)
@@ -323,3 +338,14 @@ async def get_alert_filter_options(db: Session = Depends(get_db)):
     return GWAlertFilterOptionsResponse(
         observing_runs=observing_runs, roles=roles, alert_types=alert_types
     )
+
+
+@router.get("/alert_filter_options", response_model=GWAlertFilterOptionsResponse)
+async def get_alert_filter_options(db: Session = Depends(get_db)):
+    """
+    Get available filter options for GW alerts.
+
+    Returns unique values for observing_runs, roles, and alert_types
+    from the database to populate filter dropdowns dynamically.
+    """
+    return load_alert_filter_options(db)
@@ -6,6 +6,7 @@ from fastapi import APIRouter
 from .query_alerts import router as query_alerts_router
 from .post_alert import router as post_alert_router
 from .get_skymap import router as get_skymap_router
+from .get_skymap_products import router as get_skymap_products_router
 from .get_contour import router as get_contour_router
 from .get_grb_moc import router as get_grb_moc_router
 from .delete_test_alerts import router as delete_test_alerts_router
@@ -17,6 +18,7 @@ router = APIRouter(tags=["gw_alerts"])
 router.include_router(query_alerts_router)
 router.include_router(post_alert_router)
 router.include_router(get_skymap_router)
+router.include_router(get_skymap_products_router)
 router.include_router(get_contour_router)
 router.include_router(get_grb_moc_router)
 router.include_router(delete_test_alerts_router)
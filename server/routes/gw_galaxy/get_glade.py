@@ -7,72 +7,113 @@ from sqlalchemy.orm import Session
 
 from server.db.database import get_db
 from server.auth.auth import get_current_user
+from server.utils import spatial
+from server.utils.error_handling import validation_exception
 
 router = APIRouter(tags=["galaxies"])
 
 
+def glade_base_filter():
+    """Galaxies served by the GLADE endpoints (matches the partial GiST index)."""
+    from server.db.models.glade import Glade2P3
+
+    return [
+        Glade2P3.pgc_number != -1,
+        Glade2P3.distance > 0,
+        Glade2P3.distance < 100,
+    ]
+
+
+def glade_name_match(name: str):
+    """
+    Substring match of a name over the catalog aliases, and its rank.
+
+    Each alias column has a trigram GIN index, so the LIKE '%name%' predicates
+    run as bitmap index scans. The rank is the best trigram similarity of any
+    alias, so exact and near-exact names come first.
+
+    Returns:
+        Tuple of (filter, rank expression)
+    """
+    from sqlalchemy import func, or_
+    from server.db.models.glade import Glade2P3
+
+    columns = [
+        Glade2P3._2mass_name,
+        Glade2P3.gwgc_name,
+        Glade2P3.hyperleda_name,
+        Glade2P3.sdssdr12_name,
+    ]
+    match = or_(*(column.contains(name, autoescape=True) for column in columns))
+    # greatest() skips the NULL similarity of missing aliases
+    rank = func.greatest(*(func.similarity(column, name) for column in columns))
+    return match, rank
+
+
+def glade_to_dict(galaxy) -> dict:
+    """Serialise a Glade2P3 row, with the position as a WKT string."""
+    galaxy_dict = {c.name: getattr(galaxy, c.name) for c in galaxy.__table__.columns}
+
+    # Convert position to WKT string if it exists
+    if galaxy.position:
+        shape = to_shape(galaxy.position)
+        galaxy_dict["position"] = str(shape)
+
+    return galaxy_dict
+
+
 @router.get("/glade")
 async def get_galaxies(
     ra: Optional[float] = Query(None, description="Right ascension"),
     dec: Optional[float] = Query(None, description="Declination"),
     name: Optional[str] = Query(None, description="Galaxy name to search for"),
+    radius: Optional[float] = Query(
+        None, description="Only galaxies within this many degrees of ra/dec"
+    ),
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
     """
     Get galaxies from the GLADE catalog.
+
+    With ra/dec, returns the 15 nearest galaxies (optionally within radius
+    degrees), found with an index-ordered KNN scan. With name, returns
+    galaxies with an alias containing it, ranked by trigram similarity.
     """
     from server.utils.function import isFloat
     from server.db.models.glade import Glade2P3
 
+    if radius is not None and not 0.0 < radius <= 180.0:
+        raise validation_exception(
+            message="Invalid radius",
+            errors=["radius must be greater than 0 and at most 180 degrees"],
+        )
+
     filter_conditions = []
-    base_filter = [
-        Glade2P3.pgc_number != -1,
-        Glade2P3.distance > 0,
-        Glade2P3.distance < 100,
-    ]
 
     # Create base query
-    query = db.query(Glade2P3).filter(*base_filter)
+    query = db.query(Glade2P3).filter(*glade_base_filter())
 
     # Handle orderby for positioning
     orderby = []
 
     # Handle ra and dec
     if ra is not None and dec is not None and isFloat(ra) and isFloat(dec):
-        from sqlalchemy import func
-
-        geom = f"SRID=4326;POINT({ra} {dec})"
-        orderby.append(func.ST_Distance(Glade2P3.position, geom))
-
-    # Handle name search
-    if name:
-        from sqlalchemy import or_
-
-        or_conditions = [
-            Glade2P3._2mass_name.contains(name.strip()),
-            Glade2P3.gwgc_name.contains(name.strip()),
-            Glade2P3.hyperleda_name.contains(name.strip()),
-            Glade2P3.sdssdr12_name.contains(name.strip()),
-        ]
-        filter_conditions.append(or_(*or_conditions))
+        center = spatial.sky_point(ra, dec)
+        orderby.append(spatial.knn_order(Glade2P3.position, center))
+        if radius is not None:
+            filter_conditions.append(
+                spatial.within_filter(Glade2P3.position, center, radius)
+            )
+
+    # Handle name search, best matches first (after distance, if given)
+    if name and name.strip():
+        match, rank = glade_name_match(name.strip())
+        filter_conditions.append(match)
+        orderby.append(rank.desc())
 
     # Execute query
     galaxies = query.filter(*filter_conditions).order_by(*orderby).limit(15).all()
 
     # Parse galaxies to dict format
-    result = []
-    for galaxy in galaxies:
-        # Convert to dict
-        galaxy_dict = {
-            c.name: getattr(galaxy, c.name) for c in galaxy.__table__.columns
-        }
-
-        # Convert position to WKT string if it exists
-        if galaxy.position:
-            shape = to_shape(galaxy.position)
-            galaxy_dict["position"] = str(shape)
-
-        result.append(galaxy_dict)
-
-    return result
+    return [glade_to_dict(galaxy) for galaxy in galaxies]
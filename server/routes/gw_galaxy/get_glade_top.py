@@ -0,0 +1,91 @@
+"""Get skymap-ranked GLADE galaxies endpoint."""
+
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from server.db.database import get_db
+from server.db.models.gw_alert import GWAlert, GWAlertHead
+from server.auth.auth import get_current_user
+from server.services.alert_products import SkymapProducts
+from server.utils.cache import TTLCache
+from server.utils.error_handling import not_found_exception, validation_exception
+from server.utils.glade_index import get_glade_index
+from server.config import settings
+
+router = APIRouter(tags=["galaxies"])
+
+# Rankings per (alert, credible level, limit); a new alert gets a new id
+glade_top_cache = TTLCache(3600, 256)
+
+
+@router.get("/glade_top")
+async def get_glade_top(
+    graceid: str = Query(..., description="Grace ID of the GW event"),
+    limit: int = Query(100, ge=1, le=1000, description="Number of galaxies"),
+    credible_level: float = Query(
+        0.9, description="Credible region to select galaxies from (0 to 1)"
+    ),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """
+    Get the most probable GLADE host galaxies for the latest skymap of an event.
+
+    Galaxies inside the credible region are looked up by HEALPix pixel in the
+    in-memory GLADE index and ranked by 3D skymap probability (2D for skymaps
+    without distance layers). Returns 503 until the index snapshot is built.
+
+    Parameters:
+    - graceid: The Grace ID of the GW event
+    - limit: Number of galaxies to return (default 100)
+    - credible_level: Credible region to select galaxies from (default 0.9)
+
+    Returns galaxies (id, pgc_number, ra, dec, distance, probability) by
+    descending probability, normalised over the credible region.
+    """
+    if not 0 < credible_level <= 1:
+        raise validation_exception(
+            message="Invalid credible_level",
+            errors=["credible_level must be greater than 0 and at most 1"],
+        )
+
+    graceid = GWAlert.graceidfromalternate(graceid, db)
+    head = GWAlertHead.get(graceid, db)
+    if head is None:
+        raise not_found_exception(f"No alert found with graceid: {graceid}")
+
+    cache_key = (head.alert_id, credible_level, limit)
+    galaxies = glade_top_cache.get(cache_key)
+    if galaxies is not None:
+        return galaxies
+
+    index = await asyncio.to_thread(get_glade_index)
+    if index is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={
+                "message": "GLADE index not available",
+                "errors": [
+                    "Build it with `python -m server.utils.glade_index` "
+                    "and set GLADE_INDEX_DIR"
+                ],
+            },
+        )
+
+    products = SkymapProducts(head.path_info, head.skymap_path)
+    try:
+        layers = await asyncio.to_thread(products.layers)
+    except Exception as e:
+        raise not_found_exception(
+            f"Error retrieving skymap file: {head.skymap_path} "
+            f"from {settings.STORAGE_BUCKET_SOURCE} storage. "
+            f"{type(e).__name__}: {str(e)}"
+        )
+
+    galaxies = await asyncio.to_thread(
+        index.top_galaxies, layers, limit, credible_level
+    )
+    glade_top_cache.set(cache_key, galaxies)
+    return galaxies
@@ -11,6 +11,7 @@ from server.db.models.gw_galaxy import GWGalaxyList, GWGalaxyEntry
 from server.auth.auth import get_current_user
 from server.schemas.gw_galaxy import PostEventGalaxiesRequest, PostEventGalaxiesResponse
 from server.utils.error_handling import validation_exception
+from server.utils import doi_queue
 
 router = APIRouter(tags=["galaxies"])
 
@@ -170,24 +171,23 @@ async def post_event_galaxies(
 
     db.flush()
 
-    # Handle DOI if requested
+    # Queue DOI minting if requested; the worker fills in doi_url/doi_id later
+    task = None
     if post_doi and valid_galaxies:
-        from server.utils.function import create_galaxy_score_doi
-
-        doi_id, url = create_galaxy_score_doi(
-            valid_galaxies, creators, request.reference, graceid, alert.alert_type
+        task = doi_queue.enqueue_galaxy_list_doi(
+            gw_galaxy_list.id,
+            graceid,
+            creators,
+            request.reference,
+            alert.alert_type,
+            user.id,
+            db,
         )
-
-        if url is None and doi_id is not None:
-            errors.append(
-                "There was an error with the DOI request. Please ensure that author group's ORIC/GND values are accurate"
-            )
-        else:
-            gw_galaxy_list.doi_id = doi_id
-            gw_galaxy_list.doi_url = url
-            doi_string = f". DOI url: {url}."
+        doi_string = ". DOI pending."
 
     db.commit()
+    if task is not None:
+        doi_queue.notify_worker()
 
     return PostEventGalaxiesResponse(
         message=f"Successful adding of {len(valid_galaxies)} galaxies for event {graceid}{doi_string} List ID: {gw_galaxy_list.id}",
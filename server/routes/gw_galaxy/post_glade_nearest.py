@@ -0,0 +1,99 @@
+"""Batch nearest GLADE galaxies endpoint."""
+
+from fastapi import APIRouter, Depends
+from geoalchemy2 import Geography
+from sqlalchemy import Float, Integer, cast, column, func, select, true, values
+from sqlalchemy.orm import Session, aliased
+
+from server.db.database import get_db
+from server.db.models.glade import Glade2P3
+from server.auth.auth import get_current_user
+from server.routes.gw_galaxy.get_glade import glade_base_filter, glade_to_dict
+from server.schemas.gw_galaxy import GladeNearestRequest
+from server.utils import spatial
+from server.utils.error_handling import validation_exception
+
+router = APIRouter(tags=["galaxies"])
+
+# Most positions accepted by one request
+GLADE_NEAREST_MAX_POSITIONS = 1000
+
+
+@router.post("/glade_nearest")
+async def get_nearest_galaxies(
+    request: GladeNearestRequest,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """
+    Get the nearest GLADE galaxies to each of a batch of positions, e.g. to
+    match candidates to host galaxies.
+
+    All positions are answered by one query: a LATERAL join runs an
+    index-ordered KNN (<->) search per position.
+
+    Parameters:
+    - positions: [ra, dec] pairs in degrees
+    - radius: Optional maximum separation in degrees
+    - limit: Galaxies returned per position (default 1)
+
+    Returns one entry per position, in request order, with its galaxies
+    nearest first and their separation in degrees.
+    """
+    if len(request.positions) > GLADE_NEAREST_MAX_POSITIONS:
+        raise validation_exception(
+            message="Too many positions",
+            errors=[f"At most {GLADE_NEAREST_MAX_POSITIONS} positions per request"],
+        )
+    for position in request.positions:
+        if len(position) != 2 or not -90.0 <= position[1] <= 90.0:
+            raise validation_exception(
+                message="Invalid position",
+                errors=["Each position must be [ra, dec] with dec between -90 and 90"],
+            )
+
+    results = [{"ra": ra, "dec": dec, "galaxies": []} for ra, dec in request.positions]
+    if not results:
+        return results
+
+    points = values(
+        column("idx", Integer),
+        column("ra", Float),
+        column("dec", Float),
+        name="points",
+    ).data([(i, ra, dec) for i, (ra, dec) in enumerate(request.positions)])
+    center = cast(
+        func.ST_SetSRID(func.ST_MakePoint(points.c.ra, points.c.dec), 4326),
+        Geography(srid=4326),
+    )
+
+    filters = glade_base_filter()
+    if request.radius is not None:
+        filters.append(spatial.within_filter(Glade2P3.position, center, request.radius))
+
+    nearest = (
+        select(
+            Glade2P3,
+            spatial.sphere_distance(Glade2P3.position, center).label("distance_m"),
+        )
+        .where(*filters)
+        .order_by(spatial.knn_order(Glade2P3.position, center))
+        .limit(request.limit)
+        .lateral("nearest")
+    )
+    galaxy = aliased(Glade2P3, nearest)
+
+    rows = (
+        db.query(points.c.idx, galaxy, nearest.c.distance_m)
+        .select_from(points)
+        .join(nearest, true())
+        .order_by(points.c.idx, nearest.c.distance_m)
+        .all()
+    )
+
+    for idx, match, distance_m in rows:
+        galaxy_dict = glade_to_dict(match)
+        galaxy_dict["separation"] = spatial.meters_to_degrees(distance_m)
+        results[idx]["galaxies"].append(galaxy_dict)
+
+    return results
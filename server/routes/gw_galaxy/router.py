@@ -7,6 +7,8 @@ from .get_event_galaxies import router as get_event_galaxies_router
 from .post_event_galaxies import router as post_event_galaxies_router
 from .remove_event_galaxies import router as remove_event_galaxies_router
 from .get_glade import router as get_glade_router
+from .post_glade_nearest import router as post_glade_nearest_router
+from .get_glade_top import router as get_glade_top_router
 
 # Create the main router that includes all GW galaxy routes
 router = APIRouter(tags=["galaxies"])
@@ -16,3 +18,5 @@ router.include_router(get_event_galaxies_router)
 router.include_router(post_event_galaxies_router)
 router.include_router(remove_event_galaxies_router)
 router.include_router(get_glade_router)
+router.include_router(post_glade_nearest_router)
+router.include_router(get_glade_top_router)
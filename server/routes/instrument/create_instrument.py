@@ -13,6 +13,8 @@ from server.schemas.instrument import (
     InstrumentSchema,
 )
 from server.auth.auth import get_current_user
+from server.utils.pointing import invalidate_name_lookups
+from server.routes.metadata.get_metadata import invalidate_metadata
 from server.utils.footprint_processing import (
     get_scale_factor,
     create_rectangular_footprint,
@@ -128,6 +130,8 @@ async def create_instrument(
         # Commit everything
         db.commit()
         db.refresh(new_instrument)
+        invalidate_name_lookups()
+        invalidate_metadata(db)
 
         # Create response with the full instrument data
         instrument_schema = InstrumentSchema.model_validate(new_instrument)
@@ -8,8 +8,7 @@ import json
 
 from server.db.database import get_db
 from server.db.models.instrument import Instrument
-from server.db.models.pointing import Pointing
-from server.db.models.pointing_event import PointingEvent
+from server.db.models.pointing import Pointing, PointingCount
 from server.schemas.instrument import InstrumentSchema
 from server.core.enums.pointingstatus import PointingStatus
 from server.utils.error_handling import validation_exception
@@ -42,7 +41,9 @@ async def get_instruments(
     Returns a list of instrument objects
     """
     if reporting_only:
-        # Special query for reporting instruments (matching Flask logic)
+        # Special query for reporting instruments (matching Flask logic), summing
+        # the per-event completed counts instead of aggregating the pointings
+        num_pointings = func.sum(PointingCount.count)
         query = (
             db.query(
                 Instrument.id,
@@ -51,11 +52,10 @@ async def get_instruments(
                 Instrument.instrument_type,
                 Instrument.datecreated,
                 Instrument.submitterid,
-                func.count(Pointing.id).label("num_pointings"),
+                num_pointings.label("num_pointings"),
             )
-            .join(Pointing, Instrument.id == Pointing.instrumentid)
-            .join(PointingEvent, PointingEvent.pointingid == Pointing.id)
-            .filter(Pointing.status == PointingStatus.completed)
+            .join(PointingCount, Instrument.id == PointingCount.instrumentid)
+            .filter(PointingCount.status == PointingStatus.completed)
             .group_by(
                 Instrument.id,
                 Instrument.instrument_name,
@@ -64,7 +64,8 @@ async def get_instruments(
                 Instrument.datecreated,
                 Instrument.submitterid,
             )
-            .order_by(func.count(Pointing.id).desc())
+            .having(num_pointings > 0)
+            .order_by(num_pointings.desc())
         )
 
         results = query.all()
@@ -79,7 +80,7 @@ async def get_instruments(
                 "instrument_type": result.instrument_type,
                 "datecreated": result.datecreated,
                 "submitterid": result.submitterid,
-                "num_pointings": result.num_pointings,
+                "num_pointings": int(result.num_pointings),
             }
             instruments.append(InstrumentSchema(**instrument_dict))
 
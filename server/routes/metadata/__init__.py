@@ -0,0 +1 @@
+"""Metadata bundle endpoints."""
@@ -0,0 +1,97 @@
+"""Metadata bundle endpoint."""
+
+from typing import Tuple
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import Response
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from server.db.database import get_db
+from server.db.models.instrument import Instrument
+from server.routes.enums.router import get_all_enums
+from server.routes.gw_alert.query_alerts import load_alert_filter_options
+from server.schemas.instrument import InstrumentSchema
+from server.schemas.metadata import MetadataBundleResponse
+from server.utils.cache import TTLCache
+from server.utils.http_cache import strong_etag, etag_matches, not_modified
+
+router = APIRouter(tags=["metadata"])
+
+# Clients may keep the bundle but must revalidate it with If-None-Match
+METADATA_CACHE_CONTROL = "public, no-cache"
+
+# The encoded bundle, its ETag and the data version it was built from. Every
+# replica keeps its own copy, so each request compares the version with the
+# database; the TTL bounds staleness from edits the version cannot see.
+metadata_cache = TTLCache(ttl_seconds=600, maxsize=1)
+
+# Index-only reads: the largest alert and instrument ids catch rows inserted by
+# any process (including SQL loads), and the sequence is bumped by every
+# writer through invalidate_metadata, which also covers deletes
+METADATA_VERSION_SQL = text(
+    "SELECT (SELECT max(id) FROM public.gw_alert), "
+    "(SELECT max(id) FROM public.instrument), "
+    "(SELECT last_value FROM public.metadata_version_seq)"
+)
+
+
+def invalidate_metadata(db: Session) -> None:
+    """
+    Mark the bundle stale after alerts or instruments are added or removed.
+
+    Bumps the shared version sequence so every replica rebuilds its bundle,
+    not only this one. Sequences are not transactional, so this may be called
+    before or after the commit.
+    """
+    db.execute(select(func.nextval("public.metadata_version_seq")))
+    metadata_cache.invalidate()
+
+
+def metadata_version(db: Session) -> Tuple:
+    """Cheap fingerprint of the rows the bundle is built from."""
+    return tuple(db.execute(METADATA_VERSION_SQL).one())
+
+
+async def build_metadata_bundle(db: Session) -> Tuple[bytes, str]:
+    """Encode the bundle once and derive its strong ETag from the bytes."""
+    instruments = db.query(Instrument).order_by(Instrument.id).all()
+    enums = await get_all_enums()
+    bundle = MetadataBundleResponse(
+        alert_filter_options=load_alert_filter_options(db),
+        enums=enums.enums,
+        instruments=[InstrumentSchema.model_validate(i) for i in instruments],
+    )
+    content = bundle.model_dump_json().encode()
+    return content, strong_etag(content)
+
+
+@router.get(
+    "/metadata",
+    response_model=MetadataBundleResponse,
+    responses={304: {"description": "Bundle unchanged since the ETag sent"}},
+)
+async def get_metadata(request: Request, db: Session = Depends(get_db)):
+    """
+    Get the alert filter options, all enums and all instruments in one response.
+
+    The bundle is built once per process and reused while the alert and
+    instrument tables are unchanged. The ETag is a hash of the bundle, so every
+    replica sends the same one; send it as If-None-Match to get an empty 304
+    when nothing has changed.
+    """
+    version = metadata_version(db)
+    cached = metadata_cache.get("bundle")
+    if cached is None or cached[0] != version:
+        cached = (version, *await build_metadata_bundle(db))
+        metadata_cache.set("bundle", cached)
+    _, content, etag = cached
+
+    if etag_matches(request, etag):
+        return not_modified(etag, METADATA_CACHE_CONTROL)
+
+    return Response(
+        content=content,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": METADATA_CACHE_CONTROL},
+    )
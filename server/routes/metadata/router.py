@@ -0,0 +1,8 @@
+"""Metadata bundle router."""
+
+from fastapi import APIRouter
+from .get_metadata import router as get_metadata_router
+
+router = APIRouter()
+
+router.include_router(get_metadata_router)
@@ -5,7 +5,7 @@ from sqlalchemy.orm import Session
 from datetime import datetime
 
 from server.db.database import get_db
-from server.db.models.pointing import Pointing
+from server.db.models.pointing import Pointing, PointingCount
 from server.db.models.pointing_event import PointingEvent
 from server.db.models.gw_alert import GWAlert
 from server.schemas.pointing import CancelAllRequest
@@ -41,14 +41,18 @@ async def cancel_all(
     ]
 
     # Query the pointings
-    pointings = db.query(Pointing).filter(*filter_conditions)
-    pointing_count = pointings.count()
+    pointings = db.query(Pointing).filter(*filter_conditions).all()
+    pointing_count = len(pointings)
 
     # Update the status
     for pointing in pointings:
         pointing.status = pointing_status_enum.cancelled
         pointing.dateupdated = datetime.now()
 
+    PointingCount.apply(
+        PointingCount.status_change_deltas(pointings, pointing_status_enum.planned, db),
+        db,
+    )
     db.commit()
 
     return {"message": f"Updated {pointing_count} Pointings successfully"}
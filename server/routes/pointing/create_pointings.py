@@ -1,30 +1,82 @@
 """Create pointings endpoint."""
 
-from fastapi import APIRouter, Depends
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header
 from sqlalchemy.orm import Session
 
 from server.db.database import get_db
 from server.db.models.pointing import Pointing
-from server.db.models.pointing_event import PointingEvent
 from server.schemas.pointing import PointingCreateRequest, PointingResponse
 from server.auth.auth import get_current_user
 from server.utils import pointing as pointing_utils
+from server.utils import idempotency
+from server.utils import doi_queue
 
 router = APIRouter(tags=["pointings"])
 
+# Endpoint name recorded with stored Idempotency-Key results
+IDEMPOTENCY_ENDPOINT = "POST /pointings"
+
 
 @router.post("/pointings", response_model=PointingResponse)
 async def add_pointings(
     request: PointingCreateRequest,
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
 ):
     """
     Add new pointings to the database.
+
+    New pointings are inserted in batches of multi-row INSERT ... RETURNING
+    statements, so large survey submissions do not flush one row at a time.
+    Rows that fail validation or duplicate an existing pointing are reported
+    in ERRORS and skipped.
+
+    With an Idempotency-Key header the result is stored, and a retry with the
+    same key and payload replays it without re-running the submission.
     """
+    if idempotency_key is not None:
+        stored = idempotency.claim_idempotency_key(
+            idempotency_key,
+            IDEMPOTENCY_ENDPOINT,
+            user.id,
+            idempotency.request_fingerprint(request),
+            db,
+        )
+        if stored is not None:
+            return PointingResponse(**stored)
+
+    try:
+        return _add_pointings(request, db, user, idempotency_key)
+    except Exception:
+        if idempotency_key is not None:
+            idempotency.release_idempotency_key(
+                idempotency_key, IDEMPOTENCY_ENDPOINT, user.id, db
+            )
+        raise
+
+
+def _add_pointings(
+    request: PointingCreateRequest,
+    db: Session,
+    user,
+    idempotency_key: Optional[str],
+) -> PointingResponse:
+    """Submit the pointings, recording the result against the idempotency key."""
+
+    def record_response(response: PointingResponse):
+        if idempotency_key is not None:
+            idempotency.store_idempotent_response(
+                idempotency_key,
+                IDEMPOTENCY_ENDPOINT,
+                user.id,
+                response.model_dump(mode="json"),
+                db,
+            )
+
     # Initialize variables
-    points = []
-    errors = []
     warnings = []
 
     # Validate graceid exists
@@ -41,14 +93,7 @@ async def add_pointings(
     instruments_dict = pointing_utils.get_instruments_dict(db)
 
     # Get existing pointings for duplicate check
-    existing_pointings = (
-        db.query(Pointing)
-        .filter(
-            Pointing.id == PointingEvent.pointingid,
-            PointingEvent.graceid == request.graceid,
-        )
-        .all()
-    )
+    existing_keys = pointing_utils.get_existing_pointing_keys(request.graceid, db)
 
     # Process pointings (either single or multiple)
     pointings_to_process = []
@@ -57,77 +102,48 @@ async def add_pointings(
     elif request.pointings:
         pointings_to_process = request.pointings
 
-    for pointing_data in pointings_to_process:
-        try:
-            # Check if this is an update to a planned pointing
-            if hasattr(pointing_data, "id") and pointing_data.id:
-                # Handle planned pointing update
-                pointing_obj = pointing_utils.handle_planned_pointing_update(
-                    pointing_data, user.id, db
-                )
-            else:
-                # Validate and resolve instrument reference
-                instrument_id = pointing_utils.validate_instrument_reference(
-                    pointing_data, instruments_dict
-                )
-
-                # Create new pointing object
-                pointing_obj = pointing_utils.create_pointing_from_schema(
-                    pointing_data, user.id, instrument_id
-                )
-
-                # Check for duplicates
-                if pointing_utils.check_duplicate_pointing(
-                    pointing_obj, existing_pointings
-                ):
-                    errors.append(
-                        [
-                            f"Object: {pointing_data.dict()}",
-                            ["Pointing already submitted"],
-                        ]
-                    )
-                    continue
-
-            points.append(pointing_obj)
-            db.add(pointing_obj)
-
-        except Exception as e:
-            errors.append([f"Object: {pointing_data.model_dump()}", [str(e)]])
-
-    # Flush to get pointing IDs
-    db.flush()
+    pointing_ids, errors = pointing_utils.submit_pointings(
+        pointings_to_process,
+        request.graceid,
+        user.id,
+        instruments_dict,
+        existing_keys,
+        db,
+    )
 
-    # Create pointing events (this should always happen when we have valid points and graceid)
-    if points:  # Only create pointing events if we have valid points
-        for p in points:
-            pointing_event = PointingEvent(pointingid=p.id, graceid=request.graceid)
-            db.add(pointing_event)
+    response = PointingResponse(
+        pointing_ids=pointing_ids,
+        ERRORS=errors,
+        WARNINGS=warnings,
+        DOI=None,
+    )
 
+    # The result is stored in the same transaction as the pointings, so a
+    # retry can never insert them a second time
+    record_response(response)
     db.flush()
     db.commit()
 
-    # Handle DOI creation if requested
+    # Queue DOI minting if requested; the worker fills in doi_url/doi_id later
     doi_url = None
-    if request.request_doi and points:
+    if request.request_doi and pointing_ids:
+        points = db.query(Pointing).filter(Pointing.id.in_(pointing_ids)).all()
         if request.doi_url:
-            doi_id, doi_url = 0, request.doi_url
-        else:
-            doi_id, doi_url = pointing_utils.create_doi_for_pointings(
-                points, request.graceid, creators, db
-            )
-
-        if doi_id is not None:
+            doi_url = request.doi_url
             for p in points:
                 p.doi_url = doi_url
-                p.doi_id = doi_id
+                p.doi_id = 0
+            response.DOI = doi_url
+        else:
+            pointing_utils.queue_doi_for_pointings(
+                points, request.graceid, creators, user.id, db
+            )
+            response.DOI_STATUS = doi_queue.STATUS_PENDING
 
-            db.flush()
-            db.commit()
+        record_response(response)
+        db.flush()
+        db.commit()
+        doi_queue.notify_worker()
 
     # Return response
-    return PointingResponse(
-        pointing_ids=[p.id for p in points],
-        ERRORS=errors,
-        WARNINGS=warnings,
-        DOI=doi_url,
-    )
+    return response
@@ -0,0 +1,210 @@
+"""Columnar bulk export endpoint for pointings."""
+
+import csv
+import io
+import logging
+from typing import Iterator, List
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from server.db.database import get_db, db_session
+from server.schemas.pointing import PointingQueryParams
+from server.utils.error_handling import validation_exception
+from server.routes.pointing.get_pointings import (
+    build_pointing_query,
+    pointing_row_to_dict,
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["pointings"])
+
+# Rows fetched from the server-side cursor and written per record batch
+EXPORT_BATCH_SIZE = 20000
+
+# format -> (media type, file extension)
+EXPORT_FORMATS = {
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+    "csv": ("text/csv", "csv"),
+}
+
+# Arrow column types, fixed up front so every batch shares one schema
+EXPORT_ARROW_TYPES = {
+    "id": "int64",
+    "position": "string",
+    "ra": "float64",
+    "dec": "float64",
+    "instrumentid": "int64",
+    "band": "string",
+    "pos_angle": "float64",
+    "depth": "float64",
+    "depth_err": "float64",
+    "depth_unit": "string",
+    "time": "timestamp",
+    "status": "string",
+    "doi_url": "string",
+    "doi_id": "int64",
+    "submitterid": "int64",
+    "datecreated": "timestamp",
+    "dateupdated": "timestamp",
+    "central_wave": "float64",
+    "bandwidth": "float64",
+    "instrument_name": "string",
+    "username": "string",
+}
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back in chunks.
+
+    The stream position keeps counting across drains, which Parquet needs
+    for the absolute offsets it records in the file footer.
+    """
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _arrow_schema(fields: List[str]):
+    """Build the Arrow schema for the requested pointing fields."""
+    return pa.schema(
+        [
+            (
+                f,
+                (
+                    pa.timestamp("us")
+                    if EXPORT_ARROW_TYPES[f] == "timestamp"
+                    else getattr(pa, EXPORT_ARROW_TYPES[f])()
+                ),
+            )
+            for f in fields
+        ]
+    )
+
+
+def _iter_row_batches(query) -> Iterator[List[dict]]:
+    """Yield pointing dicts in fixed-size batches from a server-side cursor."""
+    # The request-scoped session is closed once the response starts, so the
+    # stream runs the already-built query on its own session.
+    with db_session() as stream_db:
+        batch = []
+        for row in query.with_session(stream_db).yield_per(EXPORT_BATCH_SIZE):
+            batch.append(pointing_row_to_dict(row))
+            if len(batch) >= EXPORT_BATCH_SIZE:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def _stream_columnar(query, fields: List[str], fmt: str) -> Iterator[bytes]:
+    """Stream the query result as Parquet or Arrow IPC stream bytes."""
+    schema = _arrow_schema(fields)
+    sink = _ChunkSink()
+
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+
+    try:
+        for batch in _iter_row_batches(query):
+            record_batch = pa.RecordBatch.from_pylist(batch, schema=schema)
+            writer.write_batch(record_batch)
+            yield sink.drain()
+    except Exception as e:
+        logger.error(f"Pointing export failed mid-stream: {e}")
+        raise
+    finally:
+        writer.close()
+
+    yield sink.drain()
+
+
+def _stream_csv(query, fields: List[str]) -> Iterator[bytes]:
+    """Stream the query result as CSV, one encoded chunk per batch."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction="ignore")
+    writer.writeheader()
+    yield buffer.getvalue().encode()
+
+    for batch in _iter_row_batches(query):
+        buffer.seek(0)
+        buffer.truncate(0)
+        for row in batch:
+            writer.writerow(
+                {
+                    k: (v.isoformat() if hasattr(v, "isoformat") else v)
+                    for k, v in row.items()
+                }
+            )
+        yield buffer.getvalue().encode()
+
+
+@router.get("/pointings/export")
+def export_pointings(
+    params: PointingQueryParams = Depends(),
+    format: str = Query("parquet", description="Output format (parquet, arrow, csv)"),
+    db: Session = Depends(get_db),
+):
+    """
+    Export pointings matching the /pointings filters as Parquet, Arrow IPC or CSV.
+
+    Rows are read through a server-side cursor and written in fixed-size record
+    batches, so memory use stays bounded regardless of the export size.
+    """
+    fmt = format.lower()
+    if fmt not in EXPORT_FORMATS:
+        raise validation_exception(
+            message=f"Invalid format: {format}",
+            errors=[f"Valid formats are: {', '.join(EXPORT_FORMATS)}"],
+        )
+
+    if fmt != "csv" and pa is None:
+        raise validation_exception(
+            message="Columnar export is unavailable",
+            errors=["pyarrow is not installed on this server; use format=csv"],
+        )
+
+    query, requested_fields = build_pointing_query(params, db)
+
+    if fmt == "csv":
+        content = _stream_csv(query, requested_fields)
+    else:
+        content = _stream_columnar(query, requested_fields, fmt)
+
+    media_type, extension = EXPORT_FORMATS[fmt]
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="pointings.{extension}"'
+        },
+    )
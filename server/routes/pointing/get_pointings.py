@@ -1,10 +1,11 @@
 """Get pointings endpoint with comprehensive filtering."""
 
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+from geoalchemy2 import Geometry
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from datetime import datetime
-from typing import List, Optional
+from sqlalchemy import func, cast
+from typing import List
 import json
 
 from server.db.database import get_db
@@ -13,7 +14,7 @@ from server.db.models.instrument import Instrument
 from server.db.models.pointing_event import PointingEvent
 from server.db.models.gw_alert import GWAlert
 from server.db.models.users import Users
-from server.schemas.pointing import PointingSchema
+from server.schemas.pointing import PointingSchema, PointingQueryParams
 from server.utils.error_handling import validation_exception
 from server.core.enums.pointingstatus import PointingStatus as pointing_status_enum
 from server.core.enums.depthunit import DepthUnit as depth_unit_enum
@@ -22,665 +23,628 @@ from server.core.enums.wavelengthunits import WavelengthUnits as wavelength_unit
 from server.core.enums.frequencyunits import FrequencyUnits as frequency_units
 from server.core.enums.energyunits import EnergyUnits as energy_units
 from server.utils.function import isInt, isFloat
+from server.utils import spatial
+from server.utils import pointing as pointing_utils
+from server.utils.formatters import parse_field_list
 
 router = APIRouter(tags=["pointings"])
 
-
-@router.get("/pointings", response_model=List[PointingSchema])
-def get_pointings(
-    # Basic filters
-    graceid: Optional[str] = Query(None, description="Grace ID of the GW event"),
-    graceids: Optional[str] = Query(
-        None, description="Comma-separated list or JSON array of Grace IDs"
-    ),
-    id: Optional[int] = Query(None, description="Filter by pointing ID"),
-    ids: Optional[str] = Query(
-        None, description="Comma-separated list or JSON array of pointing IDs"
-    ),
-    # Status filters
-    status: Optional[str] = Query(
-        None, description="Filter by status (planned, completed, cancelled)"
-    ),
-    statuses: Optional[str] = Query(
-        None, description="Comma-separated list or JSON array of statuses"
-    ),
-    # Time filters
-    completed_after: Optional[datetime] = Query(
-        None, description="Filter for pointings completed after this time (ISO format)"
-    ),
-    completed_before: Optional[datetime] = Query(
-        None, description="Filter for pointings completed before this time (ISO format)"
-    ),
-    planned_after: Optional[datetime] = Query(
-        None, description="Filter for pointings planned after this time (ISO format)"
-    ),
-    planned_before: Optional[datetime] = Query(
-        None, description="Filter for pointings planned before this time (ISO format)"
-    ),
-    # User filters
-    user: Optional[str] = Query(
-        None, description="Filter by username, first name, or last name"
-    ),
-    users: Optional[str] = Query(
-        None, description="Comma-separated list or JSON array of usernames"
-    ),
-    # Instrument filters
-    instrument: Optional[str] = Query(
-        None, description="Filter by instrument ID or name"
-    ),
-    instruments: Optional[str] = Query(
-        None,
-        description="Comma-separated list or JSON array of instrument IDs or names",
-    ),
-    # Band filters
-    band: Optional[str] = Query(None, description="Filter by band"),
-    bands: Optional[str] = Query(
-        None, description="Comma-separated list or JSON array of bands"
-    ),
-    # Spectral filters
-    wavelength_regime: Optional[str] = Query(
-        None, description="Filter by wavelength regime [min, max]"
-    ),
-    wavelength_unit: Optional[str] = Query(
-        None, description="Wavelength unit (angstrom, nanometer, micron)"
-    ),
-    frequency_regime: Optional[str] = Query(
-        None, description="Filter by frequency regime [min, max]"
-    ),
-    frequency_unit: Optional[str] = Query(
-        None, description="Frequency unit (Hz, kHz, MHz, GHz, THz)"
-    ),
-    energy_regime: Optional[str] = Query(
-        None, description="Filter by energy regime [min, max]"
-    ),
-    energy_unit: Optional[str] = Query(
-        None, description="Energy unit (eV, keV, MeV, GeV, TeV)"
-    ),
-    # Depth filters
-    depth_gt: Optional[float] = Query(
-        None, description="Filter by depth greater than this value"
-    ),
-    depth_lt: Optional[float] = Query(
-        None, description="Filter by depth less than this value"
-    ),
-    depth_unit: Optional[str] = Query(
-        None, description="Depth unit (ab_mag, vega_mag, flux_erg, flux_jy)"
-    ),
-    # DB access
-    db: Session = Depends(get_db),
-):
+# Selectable output fields mapped to the SQL columns that produce them
+POINTING_FIELD_COLUMNS = {
+    "id": [Pointing.id],
+    "position": [func.ST_AsText(Pointing.position).label("position")],
+    "ra": [
+        func.ST_X(cast(Pointing.position, Geometry("POINT", srid=4326))).label("ra")
+    ],
+    "dec": [
+        func.ST_Y(cast(Pointing.position, Geometry("POINT", srid=4326))).label("dec")
+    ],
+    "instrumentid": [Pointing.instrumentid],
+    "band": [Pointing.band],
+    "pos_angle": [Pointing.pos_angle],
+    "depth": [Pointing.depth],
+    "depth_err": [Pointing.depth_err],
+    "depth_unit": [Pointing.depth_unit],
+    "time": [Pointing.time],
+    "status": [Pointing.status],
+    "doi_url": [Pointing.doi_url],
+    "doi_id": [Pointing.doi_id],
+    "submitterid": [Pointing.submitterid],
+    "datecreated": [Pointing.datecreated],
+    "dateupdated": [Pointing.dateupdated],
+    "central_wave": [Pointing.central_wave],
+    "bandwidth": [Pointing.bandwidth],
+    "instrument_name": [
+        Instrument.instrument_name,
+        Instrument.nickname.label("instrument_nickname"),
+    ],
+    "username": [Users.username],
+}
+
+# Fields returned when no 'fields' parameter is given (ra/dec live in 'position')
+DEFAULT_POINTING_FIELDS = [f for f in POINTING_FIELD_COLUMNS if f not in ("ra", "dec")]
+
+
+def pointing_row_to_dict(row) -> dict:
+    """Convert a selected pointing row into a PointingSchema-compatible dict."""
+    data = dict(row._mapping)
+
+    for key in ("band", "depth_unit", "status"):
+        if data.get(key) is not None:
+            data[key] = data[key].name
+
+    # Use nickname if available, otherwise fall back to instrument_name (like Flask)
+    if "instrument_nickname" in data:
+        nickname = data.pop("instrument_nickname")
+        if nickname:
+            data["instrument_name"] = nickname
+
+    # PostGIS returns longitude in -180..+180; normalize to 0..360 for astronomy
+    if data.get("ra") is not None and data["ra"] < 0:
+        data["ra"] += 360.0
+
+    return data
+
+
+def build_pointing_query(params: PointingQueryParams, db: Session):
     """
-    Retrieve pointings from the database with optional filters.
+    Build the filtered pointing query shared by the query and export endpoints.
+
+    Args:
+        params: Pointing filters and optional field selection
+        db: Database session
+
+    Returns:
+        Tuple of (query, requested_fields)
     """
-    try:
-        # Build the filter conditions
-        filter_conditions = []
-
-        # Handle graceid
-        if graceid:
-            # Normalize the graceid
-            graceid = GWAlert.graceidfromalternate(graceid, db)
-            filter_conditions.append(PointingEvent.graceid == graceid)
+    # Build the filter conditions
+    filter_conditions = []
+
+    # Handle graceid
+    if params.graceid:
+        # Normalize the graceid
+        graceid = GWAlert.graceidfromalternate(params.graceid, db)
+        filter_conditions.append(PointingEvent.graceid == graceid)
+        filter_conditions.append(PointingEvent.pointingid == Pointing.id)
+
+    # Handle graceids
+    if params.graceids:
+        gids = []
+        try:
+            if isinstance(params.graceids, str):
+                if "[" in params.graceids and "]" in params.graceids:
+                    # Parse as JSON array
+                    gids = json.loads(params.graceids)
+                else:
+                    # Parse as comma-separated list
+                    gids = [g.strip() for g in params.graceids.split(",")]
+            else:
+                gids = params.graceids  # Already a list
+
+            normalized_gids = [GWAlert.graceidfromalternate(gid, db) for gid in gids]
+            filter_conditions.append(PointingEvent.graceid.in_(normalized_gids))
             filter_conditions.append(PointingEvent.pointingid == Pointing.id)
+        except Exception as e:
+            raise validation_exception(
+                message="Error parsing 'graceids'",
+                errors=[
+                    f"Required format is a list: '[graceid1, graceid2...]'",
+                    str(e),
+                ],
+            )
 
-        # Handle graceids
-        if graceids:
-            gids = []
-            try:
-                if isinstance(graceids, str):
-                    if "[" in graceids and "]" in graceids:
-                        # Parse as JSON array
-                        gids = json.loads(graceids)
-                    else:
-                        # Parse as comma-separated list
-                        gids = [g.strip() for g in graceids.split(",")]
+    # Handle ID filters
+    if params.id:
+        if isInt(params.id):
+            filter_conditions.append(Pointing.id == int(params.id))
+        else:
+            raise validation_exception(
+                message="Invalid ID format", errors=["ID must be an integer"]
+            )
+
+    if params.ids:
+        try:
+            id_list = []
+            if isinstance(params.ids, str):
+                if "[" in params.ids and "]" in params.ids:
+                    # Parse as JSON array
+                    id_list = json.loads(params.ids)
                 else:
-                    gids = graceids  # Already a list
+                    # Parse as comma-separated list
+                    id_list = [
+                        int(i.strip())
+                        for i in params.ids.split(",")
+                        if isInt(i.strip())
+                    ]
+            else:
+                id_list = params.ids  # Already a list
 
-                normalized_gids = [
-                    GWAlert.graceidfromalternate(gid, db) for gid in gids
-                ]
-                filter_conditions.append(PointingEvent.graceid.in_(normalized_gids))
-                filter_conditions.append(PointingEvent.pointingid == Pointing.id)
-            except Exception as e:
-                raise validation_exception(
-                    message="Error parsing 'graceids'",
-                    errors=[
-                        f"Required format is a list: '[graceid1, graceid2...]'",
-                        str(e),
-                    ],
-                )
+            filter_conditions.append(Pointing.id.in_(id_list))
+        except Exception as e:
+            raise validation_exception(
+                message="Error parsing 'ids'",
+                errors=[f"Required format is a list: '[id1, id2...]'", str(e)],
+            )
 
-        # Handle ID filters
-        if id:
-            if isInt(id):
-                filter_conditions.append(Pointing.id == int(id))
-            else:
-                raise validation_exception(
-                    message="Invalid ID format", errors=["ID must be an integer"]
-                )
+    # Handle band filters
+    if params.band:
+        for b in bandpass:
+            if b.name == params.band:
+                filter_conditions.append(Pointing.band == b)
+                break
+        else:
+            raise validation_exception(
+                message="Invalid band",
+                errors=[f"The band '{params.band}' is not valid"],
+            )
 
-        if ids:
-            try:
-                id_list = []
-                if isinstance(ids, str):
-                    if "[" in ids and "]" in ids:
-                        # Parse as JSON array
-                        id_list = json.loads(ids)
-                    else:
-                        # Parse as comma-separated list
-                        id_list = [
-                            int(i.strip()) for i in ids.split(",") if isInt(i.strip())
-                        ]
+    if params.bands:
+        try:
+            band_list = []
+            if isinstance(params.bands, str):
+                if "[" in params.bands and "]" in params.bands:
+                    # Parse as JSON array
+                    band_list = json.loads(params.bands)
                 else:
-                    id_list = ids  # Already a list
-
-                filter_conditions.append(Pointing.id.in_(id_list))
-            except Exception as e:
-                raise validation_exception(
-                    message="Error parsing 'ids'",
-                    errors=[f"Required format is a list: '[id1, id2...]'", str(e)],
-                )
+                    # Parse as comma-separated list
+                    band_list = [b.strip() for b in params.bands.split(",")]
+            else:
+                band_list = params.bands  # Already a list
 
-        # Handle band filters
-        if band:
+            valid_bands = []
             for b in bandpass:
-                if b.name == band:
-                    filter_conditions.append(Pointing.band == b)
-                    break
+                if b.name in band_list:
+                    valid_bands.append(b)
+
+            if valid_bands:
+                filter_conditions.append(Pointing.band.in_(valid_bands))
             else:
                 raise validation_exception(
-                    message="Invalid band", errors=[f"The band '{band}' is not valid"]
+                    message="No valid bands",
+                    errors=["No valid bands were specified"],
                 )
+        except Exception as e:
+            raise validation_exception(
+                message="Error parsing bands",
+                errors=[
+                    f"Invalid format for 'bands' parameter. Required format is a list: '[band1, band2...]'",
+                    str(e),
+                ],
+            )
 
-        if bands:
-            try:
-                band_list = []
-                if isinstance(bands, str):
-                    if "[" in bands and "]" in bands:
-                        # Parse as JSON array
-                        band_list = json.loads(bands)
-                    else:
-                        # Parse as comma-separated list
-                        band_list = [b.strip() for b in bands.split(",")]
-                else:
-                    band_list = bands  # Already a list
-
-                valid_bands = []
-                for b in bandpass:
-                    if b.name in band_list:
-                        valid_bands.append(b)
+    # Handle status filters
+    if params.status:
+        if params.status == "planned":
+            filter_conditions.append(Pointing.status == pointing_status_enum.planned)
+        elif params.status == "completed":
+            filter_conditions.append(Pointing.status == pointing_status_enum.completed)
+        elif params.status == "cancelled":
+            filter_conditions.append(Pointing.status == pointing_status_enum.cancelled)
+        else:
+            raise validation_exception(
+                message=f"Invalid status: {params.status}",
+                errors=["Only 'completed', 'planned', and 'cancelled' are valid."],
+            )
 
-                if valid_bands:
-                    filter_conditions.append(Pointing.band.in_(valid_bands))
+    if params.statuses:
+        try:
+            status_list = []
+            if isinstance(params.statuses, str):
+                if "[" in params.statuses and "]" in params.statuses:
+                    # Parse as JSON array
+                    status_list = json.loads(params.statuses)
                 else:
-                    raise validation_exception(
-                        message="No valid bands",
-                        errors=["No valid bands were specified"],
-                    )
-            except Exception as e:
-                raise validation_exception(
-                    message="Error parsing bands",
-                    errors=[
-                        f"Invalid format for 'bands' parameter. Required format is a list: '[band1, band2...]'",
-                        str(e),
-                    ],
-                )
-
-        # Handle status filters
-        if status:
-            if status == "planned":
-                filter_conditions.append(
-                    Pointing.status == pointing_status_enum.planned
-                )
-            elif status == "completed":
-                filter_conditions.append(
-                    Pointing.status == pointing_status_enum.completed
-                )
-            elif status == "cancelled":
-                filter_conditions.append(
-                    Pointing.status == pointing_status_enum.cancelled
-                )
+                    # Parse as comma-separated list
+                    status_list = [s.strip() for s in params.statuses.split(",")]
+            else:
+                status_list = params.statuses  # Already a list
+
+            valid_statuses = []
+            if "planned" in status_list:
+                valid_statuses.append(pointing_status_enum.planned)
+            if "completed" in status_list:
+                valid_statuses.append(pointing_status_enum.completed)
+            if "cancelled" in status_list:
+                valid_statuses.append(pointing_status_enum.cancelled)
+
+            if valid_statuses:
+                filter_conditions.append(Pointing.status.in_(valid_statuses))
             else:
                 raise validation_exception(
-                    message=f"Invalid status: {status}",
-                    errors=["Only 'completed', 'planned', and 'cancelled' are valid."],
+                    message="No valid statuses",
+                    errors=["No valid status values were specified"],
                 )
+        except Exception as e:
+            raise validation_exception(
+                message="Error parsing statuses",
+                errors=[
+                    f"Invalid format for 'statuses' parameter. Required format is a list: '[status1, status2...]'",
+                    str(e),
+                ],
+            )
 
-        if statuses:
-            try:
-                status_list = []
-                if isinstance(statuses, str):
-                    if "[" in statuses and "]" in statuses:
-                        # Parse as JSON array
-                        status_list = json.loads(statuses)
-                    else:
-                        # Parse as comma-separated list
-                        status_list = [s.strip() for s in statuses.split(",")]
+    # Handle time filters
+    if params.completed_after:
+        try:
+            filter_conditions.append(Pointing.status == pointing_status_enum.completed)
+            filter_conditions.append(Pointing.time >= params.completed_after)
+        except ValueError:
+            raise validation_exception(
+                message="Error parsing date",
+                errors=["Should be ISO format, e.g. 2019-05-01T12:00:00.00"],
+            )
+
+    if params.completed_before:
+        try:
+            filter_conditions.append(Pointing.status == pointing_status_enum.completed)
+            filter_conditions.append(Pointing.time <= params.completed_before)
+        except ValueError:
+            raise validation_exception(
+                message="Error parsing date",
+                errors=["Should be ISO format, e.g. 2019-05-01T12:00:00.00"],
+            )
+
+    if params.planned_after:
+        try:
+            filter_conditions.append(Pointing.status == pointing_status_enum.planned)
+            filter_conditions.append(Pointing.time >= params.planned_after)
+        except ValueError:
+            raise validation_exception(
+                message="Error parsing date",
+                errors=["Should be ISO format, e.g. 2019-05-01T12:00:00.00"],
+            )
+
+    if params.planned_before:
+        try:
+            filter_conditions.append(Pointing.status == pointing_status_enum.planned)
+            filter_conditions.append(Pointing.time <= params.planned_before)
+        except ValueError:
+            raise validation_exception(
+                message="Error parsing date",
+                errors=["Should be ISO format, e.g. 2019-05-01T12:00:00.00"],
+            )
+
+    # Handle user filters (names are resolved to ids before the main query)
+    if params.user:
+        if isInt(params.user):
+            filter_conditions.append(Pointing.submitterid == int(params.user))
+        else:
+            user_ids = pointing_utils.resolve_user_ids([params.user], db)
+            filter_conditions.append(Pointing.submitterid.in_(user_ids))
+
+    if params.users:
+        try:
+            user_list = []
+            if isinstance(params.users, str):
+                if "[" in params.users and "]" in params.users:
+                    # Parse as JSON array
+                    user_list = json.loads(params.users)
                 else:
-                    status_list = statuses  # Already a list
-
-                valid_statuses = []
-                if "planned" in status_list:
-                    valid_statuses.append(pointing_status_enum.planned)
-                if "completed" in status_list:
-                    valid_statuses.append(pointing_status_enum.completed)
-                if "cancelled" in status_list:
-                    valid_statuses.append(pointing_status_enum.cancelled)
-
-                if valid_statuses:
-                    filter_conditions.append(Pointing.status.in_(valid_statuses))
+                    # Parse as comma-separated list
+                    user_list = [u.strip() for u in params.users.split(",")]
+            else:
+                user_list = params.users  # Already a list
+
+            user_ids = set(pointing_utils.resolve_user_ids(user_list, db))
+            user_ids.update(int(u) for u in user_list if isInt(u))
+
+            filter_conditions.append(Pointing.submitterid.in_(user_ids))
+        except Exception as e:
+            raise validation_exception(
+                message="Error parsing 'users'",
+                errors=[f"Required format is a list: '[user1, user2...]'", str(e)],
+            )
+
+    # Handle instrument filters (names are resolved to ids before the main query)
+    if params.instrument:
+        if isInt(params.instrument):
+            filter_conditions.append(Pointing.instrumentid == int(params.instrument))
+        else:
+            instrument_ids = pointing_utils.resolve_instrument_ids(
+                [params.instrument], db, include_nicknames=False
+            )
+            filter_conditions.append(Pointing.instrumentid.in_(instrument_ids))
+
+    if params.instruments:
+        try:
+            inst_list = []
+            if isinstance(params.instruments, str):
+                if "[" in params.instruments and "]" in params.instruments:
+                    # Parse as JSON array
+                    inst_list = json.loads(params.instruments)
                 else:
-                    raise validation_exception(
-                        message="No valid statuses",
-                        errors=["No valid status values were specified"],
-                    )
-            except Exception as e:
-                raise validation_exception(
-                    message="Error parsing statuses",
-                    errors=[
-                        f"Invalid format for 'statuses' parameter. Required format is a list: '[status1, status2...]'",
-                        str(e),
-                    ],
-                )
+                    # Parse as comma-separated list
+                    inst_list = [i.strip() for i in params.instruments.split(",")]
+            else:
+                inst_list = params.instruments  # Already a list
 
-        # Handle time filters
-        if completed_after:
-            try:
-                filter_conditions.append(
-                    Pointing.status == pointing_status_enum.completed
-                )
-                filter_conditions.append(Pointing.time >= completed_after)
-            except ValueError:
-                raise validation_exception(
-                    message="Error parsing date",
-                    errors=["Should be ISO format, e.g. 2019-05-01T12:00:00.00"],
-                )
+            instrument_ids = set(pointing_utils.resolve_instrument_ids(inst_list, db))
+            instrument_ids.update(int(i) for i in inst_list if isInt(i))
 
-        if completed_before:
-            try:
-                filter_conditions.append(
-                    Pointing.status == pointing_status_enum.completed
-                )
-                filter_conditions.append(Pointing.time <= completed_before)
-            except ValueError:
-                raise validation_exception(
-                    message="Error parsing date",
-                    errors=["Should be ISO format, e.g. 2019-05-01T12:00:00.00"],
-                )
+            filter_conditions.append(Pointing.instrumentid.in_(instrument_ids))
+        except Exception as e:
+            raise validation_exception(
+                message="Error parsing 'instruments'",
+                errors=[f"Required format is a list: '[inst1, inst2...]'", str(e)],
+            )
 
-        if planned_after:
-            try:
-                filter_conditions.append(
-                    Pointing.status == pointing_status_enum.planned
-                )
-                filter_conditions.append(Pointing.time >= planned_after)
-            except ValueError:
-                raise validation_exception(
-                    message="Error parsing date",
-                    errors=["Should be ISO format, e.g. 2019-05-01T12:00:00.00"],
+    # Handle spectral filters
+    if params.wavelength_regime and params.wavelength_unit:
+        try:
+            if isinstance(params.wavelength_regime, str):
+                if "[" in params.wavelength_regime and "]" in params.wavelength_regime:
+                    # Parse range from string
+                    wavelength_range = json.loads(
+                        params.wavelength_regime.replace("(", "[").replace(")", "]")
+                    )
+                    specmin, specmax = float(wavelength_range[0]), float(
+                        wavelength_range[1]
+                    )
+                else:
+                    raise ValueError("Invalid wavelength_regime format")
+            elif isinstance(params.wavelength_regime, list):
+                specmin, specmax = float(params.wavelength_regime[0]), float(
+                    params.wavelength_regime[1]
                 )
+            else:
+                raise ValueError("Invalid wavelength_regime type")
 
-        if planned_before:
+            # Get unit and scale
+            unit_value = params.wavelength_unit
             try:
+                unit = [
+                    w
+                    for w in wavelength_units
+                    if int(w) == unit_value or str(w.name) == unit_value
+                ][0]
+                scale = wavelength_units.get_scale(unit)
+                specmin = specmin * scale
+                specmax = specmax * scale
+
+                # Import the spectral handler
+                from server.utils.spectral import SpectralRangeHandler
+
                 filter_conditions.append(
-                    Pointing.status == pointing_status_enum.planned
+                    Pointing.inSpectralRange(
+                        specmin,
+                        specmax,
+                        SpectralRangeHandler.spectralrangetype.wavelength,
+                    )
                 )
-                filter_conditions.append(Pointing.time <= planned_before)
-            except ValueError:
+            except (IndexError, ValueError):
                 raise validation_exception(
-                    message="Error parsing date",
-                    errors=["Should be ISO format, e.g. 2019-05-01T12:00:00.00"],
+                    message="Invalid wavelength_unit",
+                    errors=["Valid units are 'angstrom', 'nanometer', and 'micron'"],
                 )
+        except Exception as e:
+            raise validation_exception(
+                message="Error parsing 'wavelength_regime'",
+                errors=[f"Required format is a list: '[low, high]'", str(e)],
+            )
 
-        # Handle user filters
-        if user:
-            if isInt(user):
-                filter_conditions.append(Pointing.submitterid == int(user))
-            else:
-                filter_conditions.append(
-                    or_(
-                        Users.username.contains(user),
-                        Users.firstname.contains(user),
-                        Users.lastname.contains(user),
+    if params.frequency_regime and params.frequency_unit:
+        try:
+            if isinstance(params.frequency_regime, str):
+                if "[" in params.frequency_regime and "]" in params.frequency_regime:
+                    # Parse range from string
+                    frequency_range = json.loads(
+                        params.frequency_regime.replace("(", "[").replace(")", "]")
+                    )
+                    specmin, specmax = float(frequency_range[0]), float(
+                        frequency_range[1]
                     )
-                )
-                filter_conditions.append(Users.id == Pointing.submitterid)
-
-        if users:
-            try:
-                user_list = []
-                if isinstance(users, str):
-                    if "[" in users and "]" in users:
-                        # Parse as JSON array
-                        user_list = json.loads(users)
-                    else:
-                        # Parse as comma-separated list
-                        user_list = [u.strip() for u in users.split(",")]
                 else:
-                    user_list = users  # Already a list
-
-                or_conditions = []
-                for u in user_list:
-                    or_conditions.append(Users.username.contains(str(u).strip()))
-                    or_conditions.append(Users.firstname.contains(str(u).strip()))
-                    or_conditions.append(Users.lastname.contains(str(u).strip()))
-                    if isInt(u):
-                        or_conditions.append(Pointing.submitterid == int(u))
-
-                filter_conditions.append(or_(*or_conditions))
-                filter_conditions.append(Users.id == Pointing.submitterid)
-            except Exception as e:
-                raise validation_exception(
-                    message="Error parsing 'users'",
-                    errors=[f"Required format is a list: '[user1, user2...]'", str(e)],
+                    raise ValueError("Invalid frequency_regime format")
+            elif isinstance(params.frequency_regime, list):
+                specmin, specmax = float(params.frequency_regime[0]), float(
+                    params.frequency_regime[1]
                 )
-
-        # Handle instrument filters
-        if instrument:
-            if isInt(instrument):
-                filter_conditions.append(Pointing.instrumentid == int(instrument))
             else:
-                filter_conditions.append(
-                    Instrument.instrument_name.contains(instrument)
-                )
-                filter_conditions.append(Pointing.instrumentid == Instrument.id)
+                raise ValueError("Invalid frequency_regime type")
 
-        if instruments:
+            # Get unit and scale
+            unit_value = params.frequency_unit
             try:
-                inst_list = []
-                if isinstance(instruments, str):
-                    if "[" in instruments and "]" in instruments:
-                        # Parse as JSON array
-                        inst_list = json.loads(instruments)
-                    else:
-                        # Parse as comma-separated list
-                        inst_list = [i.strip() for i in instruments.split(",")]
-                else:
-                    inst_list = instruments  # Already a list
-
-                or_conditions = []
-                for i in inst_list:
-                    or_conditions.append(
-                        Instrument.instrument_name.contains(str(i).strip())
-                    )
-                    or_conditions.append(Instrument.nickname.contains(str(i).strip()))
-                    if isInt(i):
-                        or_conditions.append(Pointing.instrumentid == int(i))
+                unit = [
+                    f
+                    for f in frequency_units
+                    if int(f) == unit_value or str(f.name) == unit_value
+                ][0]
+                scale = frequency_units.get_scale(unit)
+                specmin = specmin * scale
+                specmax = specmax * scale
 
-                filter_conditions.append(or_(*or_conditions))
-                filter_conditions.append(Instrument.id == Pointing.instrumentid)
-            except Exception as e:
-                raise validation_exception(
-                    message="Error parsing 'instruments'",
-                    errors=[f"Required format is a list: '[inst1, inst2...]'", str(e)],
-                )
+                # Import the spectral handler
+                from server.utils.spectral import SpectralRangeHandler
 
-        # Handle spectral filters
-        if wavelength_regime and wavelength_unit:
-            try:
-                if isinstance(wavelength_regime, str):
-                    if "[" in wavelength_regime and "]" in wavelength_regime:
-                        # Parse range from string
-                        wavelength_range = json.loads(
-                            wavelength_regime.replace("(", "[").replace(")", "]")
-                        )
-                        specmin, specmax = float(wavelength_range[0]), float(
-                            wavelength_range[1]
-                        )
-                    else:
-                        raise ValueError("Invalid wavelength_regime format")
-                elif isinstance(wavelength_regime, list):
-                    specmin, specmax = float(wavelength_regime[0]), float(
-                        wavelength_regime[1]
-                    )
-                else:
-                    raise ValueError("Invalid wavelength_regime type")
-
-                # Get unit and scale
-                unit_value = wavelength_unit
-                try:
-                    unit = [
-                        w
-                        for w in wavelength_units
-                        if int(w) == unit_value or str(w.name) == unit_value
-                    ][0]
-                    scale = wavelength_units.get_scale(unit)
-                    specmin = specmin * scale
-                    specmax = specmax * scale
-
-                    # Import the spectral handler
-                    from server.utils.spectral import SpectralRangeHandler
-
-                    filter_conditions.append(
-                        Pointing.inSpectralRange(
-                            specmin,
-                            specmax,
-                            SpectralRangeHandler.spectralrangetype.wavelength,
-                        )
-                    )
-                except (IndexError, ValueError):
-                    raise validation_exception(
-                        message="Invalid wavelength_unit",
-                        errors=[
-                            "Valid units are 'angstrom', 'nanometer', and 'micron'"
-                        ],
+                filter_conditions.append(
+                    Pointing.inSpectralRange(
+                        specmin,
+                        specmax,
+                        SpectralRangeHandler.spectralrangetype.frequency,
                     )
-            except Exception as e:
+                )
+            except (IndexError, ValueError):
                 raise validation_exception(
-                    message="Error parsing 'wavelength_regime'",
-                    errors=[f"Required format is a list: '[low, high]'", str(e)],
+                    message="Invalid frequency_unit",
+                    errors=["Valid units are 'Hz', 'kHz', 'MHz', 'GHz', and 'THz'"],
                 )
+        except Exception as e:
+            raise validation_exception(
+                message="Error parsing 'frequency_regime'",
+                errors=[f"Required format is a list: '[low, high]'", str(e)],
+            )
 
-        if frequency_regime and frequency_unit:
-            try:
-                if isinstance(frequency_regime, str):
-                    if "[" in frequency_regime and "]" in frequency_regime:
-                        # Parse range from string
-                        frequency_range = json.loads(
-                            frequency_regime.replace("(", "[").replace(")", "]")
-                        )
-                        specmin, specmax = float(frequency_range[0]), float(
-                            frequency_range[1]
-                        )
-                    else:
-                        raise ValueError("Invalid frequency_regime format")
-                elif isinstance(frequency_regime, list):
-                    specmin, specmax = float(frequency_regime[0]), float(
-                        frequency_regime[1]
+    if params.energy_regime and params.energy_unit:
+        try:
+            if isinstance(params.energy_regime, str):
+                if "[" in params.energy_regime and "]" in params.energy_regime:
+                    # Parse range from string
+                    energy_range = json.loads(
+                        params.energy_regime.replace("(", "[").replace(")", "]")
                     )
+                    specmin, specmax = float(energy_range[0]), float(energy_range[1])
                 else:
-                    raise ValueError("Invalid frequency_regime type")
-
-                # Get unit and scale
-                unit_value = frequency_unit
-                try:
-                    unit = [
-                        f
-                        for f in frequency_units
-                        if int(f) == unit_value or str(f.name) == unit_value
-                    ][0]
-                    scale = frequency_units.get_scale(unit)
-                    specmin = specmin * scale
-                    specmax = specmax * scale
-
-                    # Import the spectral handler
-                    from server.utils.spectral import SpectralRangeHandler
-
-                    filter_conditions.append(
-                        Pointing.inSpectralRange(
-                            specmin,
-                            specmax,
-                            SpectralRangeHandler.spectralrangetype.frequency,
-                        )
-                    )
-                except (IndexError, ValueError):
-                    raise validation_exception(
-                        message="Invalid frequency_unit",
-                        errors=["Valid units are 'Hz', 'kHz', 'MHz', 'GHz', and 'THz'"],
-                    )
-            except Exception as e:
-                raise validation_exception(
-                    message="Error parsing 'frequency_regime'",
-                    errors=[f"Required format is a list: '[low, high]'", str(e)],
+                    raise ValueError("Invalid energy_regime format")
+            elif isinstance(params.energy_regime, list):
+                specmin, specmax = float(params.energy_regime[0]), float(
+                    params.energy_regime[1]
                 )
+            else:
+                raise ValueError("Invalid energy_regime type")
 
-        if energy_regime and energy_unit:
+            # Get unit and scale
+            unit_value = params.energy_unit
             try:
-                if isinstance(energy_regime, str):
-                    if "[" in energy_regime and "]" in energy_regime:
-                        # Parse range from string
-                        energy_range = json.loads(
-                            energy_regime.replace("(", "[").replace(")", "]")
-                        )
-                        specmin, specmax = float(energy_range[0]), float(
-                            energy_range[1]
-                        )
-                    else:
-                        raise ValueError("Invalid energy_regime format")
-                elif isinstance(energy_regime, list):
-                    specmin, specmax = float(energy_regime[0]), float(energy_regime[1])
-                else:
-                    raise ValueError("Invalid energy_regime type")
-
-                # Get unit and scale
-                unit_value = energy_unit
-                try:
-                    unit = [
-                        e
-                        for e in energy_units
-                        if int(e) == unit_value or str(e.name) == unit_value
-                    ][0]
-                    scale = energy_units.get_scale(unit)
-                    specmin = specmin * scale
-                    specmax = specmax * scale
-
-                    # Import the spectral handler
-                    from server.utils.spectral import SpectralRangeHandler
-
-                    filter_conditions.append(
-                        Pointing.inSpectralRange(
-                            specmin,
-                            specmax,
-                            SpectralRangeHandler.spectralrangetype.energy,
-                        )
-                    )
-                except (IndexError, ValueError):
-                    raise validation_exception(
-                        message="Invalid energy_unit",
-                        errors=["Valid units are 'eV', 'keV', 'MeV', 'GeV', and 'TeV'"],
+                unit = [
+                    e
+                    for e in energy_units
+                    if int(e) == unit_value or str(e.name) == unit_value
+                ][0]
+                scale = energy_units.get_scale(unit)
+                specmin = specmin * scale
+                specmax = specmax * scale
+
+                # Import the spectral handler
+                from server.utils.spectral import SpectralRangeHandler
+
+                filter_conditions.append(
+                    Pointing.inSpectralRange(
+                        specmin,
+                        specmax,
+                        SpectralRangeHandler.spectralrangetype.energy,
                     )
-            except Exception as e:
+                )
+            except (IndexError, ValueError):
                 raise validation_exception(
-                    message="Error parsing 'energy_regime'",
-                    errors=[f"Required format is a list: '[low, high]'", str(e)],
+                    message="Invalid energy_unit",
+                    errors=["Valid units are 'eV', 'keV', 'MeV', 'GeV', and 'TeV'"],
                 )
+        except Exception as e:
+            raise validation_exception(
+                message="Error parsing 'energy_regime'",
+                errors=[f"Required format is a list: '[low, high]'", str(e)],
+            )
 
-        # Handle depth filters
-        if depth_gt is not None or depth_lt is not None:
-            # Determine depth unit
-            depth_unit_value = (
-                depth_unit or "ab_mag"
-            )  # Default to ab_mag if not specified
-            try:
-                depth_unit_enum_val = [
-                    d for d in depth_unit_enum if str(d.name) == depth_unit_value
-                ][0]
-            except (IndexError, ValueError):
-                depth_unit_enum_val = depth_unit_enum.ab_mag  # Default
-
-            # Handle depth_gt (query for brighter things)
-            if depth_gt is not None and isFloat(depth_gt):
-                if "mag" in depth_unit_enum_val.name:
-                    # For magnitudes, lower values are brighter
-                    filter_conditions.append(Pointing.depth <= float(depth_gt))
-                elif "flux" in depth_unit_enum_val.name:
-                    # For flux, higher values are brighter
-                    filter_conditions.append(Pointing.depth >= float(depth_gt))
-
-            # Handle depth_lt (query for dimmer things)
-            if depth_lt is not None and isFloat(depth_lt):
-                if "mag" in depth_unit_enum_val.name:
-                    # For magnitudes, higher values are dimmer
-                    filter_conditions.append(Pointing.depth >= float(depth_lt))
-                elif "flux" in depth_unit_enum_val.name:
-                    # For flux, lower values are dimmer
-                    filter_conditions.append(Pointing.depth <= float(depth_lt))
-
-        # Query the database with explicit joins and field selection (like Flask version)
-        # Check if we need to join PointingEvent table (when graceid filters are used)
-        has_graceid_filters = graceid or graceids
-
-        # Build query with explicit field selection and joins (matches Flask approach)
-        from sqlalchemy import func
-
-        # Select specific fields including joined ones
-        base_query = (
-            db.query(
-                Pointing.id,
-                func.ST_AsText(Pointing.position).label("position"),
-                Pointing.instrumentid,
-                Pointing.band,
-                Pointing.pos_angle,
-                Pointing.depth,
-                Pointing.depth_err,
-                Pointing.depth_unit,
-                Pointing.time,
-                Pointing.status,
-                Pointing.doi_url,
-                Pointing.doi_id,
-                Pointing.submitterid,
-                Pointing.datecreated,
-                Pointing.dateupdated,
-                Pointing.central_wave,
-                Pointing.bandwidth,
-                Instrument.instrument_name,
-                Instrument.nickname.label("instrument_nickname"),
-                Users.username,
+    # Handle depth filters
+    if params.depth_gt is not None or params.depth_lt is not None:
+        # Determine depth unit
+        depth_unit_value = (
+            params.depth_unit or "ab_mag"
+        )  # Default to ab_mag if not specified
+        try:
+            depth_unit_enum_val = [
+                d for d in depth_unit_enum if str(d.name) == depth_unit_value
+            ][0]
+        except (IndexError, ValueError):
+            depth_unit_enum_val = depth_unit_enum.ab_mag  # Default
+
+        # Handle depth_gt (query for brighter things)
+        if params.depth_gt is not None and isFloat(params.depth_gt):
+            if "mag" in depth_unit_enum_val.name:
+                # For magnitudes, lower values are brighter
+                filter_conditions.append(Pointing.depth <= float(params.depth_gt))
+            elif "flux" in depth_unit_enum_val.name:
+                # For flux, higher values are brighter
+                filter_conditions.append(Pointing.depth >= float(params.depth_gt))
+
+        # Handle depth_lt (query for dimmer things)
+        if params.depth_lt is not None and isFloat(params.depth_lt):
+            if "mag" in depth_unit_enum_val.name:
+                # For magnitudes, higher values are dimmer
+                filter_conditions.append(Pointing.depth >= float(params.depth_lt))
+            elif "flux" in depth_unit_enum_val.name:
+                # For flux, lower values are dimmer
+                filter_conditions.append(Pointing.depth <= float(params.depth_lt))
+
+    # Handle spatial filters (GiST-indexed on pointing.position)
+    if params.cone:
+        try:
+            cone_ra, cone_dec, cone_radius = spatial.parse_cone(params.cone)
+        except (ValueError, TypeError) as e:
+            raise validation_exception(
+                message="Error parsing 'cone'",
+                errors=["Required format is a list: '[ra, dec, radius]'", str(e)],
             )
-            .join(Instrument, Pointing.instrumentid == Instrument.id)
-            .outerjoin(Users, Pointing.submitterid == Users.id)
+        filter_conditions.append(
+            spatial.cone_filter(Pointing.position, cone_ra, cone_dec, cone_radius)
         )
 
-        if has_graceid_filters:
-            # Join with PointingEvent table when filtering by graceid
-            base_query = base_query.join(
-                PointingEvent, Pointing.id == PointingEvent.pointingid
+    if params.polygon:
+        try:
+            polygon_wkt = spatial.parse_polygon(params.polygon)
+        except (ValueError, TypeError, IndexError) as e:
+            raise validation_exception(
+                message="Error parsing 'polygon'",
+                errors=[
+                    "Required format is WKT or a list: '[[ra1, dec1], [ra2, dec2]...]'",
+                    str(e),
+                ],
+            )
+        filter_conditions.append(spatial.polygon_filter(Pointing.position, polygon_wkt))
+
+    # Resolve the requested fields; the select list and joins follow from them
+    if params.fields:
+        try:
+            requested_fields = parse_field_list(params.fields, POINTING_FIELD_COLUMNS)
+        except ValueError as e:
+            raise validation_exception(
+                message="Error parsing 'fields'",
+                errors=[
+                    f"Valid fields are: {', '.join(POINTING_FIELD_COLUMNS)}",
+                    str(e),
+                ],
             )
+    else:
+        requested_fields = DEFAULT_POINTING_FIELDS
+
+    columns = []
+    for field in requested_fields:
+        columns.extend(POINTING_FIELD_COLUMNS[field])
+
+    base_query = db.query(*columns).select_from(Pointing)
+
+    # Only join the tables whose columns were requested
+    if "instrument_name" in requested_fields:
+        base_query = base_query.join(Instrument, Pointing.instrumentid == Instrument.id)
+    if "username" in requested_fields:
+        base_query = base_query.outerjoin(Users, Pointing.submitterid == Users.id)
+
+    # Join with PointingEvent table when filtering by graceid
+    if params.graceid or params.graceids:
+        base_query = base_query.join(
+            PointingEvent, Pointing.id == PointingEvent.pointingid
+        )
+
+    return base_query.filter(*filter_conditions), requested_fields
+
+
+@router.get("/pointings", response_model=List[PointingSchema])
+def get_pointings(
+    params: PointingQueryParams = Depends(),
+    db: Session = Depends(get_db),
+):
+    """
+    Retrieve pointings from the database with optional filters.
+    """
+    try:
+        query, requested_fields = build_pointing_query(params, db)
 
         # Apply filters and execute query
-        results = base_query.filter(*filter_conditions).all()
-
-        # Convert to list of dictionaries with proper field handling
-        pointings_data = []
-        for row in results:
-            pointing_dict = {
-                "id": row.id,
-                "position": row.position,
-                "instrumentid": row.instrumentid,
-                "band": row.band.name if row.band else None,
-                "pos_angle": row.pos_angle,
-                "depth": row.depth,
-                "depth_err": row.depth_err,
-                "depth_unit": row.depth_unit.name if row.depth_unit else None,
-                "time": row.time,
-                "status": row.status.name if row.status else None,
-                "doi_url": row.doi_url,
-                "doi_id": row.doi_id,
-                "submitterid": row.submitterid,
-                "datecreated": row.datecreated,
-                "dateupdated": row.dateupdated,
-                "central_wave": row.central_wave,
-                "bandwidth": row.bandwidth,
-                # Use nickname if available, otherwise fall back to instrument_name (like Flask)
-                "instrument_name": (
-                    row.instrument_nickname
-                    if row.instrument_nickname
-                    else row.instrument_name
-                ),
-                "username": row.username,
-            }
-            pointings_data.append(pointing_dict)
+        results = query.all()
+
+        pointings_data = [pointing_row_to_dict(row) for row in results]
+
+        if params.fields:
+            # Serialise only the requested keys instead of the full schema
+            return JSONResponse(
+                content=[
+                    PointingSchema.model_validate(p).model_dump(
+                        mode="json", include=set(requested_fields)
+                    )
+                    for p in pointings_data
+                ]
+            )
 
         # Convert to PointingSchema objects for proper serialization
         return [PointingSchema.model_validate(p) for p in pointings_data]
@@ -13,6 +13,7 @@ from server.auth.auth import get_current_user
 from server.utils.error_handling import validation_exception
 from server.core.enums.pointingstatus import PointingStatus as pointing_status_enum
 from server.utils import pointing as pointing_utils
+from server.utils import doi_queue
 
 router = APIRouter(tags=["pointings"])
 
@@ -23,6 +24,9 @@ async def request_doi(
 ):
     """
     Request a DOI for completed pointings.
+
+    Minting runs in the background; the response reports a pending status and
+    the DOI appears on the pointings once it has been issued.
     """
     # Build the filter for pointings
     filter_conditions = [Pointing.submitterid == user.id]
@@ -90,20 +94,21 @@ async def request_doi(
         request.creators, request.doi_group_id, user, db
     )
 
-    # Create or use provided DOI
+    # Use the provided DOI, or queue minting; the worker fills in doi_url/doi_id
     if request.doi_url:
-        doi_id, doi_url = 0, request.doi_url
-    else:
-        doi_id, doi_url = pointing_utils.create_doi_for_pointings(
-            doi_points, gid, creators, db
-        )
-
-    # Update pointing records with DOI information
-    if doi_id is not None:
         for p in doi_points:
-            p.doi_url = doi_url
-            p.doi_id = doi_id
+            p.doi_url = request.doi_url
+            p.doi_id = 0
 
         db.commit()
+        return DOIRequestResponse(DOI_URL=request.doi_url, WARNINGS=warnings)
 
-    return DOIRequestResponse(DOI_URL=doi_url, WARNINGS=warnings)
+    task = pointing_utils.queue_doi_for_pointings(
+        doi_points, gid, creators, user.id, db
+    )
+    db.commit()
+    doi_queue.notify_worker()
+
+    return DOIRequestResponse(
+        DOI_STATUS=doi_queue.STATUS_PENDING, DOI_TASK_ID=task.id, WARNINGS=warnings
+    )
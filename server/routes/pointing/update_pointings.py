@@ -5,7 +5,7 @@ from sqlalchemy.orm import Session
 from datetime import datetime
 
 from server.db.database import get_db
-from server.db.models.pointing import Pointing
+from server.db.models.pointing import Pointing, PointingCount
 from server.schemas.pointing import PointingUpdate
 from server.auth.auth import get_current_user
 from server.utils.error_handling import validation_exception
@@ -47,6 +47,12 @@ async def update_pointings(
             pointing.status = update_pointing.status
             pointing.dateupdated = datetime.now()
 
+        PointingCount.apply(
+            PointingCount.status_change_deltas(
+                pointings, pointing_status_enum.planned, db
+            ),
+            db,
+        )
         db.commit()
         return {"message": f"Updated {len(pointings)} pointings successfully."}
     except Exception as e:
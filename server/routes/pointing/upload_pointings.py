@@ -0,0 +1,287 @@
+"""Streaming NDJSON/CSV upload endpoint for pointings."""
+
+import csv
+import json
+import tempfile
+from collections import deque
+from typing import AsyncIterator, Iterator, List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from server.db.database import get_db
+from server.schemas.pointing import PointingCreate
+from server.auth.auth import get_current_user
+from server.utils import pointing as pointing_utils
+from server.utils.error_handling import validation_exception
+
+router = APIRouter(tags=["pointings"])
+
+# Rows validated, inserted and committed together
+UPLOAD_CHUNK_SIZE = 1000
+
+# Longest single line accepted, so a file without newlines cannot fill memory
+UPLOAD_MAX_LINE_BYTES = 1024 * 1024
+
+# ERRORS entries listed per chunk line; the rest are only counted
+UPLOAD_MAX_CHUNK_ERRORS = 100
+
+# Characters of a rejected record quoted in its ERRORS entry
+UPLOAD_ERROR_RECORD_CHARS = 200
+
+# Report size kept in memory before it is spooled to a temporary file
+UPLOAD_REPORT_SPOOL_BYTES = 1024 * 1024
+
+UPLOAD_FORMATS = ("ndjson", "csv")
+
+
+async def _iter_lines(request: Request) -> AsyncIterator[bytes]:
+    """Yield raw lines, with their line endings, from the request body as it arrives."""
+    buffer = b""
+    async for data in request.stream():
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        if len(buffer) > UPLOAD_MAX_LINE_BYTES:
+            raise validation_exception(
+                message="Upload line too long",
+                errors=[f"Lines must be shorter than {UPLOAD_MAX_LINE_BYTES} bytes"],
+            )
+        for line in lines:
+            yield line + b"\n"
+    if buffer:
+        yield buffer
+
+
+def _invalid_utf8(raw: bytes, e: UnicodeDecodeError) -> dict:
+    return {"_raw": repr(raw[:200]), "_error": f"Invalid UTF-8: {e}"}
+
+
+async def _iter_ndjson_records(request: Request) -> AsyncIterator[dict]:
+    """Yield one raw pointing record per non-empty NDJSON line."""
+    async for raw in _iter_lines(request):
+        raw = raw.strip()
+        if not raw:
+            continue
+        try:
+            line = raw.decode("utf-8")
+        except UnicodeDecodeError as e:
+            yield _invalid_utf8(raw, e)
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            record = {"_raw": line, "_error": f"Invalid JSON: {e}"}
+        yield record if isinstance(record, dict) else {"_raw": line}
+
+
+class _LineFeed:
+    """Line iterator for csv.reader that is filled as the body arrives."""
+
+    def __init__(self):
+        self.lines = deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft()
+
+
+async def _iter_csv_records(request: Request) -> AsyncIterator[dict]:
+    """
+    Yield one raw pointing record per CSV row, after the header row.
+
+    Decoded lines go to a single csv.reader, so quoted fields may contain
+    newlines. A row is read once its lines hold an even number of quote
+    characters, i.e. when no quoted field is left open.
+    """
+    feed = _LineFeed()
+    reader = csv.reader(feed)
+    header = None
+    pending_quotes = 0
+    pending_bytes = 0
+
+    async for raw in _iter_lines(request):
+        try:
+            line = raw.decode("utf-8")
+        except UnicodeDecodeError as e:
+            # Drop the row being assembled along with the bad line
+            feed.lines.clear()
+            pending_quotes = pending_bytes = 0
+            yield _invalid_utf8(raw, e)
+            continue
+
+        feed.lines.append(line)
+        pending_quotes += line.count('"')
+        pending_bytes += len(raw)
+        if pending_quotes % 2:
+            if pending_bytes > UPLOAD_MAX_LINE_BYTES:
+                raise validation_exception(
+                    message="Upload row too long",
+                    errors=[
+                        f"Rows must be shorter than {UPLOAD_MAX_LINE_BYTES} bytes; "
+                        "check for an unterminated quoted field"
+                    ],
+                )
+            continue
+        pending_quotes = pending_bytes = 0
+
+        values = next(reader, None)
+        if not values or not any(v.strip() for v in values):
+            continue
+        if header is None:
+            header = [h.strip() for h in values]
+        else:
+            # Empty CSV cells are treated as missing values
+            yield {k: (v if v != "" else None) for k, v in zip(header, values)}
+
+    if feed.lines:
+        yield {
+            "_raw": "".join(feed.lines)[:200],
+            "_error": "Unterminated quoted CSV field",
+        }
+
+
+def _describe(record) -> str:
+    """Short description of a rejected record for ERRORS."""
+    text = str(record)
+    if len(text) > UPLOAD_ERROR_RECORD_CHARS:
+        text = text[:UPLOAD_ERROR_RECORD_CHARS] + "..."
+    return f"Object: {text}"
+
+
+def _validate_records(records: List[dict]):
+    """Validate raw records, returning the valid pointings and the ERRORS entries."""
+    pointings = []
+    errors = []
+    for record in records:
+        if "_error" in record:
+            errors.append([_describe(record["_raw"]), [record["_error"]]])
+            continue
+        if "_raw" in record:
+            errors.append([_describe(record["_raw"]), ["Expected a JSON object"]])
+            continue
+        try:
+            pointings.append(PointingCreate.model_validate(record))
+        except ValidationError as e:
+            errors.append([_describe(record), [err["msg"] for err in e.errors()]])
+    return pointings, errors
+
+
+def _iter_report(report) -> Iterator[bytes]:
+    """Stream the spooled report, closing it once sent."""
+    try:
+        report.seek(0)
+        while True:
+            data = report.read(64 * 1024)
+            if not data:
+                break
+            yield data
+    finally:
+        report.close()
+
+
+@router.post("/pointings/upload")
+async def upload_pointings(
+    request: Request,
+    graceid: str = Query(..., description="Grace ID of the GW event"),
+    format: str = Query("ndjson", description="Upload format (ndjson, csv)"),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """
+    Upload pointings for an event as an NDJSON or CSV stream.
+
+    The body is read incrementally and every UPLOAD_CHUNK_SIZE rows are
+    validated, inserted and committed before more is read, so only one chunk
+    of rows is held at a time. CSV uploads take a header row with the same
+    field names as the JSON pointing objects; quoted fields may span lines.
+
+    The response is streamed once the whole body is read. It is NDJSON with
+    one line per chunk (its pointing_ids, inserted and error counts, and up to
+    UPLOAD_MAX_CHUNK_ERRORS of its ERRORS) followed by a summary line with the
+    totals. Rows that are not valid UTF-8, JSON or pointings are reported in
+    ERRORS, quoting at most UPLOAD_ERROR_RECORD_CHARS of the record.
+
+    Chunks committed before a failure stay inserted. If the upload stops part
+    way (e.g. a database error or an over-long line), the response still lists
+    the committed chunks, and its summary line has "done": false and the
+    error, with the status code of the failure.
+    """
+    fmt = format.lower()
+    if fmt not in UPLOAD_FORMATS:
+        raise validation_exception(
+            message=f"Invalid format: {format}",
+            errors=[f"Valid formats are: {', '.join(UPLOAD_FORMATS)}"],
+        )
+
+    pointing_utils.validate_graceid(graceid, db)
+    instruments_dict = pointing_utils.get_instruments_dict(db)
+    existing_keys = pointing_utils.get_existing_pointing_keys(graceid, db)
+
+    # Chunk lines are spooled as they are produced; only the running totals
+    # and the current chunk are held in memory
+    report = tempfile.SpooledTemporaryFile(max_size=UPLOAD_REPORT_SPOOL_BYTES)
+    totals = {"rows": 0, "inserted": 0, "errors": 0}
+    chunks = 0
+
+    def submit_chunk(records: List[dict]):
+        nonlocal chunks
+        pointings, errors = _validate_records(records)
+        pointing_ids, submit_errors = pointing_utils.submit_pointings(
+            pointings, graceid, user.id, instruments_dict, existing_keys, db
+        )
+        db.commit()
+        errors.extend(submit_errors)
+
+        chunks += 1
+        totals["rows"] += len(records)
+        totals["inserted"] += len(pointing_ids)
+        totals["errors"] += len(errors)
+        line = {
+            "chunk": chunks,
+            "rows": len(records),
+            "inserted": len(pointing_ids),
+            "errors": len(errors),
+            "pointing_ids": pointing_ids,
+            "ERRORS": errors[:UPLOAD_MAX_CHUNK_ERRORS],
+        }
+        report.write((json.dumps(line, default=str) + "\n").encode())
+
+    records = (
+        _iter_ndjson_records(request) if fmt == "ndjson" else _iter_csv_records(request)
+    )
+
+    # Starlette listens on the receive channel while streaming a response, so
+    # the body is consumed here and the spooled report is streamed after.
+    summary = {"done": True}
+    status_code = status.HTTP_200_OK
+    try:
+        chunk = []
+        async for record in records:
+            chunk.append(record)
+            if len(chunk) >= UPLOAD_CHUNK_SIZE:
+                submit_chunk(chunk)
+                chunk = []
+        if chunk:
+            submit_chunk(chunk)
+    except Exception as e:
+        # Report the chunks already committed rather than dropping their ids
+        db.rollback()
+        if isinstance(e, HTTPException):
+            status_code, error = e.status_code, e.detail
+        else:
+            status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+            error = f"{type(e).__name__}: {str(e)}"
+        summary = {"done": False, "error": error}
+
+    report.write((json.dumps({**summary, **totals}, default=str) + "\n").encode())
+    return StreamingResponse(
+        _iter_report(report),
+        status_code=status_code,
+        media_type="application/x-ndjson",
+    )
@@ -1,17 +1,31 @@
 """Alert type endpoint."""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
 from server.db.database import get_db
 from server.db.models.gw_alert import GWAlert
+from server.utils.http_cache import (
+    IMMUTABLE_CACHE_CONTROL,
+    version_etag,
+    cache_headers,
+    etag_matches,
+    not_modified,
+)
 
 router = APIRouter(tags=["UI"])
 
 
 @router.get("/ajax_alerttype")
-async def ajax_get_eventcontour(urlid: str, db: Session = Depends(get_db)):
-    """Get event contour and alert information."""
+async def ajax_get_eventcontour(
+    urlid: str, request: Request, response: Response, db: Session = Depends(get_db)
+):
+    """
+    Get event contour and alert information.
+
+    The urlid names one alert version, so complete payloads are sent as
+    immutable with an ETag for that version.
+    """
     import json
     from server.core.enums.alertrole import AlertRole
     from server.utils.function import get_farrate_farunit, polygons2footprints
@@ -30,6 +44,10 @@ async def ajax_get_eventcontour(urlid: str, db: Session = Depends(get_db)):
     if not alert:
         raise HTTPException(status_code=404, detail="Alert not found")
 
+    etag = version_etag("alerttype", alert.id, alert_type)
+    if etag_matches(request, etag):
+        return not_modified(etag, IMMUTABLE_CACHE_CONTROL)
+
     # Determine storage path
     s3path = "fit" if alert.role == AlertRole.observation else "test"
 
@@ -121,6 +139,14 @@ async def ajax_get_eventcontour(urlid: str, db: Session = Depends(get_db)):
     except Exception as e:
         print(f"Error downloading contours: {str(e)}")
 
+    # Only a payload with its contours is final; without them clients refetch
+    if detection_overlays:
+        response.headers.update(
+            cache_headers(etag, alert.datecreated, IMMUTABLE_CACHE_CONTROL)
+        )
+    else:
+        response.headers["Cache-Control"] = "no-cache"
+
     # Prepare payload
     payload = {
         "hidden_alertid": alert_id,
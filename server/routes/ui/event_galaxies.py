@@ -1,11 +1,12 @@
 """Event galaxies endpoint."""
 
 import logging
+from itertools import groupby
 
 from fastapi import APIRouter, Depends
+from geoalchemy2 import Geometry
+from sqlalchemy import and_, cast, func
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-import pandas as pd
 
 from server.db.database import get_db
 from server.db.models.gw_galaxy import GWGalaxyList, GWGalaxyEntry
@@ -16,77 +17,60 @@ router = APIRouter(tags=["UI"])
 
 @router.get("/ajax_event_galaxies")
 async def ajax_event_galaxies(alertid: str, db: Session = Depends(get_db)):
-    """Get galaxies associated with an event."""
-    from server.utils.function import sanatize_pointing, sanatize_gal_info
-
-    event_galaxies = []
+    """
+    Get galaxies associated with an event, one marker group per galaxy list.
 
+    Markers carry only the entry id, name and position, in rank order; the
+    popup HTML is fetched per galaxy from /ajax_event_galaxy_info.
+    """
     logger.info("[Galaxy debug] ajax_event_galaxies called with alertid=%s", alertid)
 
     # Resolve alternate IDs to canonical graceid
     from server.db.models.gw_alert import GWAlert
+
     graceid = GWAlert.graceidfromalternate(alertid, db)
     if graceid != alertid:
-        logger.info("[Galaxy debug] resolved alternateid %s -> graceid %s", alertid, graceid)
-
-    # Get galaxy lists for this alert
-    gal_lists = db.query(GWGalaxyList).filter(GWGalaxyList.graceid == graceid).all()
-
-    logger.info("[Galaxy debug] found %d galaxy lists for graceid=%s", len(gal_lists), graceid)
-
-    if not gal_lists:
-        return event_galaxies
-
-    gal_list_ids = list(set([x.id for x in gal_lists]))
+        logger.info(
+            "[Galaxy debug] resolved alternateid %s -> graceid %s", alertid, graceid
+        )
 
-    # Get galaxy entries for these lists
-    gal_entries = (
+    # Every list with its entries, grouped and ranked by the database. The outer
+    # join keeps lists without entries as empty groups.
+    point = cast(GWGalaxyEntry.position, Geometry(srid=4326))
+    rows = (
         db.query(
+            GWGalaxyList.id,
+            GWGalaxyList.groupname,
+            GWGalaxyEntry.id,
             GWGalaxyEntry.name,
-            func.ST_AsText(GWGalaxyEntry.position).label("position"),
-            GWGalaxyEntry.score,
-            GWGalaxyEntry.info,
-            GWGalaxyEntry.listid,
-            GWGalaxyEntry.rank,
+            func.ST_X(point),
+            func.ST_Y(point),
         )
-        .filter(GWGalaxyEntry.listid.in_(gal_list_ids))
+        .outerjoin(
+            GWGalaxyEntry,
+            and_(
+                GWGalaxyEntry.listid == GWGalaxyList.id,
+                GWGalaxyEntry.position.isnot(None),
+            ),
+        )
+        .filter(GWGalaxyList.graceid == graceid)
+        .order_by(GWGalaxyList.id, GWGalaxyEntry.rank, GWGalaxyEntry.id)
         .all()
     )
 
-    # Process each list
-    for glist in gal_lists:
-        markers = []
-        entries = [x for x in gal_entries if x.listid == glist.id]
-
-        name_list = []
-        ra_list = []
-        dec_list = []
-        rank_list = []
-        info_list = []
-
-
-        for e in entries:
-            ra, dec = sanatize_pointing(e.position)
-            
-            name_list.append(e.name)
-            ra_list.append(ra)
-            dec_list.append(dec)
-            rank_list.append(e.rank)
-            info_list.append(sanatize_gal_info(e, glist, ra, dec))
-
-        df = pd.DataFrame({'name': name_list, 
-                            'ra':ra_list, 'dec':dec_list, 'rank':rank_list, 'info':info_list})
-        
-        df.sort_values(by=['rank'], inplace=True, ignore_index=True)
-        
-        df.drop(columns = 'rank', inplace = True)
-
-        markers = df.to_dict('records')
-
+    event_galaxies = []
+    for (_, groupname), entries in groupby(rows, key=lambda row: row[:2]):
         event_galaxies.append(
-            {"name": glist.groupname, 
-             "color": "", 
-             "markers": markers}
+            {
+                "name": groupname,
+                "color": "",
+                "markers": [
+                    # PostGIS returns longitude in -180..+180; RA is 0..360
+                    {"id": entry_id, "name": name, "ra": ra % 360.0, "dec": dec}
+                    for _, _, entry_id, name, ra, dec in entries
+                    if entry_id is not None
+                ],
+            }
         )
 
     logger.info(
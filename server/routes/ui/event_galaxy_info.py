@@ -0,0 +1,34 @@
+"""Event galaxy popup info endpoint."""
+
+from fastapi import APIRouter, Depends
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from server.db.database import get_db
+from server.db.models.gw_galaxy import GWGalaxyList, GWGalaxyEntry
+from server.utils.error_handling import not_found_exception
+
+router = APIRouter(tags=["UI"])
+
+
+@router.get("/ajax_event_galaxy_info")
+async def ajax_event_galaxy_info(id: int, db: Session = Depends(get_db)):
+    """Get the popup HTML of one event galaxy marker, by galaxy entry id."""
+    from server.utils.function import sanatize_pointing, sanatize_gal_info
+
+    result = (
+        db.query(
+            GWGalaxyEntry,
+            GWGalaxyList,
+            func.ST_AsText(GWGalaxyEntry.position).label("position_text"),
+        )
+        .join(GWGalaxyList, GWGalaxyList.id == GWGalaxyEntry.listid)
+        .filter(GWGalaxyEntry.id == id)
+        .first()
+    )
+    if result is None:
+        raise not_found_exception(f"No event galaxy found with id: {id}")
+
+    entry, glist, position = result
+    ra, dec = sanatize_pointing(position or "")
+    return {"name": entry.name, "info": sanatize_gal_info(entry, glist, ra, dec)}
@@ -6,7 +6,9 @@ sky coverage for gravitational wave events, using CelesTrak TLE data to determin
 spacecraft position and Earth limb occlusion.
 """
 
+import asyncio
 import json
+import numpy as np
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 
@@ -15,59 +17,95 @@ from sqlalchemy.orm import Session
 
 from server.db.database import get_db
 from server.db.models.gw_alert import GWAlert
-from server.utils.celestrak import calculate_fermi_gbm_coverage, get_earth_sat_pos
+from server.utils.celestrak import get_fermi_state
 from server.utils.gwtm_io import get_cached_file, set_cached_file, download_gwtm_file
 from server.config import settings
 
 router = APIRouter(tags=["UI", "Fermi Coverage"])
 
 
-def earth_limb_to_moc(
-    earth_contour: List[List[float]], order: int = 8
-) -> Dict[str, Any]:
-    """
-    Convert Earth limb contour to MOC (Multi-Order Coverage) format.
+# Fermi/LAT field of view radius in degrees
+LAT_FOV_RADIUS = 65
+
 
-    For Fermi/GBM, the visible sky is the complement of the Earth limb,
-    so we need to create a MOC that covers everything EXCEPT the Earth disk.
+def cone_moc(ra: float, dec: float, radius: float, order: int):
+    """
+    MOC of the HEALPix cells at order whose centres lie within radius of (ra, dec).
 
     Args:
-        earth_contour: List of [ra, dec] coordinates defining Earth's limb
-        order: MOC order (higher = more resolution)
+        ra: Cone centre right ascension in degrees
+        dec: Cone centre declination in degrees
+        radius: Cone radius in degrees
+        order: HEALPix order of the cells
 
     Returns:
-        MOC dictionary in HEALPix format
+        mocpy MOC
     """
-    # For now, use the simple fallback approach since mocpy has API compatibility issues
-    # This could be improved with a more recent/compatible version of mocpy
-    return create_simple_visibility_moc(earth_contour, order)
+    import healpy as hp
+    from mocpy import MOC
+
+    nside = 2**order
+    vec = hp.ang2vec(ra, dec, lonlat=True)
+    ipix = hp.query_disc(nside, vec, np.radians(radius), nest=True)
+    return MOC.from_healpix_cells(
+        ipix.astype(np.uint64),
+        np.full(len(ipix), order, dtype=np.uint8),
+        max_depth=order,
+    )
 
 
-def create_simple_visibility_moc(
-    earth_contour: List[List[float]], order: int = 8
-) -> Dict[str, Any]:
+def moc_to_json(moc) -> Dict[str, List[int]]:
+    """
+    Serialise a MOC to the JSON form Aladin reads ({order: [cells]}).
+
+    The MOC is normalised, so runs of cells are merged into their parents and
+    large regions take a few hundred cells rather than one per pixel.
+    """
+    return json.loads(moc.to_string(format="json"))
+
+
+def gbm_visibility_moc(
+    earth_ra: float, earth_dec: float, earth_radius: float, order: int
+) -> Dict[str, List[int]]:
     """
-    Create a simplified MOC representing Fermi/GBM visibility without mocpy dependency.
+    MOC of the sky visible to Fermi/GBM: everything outside the Earth disk.
+
+    Args:
+        earth_ra: Geocenter right ascension in degrees
+        earth_dec: Geocenter declination in degrees
+        earth_radius: Angular radius of the Earth seen from Fermi, in degrees
+        order: HEALPix order of the MOC
+
+    Returns:
+        MOC JSON dictionary
+    """
+    return moc_to_json(cone_moc(earth_ra, earth_dec, earth_radius, order).complement())
 
-    This is a fallback implementation that creates a coarse approximation
-    of the visible sky by excluding regions around the Earth center.
+
+def lat_fov_moc(ra: float, dec: float, order: int) -> Dict[str, List[int]]:
+    """
+    MOC of the Fermi/LAT field of view centred on (ra, dec).
 
     Args:
-        earth_contour: Earth limb contour (not used in simple version)
-        order: MOC order
+        ra: Pointing right ascension in degrees
+        dec: Pointing declination in degrees
+        order: HEALPix order of the MOC
 
     Returns:
-        Simple MOC dictionary
+        MOC JSON dictionary
     """
-    # This is a very simplified version - in production you'd want mocpy
-    # For now, return a basic MOC structure
-    return {
-        "order": order,
-        "coordsys": "ICRS",
-        "cells": {
-            str(order): list(range(0, 12 * (4**order), 100))  # Sample every 100th pixel
-        },
-    }
+    return moc_to_json(cone_moc(ra, dec, LAT_FOV_RADIUS, order))
+
+
+def get_trigger_time(graceid: str, db: Session) -> Optional[datetime]:
+    """Time of signal of the latest alert for a graceid that has one."""
+    alert = (
+        db.query(GWAlert.time_of_signal)
+        .filter(GWAlert.graceid == graceid, GWAlert.time_of_signal.isnot(None))
+        .order_by(GWAlert.datecreated.desc())
+        .first()
+    )
+    return alert.time_of_signal if alert else None
 
 
 @router.get("/ajax_fermi_coverage")
@@ -94,25 +132,38 @@ async def get_fermi_coverage(
     # Normalize graceid
     normalized_graceid = GWAlert.graceidfromalternate(graceid, db)
 
-    # Get the GW alert to find trigger time
-    alert = (
-        db.query(GWAlert)
-        .filter(
-            GWAlert.graceid == normalized_graceid, GWAlert.time_of_signal.isnot(None)
+    trigger_time = get_trigger_time(normalized_graceid, db)
+
+    if trigger_time is None:
+        # Try to load pre-computed coverage from storage
+        return await asyncio.to_thread(
+            load_precomputed_coverage, normalized_graceid, instrument
         )
-        .order_by(GWAlert.datecreated.desc())
-        .first()
+
+    # TLE download, ephemeris, MOC and storage calls all block
+    return await asyncio.to_thread(
+        fermi_coverage, normalized_graceid, instrument, trigger_time
     )
 
-    if not alert or not alert.time_of_signal:
-        # Try to load pre-computed coverage from storage
-        return await load_precomputed_coverage(normalized_graceid, instrument)
 
-    trigger_time = alert.time_of_signal
+def fermi_coverage(
+    graceid: str, instrument: str, trigger_time: datetime
+) -> Dict[str, Any]:
+    """
+    Build (or load from cache) the coverage of one Fermi instrument. Blocks.
 
+    Args:
+        graceid: Normalized GW event ID
+        instrument: 'gbm' or 'lat'
+        trigger_time: GW trigger time
+
+    Returns:
+        Coverage data dictionary with MOC format
+    """
     # Create cache key
     cache_key = (
-        f"fermi_coverage_{normalized_graceid}_{instrument}_{trigger_time.isoformat()}"
+        f"fermi_coverage_{graceid}_{instrument}_"
+        f"{trigger_time.isoformat()}_order{settings.FERMI_MOC_ORDER}"
     )
 
     # Check cache first
@@ -122,9 +173,10 @@ async def get_fermi_coverage(
 
     # Calculate coverage using CelesTrak
     try:
-        coverage_data = await calculate_fermi_coverage(
-            trigger_time, instrument, normalized_graceid
-        )
+        coverage_data = calculate_fermi_coverage(trigger_time, instrument, graceid)
+        if coverage_data is None:
+            # No spacecraft state (yet); don't pin the fallback in the cache
+            return load_precomputed_coverage(graceid, instrument)
 
         # Cache the result
         set_cached_file(cache_key, coverage_data, settings)
@@ -134,12 +186,12 @@ async def get_fermi_coverage(
     except Exception as e:
         print(f"Error calculating Fermi coverage: {str(e)}")
         # Fallback to pre-computed coverage
-        return await load_precomputed_coverage(normalized_graceid, instrument)
+        return load_precomputed_coverage(graceid, instrument)
 
 
-async def calculate_fermi_coverage(
+def calculate_fermi_coverage(
     trigger_time: datetime, instrument: str, graceid: str
-) -> Dict[str, Any]:
+) -> Optional[Dict[str, Any]]:
     """
     Calculate Fermi coverage using CelesTrak data.
 
@@ -149,21 +201,24 @@ async def calculate_fermi_coverage(
         graceid: GW event ID
 
     Returns:
-        Coverage data dictionary with MOC format
+        Coverage data dictionary with MOC format, or None when there is no
+        spacecraft state for the trigger time (no TLE, CelesTrak unreachable,
+        or Fermi in the SAA). None results must not be cached, so that a TLE
+        loaded later is picked up.
     """
     if instrument.lower() == "gbm":
-        return await calculate_gbm_coverage(trigger_time, graceid)
+        return calculate_gbm_coverage(trigger_time, graceid)
     elif instrument.lower() == "lat":
-        return await calculate_lat_coverage(trigger_time, graceid)
+        return calculate_lat_coverage(trigger_time, graceid)
     else:
         raise HTTPException(
             status_code=400, detail="Invalid instrument. Use 'gbm' or 'lat'"
         )
 
 
-async def calculate_gbm_coverage(
+def calculate_gbm_coverage(
     trigger_time: datetime, graceid: str
-) -> Dict[str, Any]:
+) -> Optional[Dict[str, Any]]:
     """
     Calculate Fermi/GBM coverage using CelesTrak TLE data.
 
@@ -174,26 +229,23 @@ async def calculate_gbm_coverage(
         graceid: GW event ID
 
     Returns:
-        GBM coverage data in MOC format
+        GBM coverage data in MOC format, or None without a spacecraft state
     """
-    # Calculate Fermi position and Earth limb
-    coverage = calculate_fermi_gbm_coverage(trigger_time)
+    # Calculate Fermi position and Earth limb (memoized per trigger time)
+    coverage = get_fermi_state(trigger_time)
 
     if not coverage:
         # Spacecraft in SAA or calculation failed
-        return {
-            "overlays": [
-                {
-                    "name": "Fermi in South Atlantic Anomaly",
-                    "color": "gray",
-                    "json": None,
-                }
-            ]
-        }
+        return None
 
-    # Convert Earth limb to MOC format (complement for GBM visibility)
+    # GBM sees everything outside the Earth disk
     try:
-        moc_data = earth_limb_to_moc(coverage["earth_contour"], order=8)
+        moc_data = gbm_visibility_moc(
+            coverage["earth_ra"],
+            coverage["earth_dec"],
+            coverage["earth_radius"],
+            settings.FERMI_MOC_ORDER,
+        )
 
         return {
             "overlays": [
@@ -213,7 +265,7 @@ async def calculate_gbm_coverage(
                             "radius_deg": coverage["earth_radius"],
                         },
                         "calculated_at": trigger_time.isoformat(),
-                        "calculation_method": "CelesTrak TLE + Earth limb complement",
+                        "calculation_method": "CelesTrak TLE + Earth disk complement",
                     },
                 }
             ]
@@ -226,9 +278,9 @@ async def calculate_gbm_coverage(
         )
 
 
-async def calculate_lat_coverage(
+def calculate_lat_coverage(
     trigger_time: datetime, graceid: str
-) -> Dict[str, Any]:
+) -> Optional[Dict[str, Any]]:
     """
     Calculate Fermi/LAT coverage using spacecraft pointing data.
 
@@ -240,25 +292,24 @@ async def calculate_lat_coverage(
         graceid: GW event ID
 
     Returns:
-        LAT coverage data in MOC format
+        LAT coverage data in MOC format, or None without a spacecraft state
     """
-    # Get spacecraft position
-    earth_ra, earth_dec, earth_radius = get_earth_sat_pos(trigger_time)
+    # Get spacecraft position (memoized per trigger time, shared with GBM)
+    coverage = get_fermi_state(trigger_time)
 
-    if not all([earth_ra, earth_dec, earth_radius]):
-        return {
-            "overlays": [{"name": "Fermi/LAT - No data", "color": "red", "json": None}]
-        }
+    if not coverage:
+        return None
+
+    earth_ra, earth_dec = coverage["earth_ra"], coverage["earth_dec"]
 
     # For LAT, create a circular field of view around zenith direction
     # The zenith is opposite to Earth center from spacecraft perspective
     lat_ra = (earth_ra + 180) % 360
     lat_dec = -earth_dec
-    lat_radius = 65  # LAT field of view radius in degrees
+    lat_radius = LAT_FOV_RADIUS
 
     try:
-        # For simplicity, use the fallback approach for LAT as well
-        moc_data = create_simple_visibility_moc([], order=8)
+        moc_data = lat_fov_moc(lat_ra, lat_dec, settings.FERMI_MOC_ORDER)
 
         return {
             "overlays": [
@@ -280,13 +331,13 @@ async def calculate_lat_coverage(
         }
 
     except ImportError:
-        # Fallback without mocpy
+        # No MOC without healpy/mocpy
         return {
             "overlays": [
                 {
                     "name": "Fermi/LAT",
                     "color": "red",
-                    "json": create_simple_visibility_moc([], order=8),
+                    "json": None,
                     "info": {
                         "pointing_center": {
                             "ra": lat_ra,
@@ -294,14 +345,14 @@ async def calculate_lat_coverage(
                             "radius_deg": lat_radius,
                         },
                         "calculated_at": trigger_time.isoformat(),
-                        "calculation_method": "Simplified calculation (mocpy not available)",
+                        "calculation_method": "No MOC (healpy/mocpy not available)",
                     },
                 }
             ]
         }
 
 
-async def load_precomputed_coverage(graceid: str, instrument: str) -> Dict[str, Any]:
+def load_precomputed_coverage(graceid: str, instrument: str) -> Dict[str, Any]:
     """
     Load pre-computed Fermi coverage from storage.
 
@@ -384,6 +435,9 @@ async def get_grb_overlays(
     This includes Fermi/GBM, Fermi/LAT, and Swift/BAT coverage.
     This endpoint mirrors the GRBoverlays functionality from the Flask app.
 
+    The alert is looked up once and every overlay is derived from the same
+    memoized spacecraft state, with the whole set cached as one entry.
+
     Args:
         graceid: GW event ID
         db: Database session
@@ -391,24 +445,68 @@ async def get_grb_overlays(
     Returns:
         List of overlay dictionaries for GRB instruments
     """
-    overlays = []
+    normalized_graceid = GWAlert.graceidfromalternate(graceid, db)
+    trigger_time = get_trigger_time(normalized_graceid, db)
 
-    # Get Fermi/GBM coverage
-    try:
-        gbm_coverage = await get_fermi_coverage(graceid, "gbm", db)
-        if gbm_coverage.get("overlays"):
-            overlays.extend(gbm_coverage["overlays"])
-    except Exception as e:
-        print(f"Error getting GBM coverage: {str(e)}")
+    if trigger_time is None:
+        overlays = []
+        for instrument in ("gbm", "lat"):
+            coverage = await asyncio.to_thread(
+                load_precomputed_coverage, normalized_graceid, instrument
+            )
+            overlays.extend(coverage.get("overlays") or [])
+        return overlays
 
-    # Get Fermi/LAT coverage
-    try:
-        lat_coverage = await get_fermi_coverage(graceid, "lat", db)
-        if lat_coverage.get("overlays"):
-            overlays.extend(lat_coverage["overlays"])
-    except Exception as e:
-        print(f"Error getting LAT coverage: {str(e)}")
+    return await build_grb_overlays(normalized_graceid, trigger_time)
+
+
+async def build_grb_overlays(
+    graceid: str, trigger_time: datetime
+) -> List[Dict[str, Any]]:
+    """
+    Build (or load from cache) the GRB instrument overlays for a trigger time,
+    in a worker thread so the event loop keeps serving other requests.
+    """
+    return await asyncio.to_thread(grb_overlays, graceid, trigger_time)
+
+
+def grb_overlays(graceid: str, trigger_time: datetime) -> List[Dict[str, Any]]:
+    """
+    Build (or load from cache) the GRB instrument overlays for a trigger time.
+    Blocks on TLE downloads, ephemeris, MOC building and storage.
+
+    Args:
+        graceid: Normalized GW event ID
+        trigger_time: GW trigger time
+
+    Returns:
+        List of overlay dictionaries for GRB instruments
+    """
+    cache_key = (
+        f"grb_overlays_{graceid}_"
+        f"{trigger_time.isoformat()}_order{settings.FERMI_MOC_ORDER}"
+    )
+    cached_overlays = get_cached_file(cache_key, settings)
+    if cached_overlays:
+        return json.loads(cached_overlays)
+
+    overlays = []
+    complete = True
+    for instrument in ("gbm", "lat"):
+        try:
+            coverage = calculate_fermi_coverage(trigger_time, instrument, graceid)
+        except Exception as e:
+            print(f"Error getting {instrument.upper()} coverage: {str(e)}")
+            coverage = None
+        if coverage is None:
+            coverage = load_precomputed_coverage(graceid, instrument)
+            complete = False
+        overlays.extend(coverage.get("overlays") or [])
 
     # TODO: Add Swift/BAT coverage when implemented
-    # bat_coverage = await get_swift_bat_coverage(graceid, db)
+    # bat_coverage = await get_swift_bat_coverage(graceid)
+
+    # Don't pin a fallback in the cache
+    if complete:
+        set_cached_file(cache_key, overlays, settings)
     return overlays
@@ -12,6 +12,7 @@ from .pointing_from_id import router as pointing_from_id_router
 from .grade_calculator import router as grade_calculator_router
 from .icecube_notice import router as icecube_notice_router
 from .event_galaxies import router as event_galaxies_router
+from .event_galaxy_info import router as event_galaxy_info_router
 from .scimma_xrt import router as scimma_xrt_router
 from .candidate_fetch import router as candidate_fetch_router
 from .request_doi import router as request_doi_router
@@ -32,6 +33,7 @@ router.include_router(pointing_from_id_router)
 router.include_router(grade_calculator_router)
 router.include_router(icecube_notice_router)
 router.include_router(event_galaxies_router)
+router.include_router(event_galaxy_info_router)
 router.include_router(scimma_xrt_router)
 router.include_router(candidate_fetch_router)
 router.include_router(request_doi_router)
@@ -70,6 +70,16 @@ class GetCandidateQueryParams(BaseModel):
     associated_galaxy_distance_lt: Optional[float] = Field(
         None, description="Filter by associated galaxy distance less than this value"
     )
+    cone: Optional[str] = Field(
+        None, description="Cone search '[ra, dec, radius]' in degrees"
+    )
+    polygon: Optional[str] = Field(
+        None,
+        description="Polygon search as WKT or JSON array of [ra, dec] vertices",
+    )
+    fields: Optional[str] = Field(
+        None, description="Comma-separated list or JSON array of fields to return"
+    )
 
 
 class CandidateRequest(BaseModel):
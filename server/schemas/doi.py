@@ -97,6 +97,8 @@ class DOIRequestResponse(BaseModel):
     """Schema for DOI request response."""
 
     DOI_URL: Optional[str] = None
+    DOI_STATUS: Optional[str] = None
+    DOI_TASK_ID: Optional[int] = None
     WARNINGS: List[Any] = []
 
 
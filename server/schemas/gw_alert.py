@@ -106,6 +106,7 @@ class GWAlertQueryResponse(BaseModel):
     total_pages: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None
 
 
 class GWAlertFilterOptionsResponse(BaseModel):
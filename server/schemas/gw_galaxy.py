@@ -158,3 +158,15 @@ class PostEventGalaxiesResponse(BaseModel):
     message: str = Field(..., description="Success message")
     errors: List[Any] = Field(..., description="List of errors encountered")
     warnings: List[Any] = Field(..., description="List of warnings encountered")
+
+
+class GladeNearestRequest(BaseModel):
+    """Request schema for the batch nearest GLADE galaxy search."""
+
+    positions: List[List[float]] = Field(
+        ..., description="Sky positions as [ra, dec] pairs in degrees"
+    )
+    radius: Optional[float] = Field(
+        None, gt=0, le=180, description="Only galaxies within this many degrees"
+    )
+    limit: int = Field(1, ge=1, le=100, description="Galaxies returned per position")
@@ -0,0 +1,22 @@
+"""Schemas for the metadata bundle endpoint."""
+
+from pydantic import BaseModel, Field
+from typing import Dict, List
+
+from server.schemas.enums import EnumOption
+from server.schemas.gw_alert import GWAlertFilterOptionsResponse
+from server.schemas.instrument import InstrumentSchema
+
+
+class MetadataBundleResponse(BaseModel):
+    """Reference data the UI loads on every page, in one response."""
+
+    alert_filter_options: GWAlertFilterOptionsResponse = Field(
+        ..., description="Same as /alert_filter_options"
+    )
+    enums: Dict[str, List[EnumOption]] = Field(
+        ..., description="Same as /enums/all, keyed by enum type"
+    )
+    instruments: List[InstrumentSchema] = Field(
+        ..., description="Same as /instruments without filters"
+    )
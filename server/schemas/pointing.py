@@ -124,6 +124,102 @@ class PointingBase(BaseModel):
     )
 
 
+class PointingQueryParams(BaseModel):
+    """Filters shared by the pointing query and export endpoints."""
+
+    # Basic filters
+    graceid: Optional[str] = Field(None, description="Grace ID of the GW event")
+    graceids: Optional[str] = Field(
+        None, description="Comma-separated list or JSON array of Grace IDs"
+    )
+    id: Optional[int] = Field(None, description="Filter by pointing ID")
+    ids: Optional[str] = Field(
+        None, description="Comma-separated list or JSON array of pointing IDs"
+    )
+    # Status filters
+    status: Optional[str] = Field(
+        None, description="Filter by status (planned, completed, cancelled)"
+    )
+    statuses: Optional[str] = Field(
+        None, description="Comma-separated list or JSON array of statuses"
+    )
+    # Time filters
+    completed_after: Optional[datetime] = Field(
+        None, description="Filter for pointings completed after this time (ISO format)"
+    )
+    completed_before: Optional[datetime] = Field(
+        None, description="Filter for pointings completed before this time (ISO format)"
+    )
+    planned_after: Optional[datetime] = Field(
+        None, description="Filter for pointings planned after this time (ISO format)"
+    )
+    planned_before: Optional[datetime] = Field(
+        None, description="Filter for pointings planned before this time (ISO format)"
+    )
+    # User filters
+    user: Optional[str] = Field(
+        None, description="Filter by username, first name, or last name"
+    )
+    users: Optional[str] = Field(
+        None, description="Comma-separated list or JSON array of usernames"
+    )
+    # Instrument filters
+    instrument: Optional[str] = Field(
+        None, description="Filter by instrument ID or name"
+    )
+    instruments: Optional[str] = Field(
+        None,
+        description="Comma-separated list or JSON array of instrument IDs or names",
+    )
+    # Band filters
+    band: Optional[str] = Field(None, description="Filter by band")
+    bands: Optional[str] = Field(
+        None, description="Comma-separated list or JSON array of bands"
+    )
+    # Spectral filters
+    wavelength_regime: Optional[str] = Field(
+        None, description="Filter by wavelength regime [min, max]"
+    )
+    wavelength_unit: Optional[str] = Field(
+        None, description="Wavelength unit (angstrom, nanometer, micron)"
+    )
+    frequency_regime: Optional[str] = Field(
+        None, description="Filter by frequency regime [min, max]"
+    )
+    frequency_unit: Optional[str] = Field(
+        None, description="Frequency unit (Hz, kHz, MHz, GHz, THz)"
+    )
+    energy_regime: Optional[str] = Field(
+        None, description="Filter by energy regime [min, max]"
+    )
+    energy_unit: Optional[str] = Field(
+        None, description="Energy unit (eV, keV, MeV, GeV, TeV)"
+    )
+    # Depth filters
+    depth_gt: Optional[float] = Field(
+        None, description="Filter by depth greater than this value"
+    )
+    depth_lt: Optional[float] = Field(
+        None, description="Filter by depth less than this value"
+    )
+    depth_unit: Optional[str] = Field(
+        None, description="Depth unit (ab_mag, vega_mag, flux_erg, flux_jy)"
+    )
+    # Spatial filters
+    cone: Optional[str] = Field(
+        None, description="Cone search '[ra, dec, radius]' in degrees"
+    )
+    polygon: Optional[str] = Field(
+        None,
+        description="Polygon search as WKT or JSON array of [ra, dec] vertices",
+    )
+    # Output fields
+    fields: Optional[str] = Field(
+        None,
+        description="Comma-separated list or JSON array of fields to return",
+    )
+
+
 class PointingResponse(BaseModel):
     """Schema for pointing creation response."""
 
@@ -131,6 +227,9 @@ class PointingResponse(BaseModel):
     ERRORS: List[Any] = []
     WARNINGS: List[Any] = []
     DOI: Optional[str] = None
+    DOI_STATUS: Optional[str] = Field(
+        None, description="'pending' while a requested DOI is being minted"
+    )
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -0,0 +1,173 @@
+"""
+Alert-derived products: resampled skymaps, the sorted cumulative skymap,
+credible-region MOCs and GRB overlays.
+
+Each product is computed once per alert version and kept in the storage cache.
+Read endpoints build missing products on demand; precompute_alert_products
+builds the common ones as soon as an alert is posted.
+"""
+
+import asyncio
+import logging
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+from server.config import settings
+from server.db.database import db_session
+from server.db.models.gw_alert import GWAlertHead
+from server.routes.ui.fermi_coverage import build_grb_overlays, get_trigger_time
+from server.utils.gwtm_io import download_gwtm_file, get_cached_bytes, set_cached_bytes
+from server.utils.skymap import (
+    read_skymap,
+    read_skymap_layers,
+    resample_skymap,
+    sorted_cumulative,
+    encode_sorted_cumulative,
+    decode_sorted_cumulative,
+    credible_region_moc,
+)
+
+logger = logging.getLogger(__name__)
+
+# Credible regions built on ingest; other levels are built on first request
+PRECOMPUTE_CREDIBLE_LEVELS = (0.5, 0.9)
+
+SORTED_PRODUCT = "sorted.npz"
+
+
+def healpix_product(nside: int) -> str:
+    """Product name of the float32 map at nside."""
+    return f"nside{nside}.f32"
+
+
+def moc_product(credible_level: float) -> str:
+    """Product name of a credible-region MOC. Levels are cached per percent."""
+    return f"cl{int(round(credible_level * 100))}.moc.json"
+
+
+class SkymapProducts:
+    """
+    Derived products of one alert version's skymap.
+
+    The skymap is downloaded and sorted at most once per instance, so building
+    several products together (as on ingest) reads the FITS file once. Methods
+    block; call them from a worker thread in async code.
+    """
+
+    def __init__(self, path_info: str, skymap_path: str):
+        self.path_info = path_info
+        self.skymap_path = skymap_path
+        self._prob: Optional[np.ndarray] = None
+        self._sorted: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    def key(self, product: str) -> str:
+        """Storage cache key of a product."""
+        return f"cache/skymap_{self.path_info}_{product}"
+
+    def _get_or_build(self, product: str, build: Callable[[], bytes]) -> bytes:
+        key = self.key(product)
+        content = get_cached_bytes(key, settings)
+        if content is None:
+            content = build()
+            set_cached_bytes(key, content, settings)
+        return content
+
+    def _download(self) -> bytes:
+        return download_gwtm_file(
+            filename=self.skymap_path,
+            source=settings.STORAGE_BUCKET_SOURCE,
+            config=settings,
+            decode=False,
+        )
+
+    @property
+    def prob(self) -> np.ndarray:
+        """Full-resolution probability map, RING ordered."""
+        if self._prob is None:
+            self._prob = read_skymap(self._download())
+        return self._prob
+
+    def layers(self) -> dict:
+        """Probability and distance layers (see read_skymap_layers)."""
+        layers = read_skymap_layers(self._download())
+        self._prob = layers["prob"]
+        return layers
+
+    @property
+    def nside(self) -> int:
+        """NSIDE of the full-resolution map."""
+        return int(np.sqrt(len(self.prob) // 12))
+
+    def healpix(self, nside: int) -> bytes:
+        """The map at nside as little-endian float32, RING ordered."""
+        return self._get_or_build(
+            healpix_product(nside),
+            lambda: resample_skymap(self.prob, nside).tobytes(),
+        )
+
+    def sorted(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Pixel order by descending probability and its cumulative probability."""
+        if self._sorted is None:
+            content = self._get_or_build(
+                SORTED_PRODUCT,
+                lambda: encode_sorted_cumulative(*sorted_cumulative(self.prob)),
+            )
+            self._sorted = decode_sorted_cumulative(content)
+        return self._sorted
+
+    def moc(self, credible_level: float) -> bytes:
+        """MOC JSON of the credible region holding credible_level."""
+        return self._get_or_build(
+            moc_product(credible_level),
+            lambda: credible_region_moc(*self.sorted(), credible_level).encode(),
+        )
+
+
+def precompute_skymap_products(path_info: str, skymap_path: str) -> None:
+    """Build the float32 maps, sorted skymap and credible-region MOCs of an alert."""
+    products = SkymapProducts(path_info, skymap_path)
+    for nside in settings.SKYMAP_PRECOMPUTE_NSIDES:
+        # Upsampled maps add nothing; leave them to on-demand requests
+        if nside <= products.nside:
+            products.healpix(nside)
+    for credible_level in PRECOMPUTE_CREDIBLE_LEVELS:
+        products.moc(credible_level)
+
+
+async def precompute_alert_products(graceid: str) -> None:
+    """
+    Warm the caches of a newly posted alert, so the first visitors to its page
+    do not pay for building them. Run as a background task after post_alert.
+
+    Smoothed contours are not built here: they are uploaded with the skymap by
+    the alert listener, which has the contouring tools the API does not.
+    """
+    with db_session() as db:
+        head = GWAlertHead.get(graceid, db)
+        if head is None:
+            return
+        path_info, skymap_path = head.path_info, head.skymap_path
+        trigger_time = get_trigger_time(graceid, db)
+
+    try:
+        await asyncio.to_thread(precompute_skymap_products, path_info, skymap_path)
+    except Exception as e:
+        # The skymap may not be uploaded yet; read endpoints build on demand
+        logger.warning(
+            "Could not precompute skymap products for %s: %s: %s",
+            path_info,
+            type(e).__name__,
+            str(e),
+        )
+
+    if trigger_time is not None:
+        try:
+            await build_grb_overlays(graceid, trigger_time)
+        except Exception as e:
+            logger.warning(
+                "Could not precompute GRB overlays for %s: %s: %s",
+                graceid,
+                type(e).__name__,
+                str(e),
+            )
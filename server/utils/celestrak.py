@@ -2,16 +2,23 @@
 CelesTrak satellite tracking functionality for Fermi spacecraft positioning.
 
 This module provides functions to:
-1. Download TLE (Two-Line Element) data from CelesTrak
+1. Download TLE (Two-Line Element) data from CelesTrak and keep it in a local
+   store, so historical triggers use the element set closest to their epoch
 2. Calculate Fermi spacecraft position at specific times
 3. Determine Earth limb for sky coverage calculations
 4. Support Fermi/GBM instrument coverage analysis
 """
 
+import bisect
+import glob
+import logging
 import math
+import os
+import threading
+import time
 import numpy as np
-from datetime import datetime
-from typing import Tuple, Union, Optional
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple, Union, Optional
 from urllib.request import urlopen
 from bs4 import BeautifulSoup
 from shapely.geometry import Point, Polygon
@@ -21,12 +28,231 @@ try:
 except ImportError:
     ephem = None
 
+from server.config import settings
+from server.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# NORAD catalog number of the Fermi spacecraft
+FERMI_CATNR = 33053
+CELESTRAK_URL = (
+    f"https://celestrak.org/NORAD/elements/gp.php?CATNR={FERMI_CATNR}&FORMAT=tle"
+)
+# Minimum time between CelesTrak requests, so failures don't hit it per request
+CELESTRAK_RETRY_SECONDS = 600
+
+TLE = Tuple[str, str, str]
+
+
+def tle_epoch(line1: str) -> datetime:
+    """
+    Epoch of a TLE from its first line (columns 19-32, YYDDD.DDDDDDDD).
+
+    Args:
+        line1: First data line of the TLE
+
+    Returns:
+        Epoch as a naive UTC datetime
+    """
+    year = int(line1[18:20])
+    year += 2000 if year < 57 else 1900
+    day_of_year = float(line1[20:32])
+    return datetime(year, 1, 1) + timedelta(days=day_of_year - 1)
+
+
+def parse_tle_text(text: str, catnr: int = FERMI_CATNR) -> List[TLE]:
+    """
+    Parse two- or three-line element sets for one satellite from a TLE file.
+
+    Args:
+        text: TLE file contents, with or without name lines
+        catnr: NORAD catalog number to keep
+
+    Returns:
+        List of (name, line1, line2) tuples
+    """
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    tles = []
+    name = "FERMI"
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if (
+            line.startswith("1 ")
+            and i + 1 < len(lines)
+            and lines[i + 1].startswith("2 ")
+        ):
+            if line[2:7].strip() == str(catnr):
+                tles.append((name, line, lines[i + 1]))
+            i += 2
+            continue
+        # Name line of a three-line set (CelesTrak prefixes it with "0 ")
+        name = line[2:] if line.startswith("0 ") else line
+        i += 1
+    return tles
+
+
+class TLEStore:
+    """
+    Element sets for one satellite, keyed by epoch.
+
+    Lookups return the set closest to the requested time, so positions for
+    historical triggers are propagated over hours rather than years.
+    """
+
+    def __init__(self):
+        self._epochs: List[datetime] = []
+        self._tles: Dict[datetime, TLE] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._epochs)
+
+    def add(self, name: str, line1: str, line2: str) -> bool:
+        """
+        Add an element set.
+
+        Returns:
+            True if the epoch was not already stored
+        """
+        epoch = tle_epoch(line1)
+        with self._lock:
+            if epoch in self._tles:
+                return False
+            bisect.insort(self._epochs, epoch)
+            self._tles[epoch] = (name, line1, line2)
+            return True
+
+    def load_text(self, text: str) -> int:
+        """Bulk-load element sets from TLE file contents. Returns how many were new."""
+        return sum(self.add(*tle) for tle in parse_tle_text(text))
+
+    def load_file(self, path: str) -> int:
+        """Bulk-load element sets from a TLE file. Returns how many were new."""
+        with open(path) as f:
+            return self.load_text(f.read())
+
+    def load_dir(self, directory: str) -> int:
+        """Bulk-load every *.tle and *.txt file in a directory."""
+        paths = glob.glob(os.path.join(directory, "*.tle")) + glob.glob(
+            os.path.join(directory, "*.txt")
+        )
+        return sum(self.load_file(path) for path in sorted(paths))
+
+    def closest(self, datetime_obj: datetime) -> Optional[Tuple[datetime, TLE]]:
+        """
+        Get the element set whose epoch is closest to datetime_obj.
+
+        Returns:
+            Tuple of (epoch, (name, line1, line2)), or None if the store is empty
+        """
+        with self._lock:
+            if not self._epochs:
+                return None
+            i = bisect.bisect_left(self._epochs, datetime_obj)
+            candidates = self._epochs[max(i - 1, 0) : i + 1]
+            epoch = min(candidates, key=lambda e: abs(e - datetime_obj))
+            return epoch, self._tles[epoch]
+
+
+# Fermi element sets, bulk-loaded from FERMI_TLE_DIR on first use
+fermi_tle_store = TLEStore()
+_fermi_tle_dir_loaded = False
+_last_celestrak_attempt = 0.0
+_fermi_tle_init_lock = threading.Lock()
+
+
+def _ensure_fermi_tles_loaded() -> None:
+    global _fermi_tle_dir_loaded
+    if _fermi_tle_dir_loaded:
+        return
+    with _fermi_tle_init_lock:
+        if not _fermi_tle_dir_loaded:
+            if settings.FERMI_TLE_DIR and os.path.isdir(settings.FERMI_TLE_DIR):
+                loaded = fermi_tle_store.load_dir(settings.FERMI_TLE_DIR)
+                logger.info(
+                    "Loaded %d Fermi TLEs from %s", loaded, settings.FERMI_TLE_DIR
+                )
+            _fermi_tle_dir_loaded = True
+
+
+def download_fermi_tle() -> Optional[TLE]:
+    """
+    Download the current Fermi element set from CelesTrak into the store.
+
+    The set is also appended to FERMI_TLE_DIR (when configured), so later
+    processes and offline runs start with it.
+
+    Returns:
+        The (name, line1, line2) tuple, or None on failure
+    """
+    global _last_celestrak_attempt
+    _last_celestrak_attempt = time.monotonic()
+
+    try:
+        tle_raw = urlopen(CELESTRAK_URL, timeout=10).read().decode("utf-8")
+    except Exception as e:
+        logger.warning("Error downloading Fermi TLE from CelesTrak: %s", str(e))
+        return None
+
+    tles = parse_tle_text(tle_raw)
+    if not tles:
+        logger.warning("No Fermi TLE in CelesTrak response: %s", tle_raw[:200])
+        return None
+
+    tle = tles[0]
+    if fermi_tle_store.add(*tle) and settings.FERMI_TLE_DIR:
+        try:
+            os.makedirs(settings.FERMI_TLE_DIR, exist_ok=True)
+            path = os.path.join(settings.FERMI_TLE_DIR, "celestrak.tle")
+            with open(path, "a") as f:
+                f.write("\n".join(tle) + "\n")
+        except OSError as e:
+            logger.warning(
+                "Could not save Fermi TLE to %s: %s", settings.FERMI_TLE_DIR, str(e)
+            )
+    return tle
+
+
+def get_fermi_tle(datetime_obj: datetime) -> Optional[TLE]:
+    """
+    Get the Fermi element set to use for a given time.
+
+    Uses the stored set closest to datetime_obj. CelesTrak only serves the
+    current set, so it is contacted only when datetime_obj is recent, no stored
+    set is within FERMI_TLE_MAX_AGE_DAYS of it and FERMI_TLE_OFFLINE is off.
+
+    Args:
+        datetime_obj: Time the position is needed for
+
+    Returns:
+        The (name, line1, line2) tuple, or None if no set is available
+    """
+    _ensure_fermi_tles_loaded()
+
+    max_age = timedelta(days=settings.FERMI_TLE_MAX_AGE_DAYS)
+    closest = fermi_tle_store.closest(datetime_obj)
+    if closest is not None and abs(closest[0] - datetime_obj) <= max_age:
+        return closest[1]
+
+    if (
+        not settings.FERMI_TLE_OFFLINE
+        and abs(datetime.utcnow() - datetime_obj) <= max_age
+        and time.monotonic() - _last_celestrak_attempt >= CELESTRAK_RETRY_SECONDS
+    ):
+        tle = download_fermi_tle()
+        if tle is not None:
+            return tle
+
+    # Fall back to the nearest set we have, however far away
+    return closest[1] if closest is not None else None
+
 
 def get_data_from_tle(
     datetime_obj: datetime, tle_lat_offset: float = 0, tle_lon_offset: float = 0.21
 ) -> Tuple[Union[float, bool], Union[float, bool], Union[float, bool]]:
     """
-    Get Fermi spacecraft position from CelesTrak TLE data.
+    Get Fermi spacecraft position from the TLE closest to datetime_obj.
 
     Args:
         datetime_obj: DateTime object for when to calculate position
@@ -38,28 +264,17 @@ def get_data_from_tle(
 
     Raises:
         ImportError: If ephem library is not available
-        Exception: If TLE data cannot be retrieved or parsed
     """
     if ephem is None:
         raise ImportError("ephem library is required for TLE calculations")
 
-    # Download TLE data for Fermi spacecraft (CATNR=33053) using new CelesTrak API
-    url = "https://celestrak.org/NORAD/elements/gp.php?CATNR=33053&FORMAT=tle"
-
     try:
-        data = urlopen(url)
-        tle_raw = data.read().decode("utf-8")
-
-        # The new API returns TLE data directly, split into lines
-        tle_lines = [line.strip() for line in tle_raw.split("\n") if line.strip()]
+        tle_obj = get_fermi_tle(datetime_obj)
 
-        if len(tle_lines) < 3:
-            print(f"Warning: Only got {len(tle_lines)} TLE lines: {tle_lines}")
+        if tle_obj is None:
+            logger.warning("No Fermi TLE available for %s", datetime_obj)
             return False, False, False
 
-        # TLE format: Line 0 = name, Line 1 = first data line, Line 2 = second data line
-        tle_obj = tle_lines
-
         # Create spacecraft instance from TLE data
         fermi = ephem.readtle(tle_obj[0], tle_obj[1], tle_obj[2])
 
@@ -125,7 +340,7 @@ def get_data_from_tle(
         return lon, lat, elevation
 
     except Exception as e:
-        print(f"Error retrieving TLE data: {str(e)}")
+        logger.warning("Error propagating Fermi TLE: %s", str(e))
         return False, False, False
 
 
@@ -228,6 +443,24 @@ def get_earth_sat_pos(
     if not all([lon, lat, elevation]):
         return False, False, False
 
+    return earth_from_position(datetime_obj, lon, lat, elevation)
+
+
+def earth_from_position(
+    datetime_obj: datetime, lon: float, lat: float, elevation: float
+) -> Tuple[float, float, float]:
+    """
+    Get Earth's position as seen from a known Fermi position.
+
+    Args:
+        datetime_obj: DateTime object for calculation
+        lon: Spacecraft longitude in degrees
+        lat: Spacecraft latitude in degrees
+        elevation: Spacecraft elevation in meters
+
+    Returns:
+        Tuple of (ra_geocenter, dec_geocenter, earth_radius_degrees)
+    """
     # Get geocenter coordinates
     ra_geocenter, dec_geocenter = get_geo_center(datetime_obj, lon, lat)
 
@@ -297,8 +530,10 @@ def calculate_fermi_gbm_coverage(datetime_obj: datetime) -> Optional[dict]:
     if not all([lon, lat, elevation]):
         return None
 
-    # Get Earth position as seen from spacecraft
-    ra_geocenter, dec_geocenter, earth_radius = get_earth_sat_pos(datetime_obj)
+    # Get Earth position as seen from spacecraft, reusing the position above
+    ra_geocenter, dec_geocenter, earth_radius = earth_from_position(
+        datetime_obj, lon, lat, elevation
+    )
 
     if not all([ra_geocenter, dec_geocenter, earth_radius]):
         return None
@@ -315,3 +550,27 @@ def calculate_fermi_gbm_coverage(datetime_obj: datetime) -> Optional[dict]:
         "spacecraft_lat": lat,
         "spacecraft_elevation": elevation,
     }
+
+
+# Spacecraft state per trigger time, shared by every GRB instrument overlay
+fermi_state_cache = TTLCache(3600, 1024)
+
+
+def get_fermi_state(datetime_obj: datetime) -> Optional[dict]:
+    """
+    Memoized calculate_fermi_gbm_coverage.
+
+    Failures (SAA, no TLE) are not cached, so a TLE loaded later is picked up.
+
+    Args:
+        datetime_obj: DateTime for coverage calculation
+
+    Returns:
+        The calculate_fermi_gbm_coverage dictionary, or None
+    """
+    state = fermi_state_cache.get(datetime_obj)
+    if state is None:
+        state = calculate_fermi_gbm_coverage(datetime_obj)
+        if state is not None:
+            fermi_state_cache.set(datetime_obj, state)
+    return state
@@ -1,51 +1,112 @@
 """DOI creation utilities for pointings and galaxy scores."""
 
 import json
-from typing import List, Dict, Any, Tuple, Optional
+import threading
+from typing import Callable, List, Dict, Any, Tuple, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from server import config
 from server.core.enums.pointingstatus import PointingStatus
 from server.db.models.pointing import Pointing
 from server.schemas.pointing import PointingSchema
 
+# Seconds to wait for each Zenodo request
+ZENODO_TIMEOUT = 60
 
-def create_doi(payload):
-    """Submit a dataset to Zenodo and publish it, returning the DOI."""
+ZENODO_DEPOSITIONS_URL = "https://zenodo.org/api/deposit/depositions"
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """Shared HTTP session so Zenodo calls reuse pooled keep-alive connections."""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _http_session = session
+        return _http_session
+
+
+def create_doi(
+    payload,
+    deposition_id: Optional[int] = None,
+    on_created: Optional[Callable[[int], None]] = None,
+):
+    """
+    Submit a dataset to Zenodo and publish it, returning the DOI.
+
+    on_created is called with the new deposition id as soon as Zenodo has
+    created it, so the caller can store it before a later step fails. Passing
+    that id back as deposition_id resumes the deposition instead of creating a
+    second one: a published deposition is only read back, and a draft gets
+    whichever of the file upload, metadata and publish steps it still needs.
+    """
     ACCESS_TOKEN = config.settings.ZENODO_ACCESS_KEY
     data = payload["data"]
     data_file = payload["data_file"]
     files = payload["files"]
     headers = payload["headers"]
+    session = get_http_session()
+
+    if deposition_id is None:
+        r = session.post(
+            ZENODO_DEPOSITIONS_URL,
+            params={"access_token": ACCESS_TOKEN},
+            json={},
+            headers=headers,
+            timeout=ZENODO_TIMEOUT,
+        )
 
-    r = requests.post(
-        "https://zenodo.org/api/deposit/depositions",
-        params={"access_token": ACCESS_TOKEN},
-        json={},
-        headers=headers,
-    )
-
-    if r.status_code == 403:
-        return None, None
+        if r.status_code == 403:
+            return None, None
+        r.raise_for_status()
 
-    d_id = r.json()["id"]
-    requests.post(
-        "https://zenodo.org/api/deposit/depositions/%s/files" % d_id,
-        params={"access_token": ACCESS_TOKEN},
-        data=data_file,
-        files=files,
-    )
-    requests.put(
-        "https://zenodo.org/api/deposit/depositions/%s" % d_id,
+        deposition = r.json()
+        d_id = deposition["id"]
+        if on_created is not None:
+            on_created(int(d_id))
+    else:
+        d_id = deposition_id
+        r = session.get(
+            "%s/%s" % (ZENODO_DEPOSITIONS_URL, d_id),
+            params={"access_token": ACCESS_TOKEN},
+            timeout=ZENODO_TIMEOUT,
+        )
+        r.raise_for_status()
+
+        deposition = r.json()
+        if deposition.get("submitted"):
+            return int(d_id), deposition.get("doi_url")
+
+    uploaded = {f.get("filename") for f in deposition.get("files") or []}
+    if data_file["name"] not in uploaded:
+        session.post(
+            "%s/%s/files" % (ZENODO_DEPOSITIONS_URL, d_id),
+            params={"access_token": ACCESS_TOKEN},
+            data=data_file,
+            files=files,
+            timeout=ZENODO_TIMEOUT,
+        ).raise_for_status()
+    session.put(
+        "%s/%s" % (ZENODO_DEPOSITIONS_URL, d_id),
         data=json.dumps(data),
         params={"access_token": ACCESS_TOKEN},
         headers=headers,
-    )
-    r = requests.post(
-        "https://zenodo.org/api/deposit/depositions/%s/actions/publish" % d_id,
+        timeout=ZENODO_TIMEOUT,
+    ).raise_for_status()
+    r = session.post(
+        "%s/%s/actions/publish" % (ZENODO_DEPOSITIONS_URL, d_id),
         params={"access_token": ACCESS_TOKEN},
+        timeout=ZENODO_TIMEOUT,
     )
+    r.raise_for_status()
 
     return_json = r.json()
     try:
@@ -61,6 +122,8 @@ def create_pointing_doi(
     graceid: str,
     creators: List[Dict[str, str]],
     instrument_names: List[str],
+    deposition_id: Optional[int] = None,
+    on_created: Optional[Callable[[int], None]] = None,
 ) -> Tuple[int, Optional[str]]:
     """
     Create a DOI for pointings.
@@ -70,6 +133,8 @@ def create_pointing_doi(
         graceid: Grace ID of the event
         creators: List of creator dictionaries
         instrument_names: List of instrument names
+        deposition_id: Zenodo deposition of an interrupted attempt to resume
+        on_created: Called with the Zenodo deposition id once it is created
 
     Returns:
         Tuple of (doi_id, doi_url)
@@ -119,7 +184,7 @@ def create_pointing_doi(
             "headers": {"Content-Type": "application/json"},
         }
 
-        d_id, url = create_doi(payload)
+        d_id, url = create_doi(payload, deposition_id, on_created)
         return d_id, url
 
     return None, None
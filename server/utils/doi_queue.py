@@ -0,0 +1,321 @@
+"""
+Background DOI minting queue.
+
+Endpoints enqueue a DOITask and return immediately with a pending DOI status.
+A worker loop started with the application claims due tasks, mints the DOI
+off the event loop and writes doi_id/doi_url back to the target pointings or
+galaxy list. Failed attempts are retried with exponential backoff.
+
+The same loop also deletes expired Idempotency-Key records every
+IDEMPOTENCY_PURGE_INTERVAL_SECONDS.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from server.db.database import db_session
+from server.db.models.doi_task import DOITask
+from server.db.models.gw_galaxy import GWGalaxyList, GWGalaxyEntry
+from server.db.models.pointing import Pointing
+from server.utils import idempotency
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+
+TARGET_POINTINGS = "pointings"
+TARGET_GALAXY_LIST = "galaxy_list"
+
+# Attempts before a task is marked failed
+DOI_TASK_MAX_ATTEMPTS = 6
+
+# Retry delay is DOI_RETRY_BASE_SECONDS * 2**(attempts - 1), capped
+DOI_RETRY_BASE_SECONDS = 30
+DOI_RETRY_MAX_SECONDS = 3600
+
+# A running task not updated for this long is assumed lost and is retried
+DOI_TASK_STALE_AFTER = timedelta(minutes=15)
+
+# Seconds between queue polls when the worker is not woken by an enqueue
+DOI_WORKER_POLL_SECONDS = 30
+
+# Tasks claimed per poll
+DOI_WORKER_BATCH_SIZE = 5
+
+_wakeup: Optional[asyncio.Event] = None
+
+
+def _enqueue(
+    target_type: str, target_ids: List[int], payload: dict, user_id: int, db: Session
+) -> DOITask:
+    now = datetime.now()
+    task = DOITask(
+        target_type=target_type,
+        target_ids=target_ids,
+        payload=payload,
+        status=STATUS_PENDING,
+        attempts=0,
+        next_attempt_at=now,
+        submitterid=user_id,
+        datecreated=now,
+        dateupdated=now,
+    )
+    db.add(task)
+    return task
+
+
+def enqueue_pointing_doi(
+    pointing_ids: List[int],
+    graceid: str,
+    creators: List[dict],
+    instrument_names: List[str],
+    user_id: int,
+    db: Session,
+) -> DOITask:
+    """Queue DOI minting for pointings. The caller commits, then calls notify_worker."""
+    return _enqueue(
+        TARGET_POINTINGS,
+        list(pointing_ids),
+        {
+            "graceid": graceid,
+            "creators": creators,
+            "instrument_names": instrument_names,
+        },
+        user_id,
+        db,
+    )
+
+
+def enqueue_galaxy_list_doi(
+    list_id: int,
+    graceid: str,
+    creators: List[dict],
+    reference: Optional[str],
+    alert_type: str,
+    user_id: int,
+    db: Session,
+) -> DOITask:
+    """Queue DOI minting for a galaxy list. The caller commits, then notifies."""
+    return _enqueue(
+        TARGET_GALAXY_LIST,
+        [list_id],
+        {
+            "graceid": graceid,
+            "creators": creators,
+            "reference": reference,
+            "alert_type": alert_type,
+        },
+        user_id,
+        db,
+    )
+
+
+def notify_worker() -> None:
+    """Wake the worker so a newly committed task is picked up without a poll delay."""
+    if _wakeup is not None:
+        _wakeup.set()
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Backoff delay before the next attempt after the given number of failures."""
+    seconds = DOI_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(seconds, DOI_RETRY_MAX_SECONDS))
+
+
+def due_tasks_query(db: Session, now: datetime, limit: int):
+    """
+    Pending tasks whose retry time has come, and running tasks gone stale.
+
+    Rows are locked with SKIP LOCKED so several API processes can run the
+    worker against one queue without minting the same DOI twice.
+    """
+    return (
+        db.query(DOITask)
+        .filter(
+            or_(
+                and_(
+                    DOITask.status == STATUS_PENDING,
+                    DOITask.next_attempt_at <= now,
+                ),
+                and_(
+                    DOITask.status == STATUS_RUNNING,
+                    DOITask.dateupdated < now - DOI_TASK_STALE_AFTER,
+                ),
+            )
+        )
+        .order_by(DOITask.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+
+
+def claim_due_tasks(db: Session, limit: int = DOI_WORKER_BATCH_SIZE) -> List[int]:
+    """Mark due tasks as running and return their ids."""
+    now = datetime.now()
+    tasks = due_tasks_query(db, now, limit).all()
+    for task in tasks:
+        task.status = STATUS_RUNNING
+        task.attempts += 1
+        task.dateupdated = now
+    db.commit()
+    return [task.id for task in tasks]
+
+
+def _mint(task: DOITask, db: Session):
+    """
+    Mint the DOI for a task, returning (doi_id, doi_url).
+
+    The Zenodo deposition id is committed to the task payload as soon as the
+    deposition exists. A retry, including a takeover of a stale running task,
+    resumes that deposition rather than creating and publishing a second one.
+    """
+    from server.utils.doi import create_pointing_doi, create_galaxy_score_doi
+
+    payload = task.payload
+    if task.target_type == TARGET_POINTINGS:
+
+        def save_deposition(deposition_id: int):
+            task.payload = {**payload, "deposition_id": deposition_id}
+            task.dateupdated = datetime.now()
+            db.commit()
+
+        points = db.query(Pointing).filter(Pointing.id.in_(task.target_ids)).all()
+        return create_pointing_doi(
+            points,
+            payload["graceid"],
+            payload["creators"],
+            payload["instrument_names"],
+            deposition_id=payload.get("deposition_id"),
+            on_created=save_deposition,
+        )
+
+    # Galaxy score DOIs are generated locally, so there is no remote state to resume
+    galaxies = (
+        db.query(GWGalaxyEntry).filter(GWGalaxyEntry.listid.in_(task.target_ids)).all()
+    )
+    return create_galaxy_score_doi(
+        galaxies,
+        payload["creators"],
+        payload["reference"],
+        payload["graceid"],
+        payload["alert_type"],
+    )
+
+
+def _apply_doi(task: DOITask, doi_id: int, doi_url: Optional[str], db: Session):
+    """Write the minted DOI to the task's target rows."""
+    if task.target_type == TARGET_POINTINGS:
+        model = Pointing
+    else:
+        model = GWGalaxyList
+    db.query(model).filter(model.id.in_(task.target_ids)).update(
+        {"doi_id": doi_id, "doi_url": doi_url}, synchronize_session=False
+    )
+
+
+def process_task(task_id: int) -> None:
+    """Run one claimed task, recording success, a retry or a permanent failure."""
+    with db_session() as db:
+        task = db.query(DOITask).filter(DOITask.id == task_id).first()
+        if task is None:
+            return
+
+        try:
+            doi_id, doi_url = _mint(task, db)
+        except Exception as e:
+            db.rollback()
+            task.last_error = str(e)
+            task.dateupdated = datetime.now()
+            if task.attempts >= DOI_TASK_MAX_ATTEMPTS:
+                task.status = STATUS_FAILED
+                logger.error(f"DOI task {task.id} failed permanently: {e}")
+            else:
+                task.status = STATUS_PENDING
+                task.next_attempt_at = datetime.now() + retry_delay(task.attempts)
+                logger.warning(
+                    f"DOI task {task.id} attempt {task.attempts} failed: {e}"
+                )
+            db.commit()
+            return
+
+        task.dateupdated = datetime.now()
+        if doi_id is None:
+            # Rejected by the DOI service (e.g. bad credentials); retrying won't help
+            task.status = STATUS_FAILED
+            task.last_error = "The DOI service did not accept the request"
+        else:
+            _apply_doi(task, doi_id, doi_url, db)
+            task.status = STATUS_COMPLETED
+            task.doi_id = doi_id
+            task.doi_url = doi_url
+        db.commit()
+
+
+def purge_idempotency_keys() -> int:
+    """Delete expired Idempotency-Key records, returning how many were deleted."""
+    with db_session() as db:
+        return idempotency.purge_expired_idempotency_keys(db)
+
+
+def process_due_tasks() -> int:
+    """Claim and run one batch of due tasks, returning how many were claimed."""
+    with db_session() as db:
+        task_ids = claim_due_tasks(db)
+    for task_id in task_ids:
+        process_task(task_id)
+    return len(task_ids)
+
+
+async def run_worker(stop: asyncio.Event) -> None:
+    """
+    Process the DOI queue until stop is set.
+
+    Minting uses blocking HTTP calls, so each batch runs in a worker thread
+    and never stalls the event loop serving requests.
+    """
+    global _wakeup
+    _wakeup = asyncio.Event()
+    next_purge = time.monotonic()
+
+    while not stop.is_set():
+        if time.monotonic() >= next_purge:
+            next_purge = (
+                time.monotonic() + idempotency.IDEMPOTENCY_PURGE_INTERVAL_SECONDS
+            )
+            try:
+                purged = await asyncio.to_thread(purge_idempotency_keys)
+                if purged:
+                    logger.info(f"Deleted {purged} expired idempotency keys")
+            except Exception as e:
+                logger.error(f"Idempotency key purge error: {e}")
+
+        try:
+            claimed = await asyncio.to_thread(process_due_tasks)
+        except Exception as e:
+            logger.error(f"DOI worker error: {e}")
+            claimed = 0
+
+        if claimed:
+            continue
+
+        _wakeup.clear()
+        stop_wait = asyncio.ensure_future(stop.wait())
+        wake_wait = asyncio.ensure_future(_wakeup.wait())
+        await asyncio.wait(
+            {stop_wait, wake_wait},
+            timeout=DOI_WORKER_POLL_SECONDS,
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        stop_wait.cancel()
+        wake_wait.cancel()
+
+    _wakeup = None
@@ -221,3 +221,32 @@ def by_chunk(items: List[Any], n: int) -> List[List[Any]]:
     for i in range(0, len(items), n):
         chunks.append(items[i : i + n])
     return chunks
+
+
+
+def parse_field_list(fields: str, allowed) -> List[str]:
+    """
+    Parse a sparse field selection parameter.
+
+    Args:
+        fields: Comma-separated list or JSON array of field names
+        allowed: Collection of selectable field names
+
+    Returns:
+        Requested field names in request order, without duplicates
+
+    Raises:
+        ValueError: if the list is empty or names an unknown field
+    """
+    if "[" in fields and "]" in fields:
+        field_list = [str(f).strip() for f in json.loads(fields)]
+    else:
+        field_list = [f.strip() for f in fields.split(",") if f.strip()]
+
+    invalid = [f for f in field_list if f not in allowed]
+    if invalid:
+        raise ValueError(f"Unknown fields: {', '.join(invalid)}")
+    if not field_list:
+        raise ValueError("At least one field is required")
+
+    return list(dict.fromkeys(field_list))
@@ -0,0 +1,244 @@
+"""
+In-memory columnar GLADE index for skymap-weighted galaxy selection.
+
+Galaxy ids, positions and distances are kept as NumPy arrays sorted by their
+HEALPix nested index at order 29. A nested pixel at any order covers one
+contiguous range of order-29 indices, so the galaxies in a skymap pixel are a
+slice found with searchsorted. The arrays are saved as .npy files in
+GLADE_INDEX_DIR and memory-mapped, so worker processes share one copy through
+the page cache.
+"""
+
+import os
+import threading
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from server.config import settings
+
+# Order of the stored nested indices; any skymap order is a right shift of it
+GLADE_INDEX_ORDER = 29
+
+GLADE_INDEX_COLUMNS = ("id", "pgc_number", "ra", "dec", "distance", "ipix")
+
+
+class GladeIndex:
+    """Columnar GLADE galaxies, sorted by order-29 nested HEALPix index."""
+
+    def __init__(self, arrays: dict):
+        self.id = arrays["id"]
+        self.pgc_number = arrays["pgc_number"]
+        self.ra = arrays["ra"]
+        self.dec = arrays["dec"]
+        self.distance = arrays["distance"]
+        self.ipix = arrays["ipix"]
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    @classmethod
+    def load(cls, directory: str) -> "GladeIndex":
+        """Memory-map a snapshot written by save."""
+        return cls(
+            {
+                column: np.load(os.path.join(directory, f"{column}.npy"), mmap_mode="r")
+                for column in GLADE_INDEX_COLUMNS
+            }
+        )
+
+    @staticmethod
+    def exists(directory: str) -> bool:
+        """True if directory holds a complete snapshot."""
+        return all(
+            os.path.exists(os.path.join(directory, f"{column}.npy"))
+            for column in GLADE_INDEX_COLUMNS
+        )
+
+    @staticmethod
+    def save(directory: str, arrays: dict) -> None:
+        """Write a snapshot, sorting the galaxies by nested index."""
+        os.makedirs(directory, exist_ok=True)
+        order = np.argsort(arrays["ipix"], kind="stable")
+        # Write every column to a file private to this process, then rename
+        # them into place, so readers never map a partial file and concurrent
+        # builders cannot interleave their writes
+        paths = {}
+        for column in GLADE_INDEX_COLUMNS:
+            tmp_path = os.path.join(directory, f"{column}.{os.getpid()}.tmp.npy")
+            np.save(tmp_path, np.ascontiguousarray(arrays[column][order]))
+            paths[tmp_path] = os.path.join(directory, f"{column}.npy")
+        for tmp_path, path in paths.items():
+            os.replace(tmp_path, path)
+
+    @classmethod
+    def build(cls, db, directory: str) -> "GladeIndex":
+        """Snapshot every GLADE galaxy with a distance from the database."""
+        import healpy as hp
+        from geoalchemy2 import Geometry
+        from sqlalchemy import cast, func, select
+        from server.db.models.glade import Glade2P3
+
+        point = cast(Glade2P3.position, Geometry(srid=4326))
+        rows = db.execute(
+            select(
+                Glade2P3.id,
+                Glade2P3.pgc_number,
+                func.ST_X(point),
+                func.ST_Y(point),
+                Glade2P3.distance,
+            ).where(Glade2P3.distance > 0, Glade2P3.position.isnot(None))
+        ).all()
+
+        columns = list(zip(*rows)) if rows else [[]] * 5
+        arrays = {
+            "id": np.asarray(columns[0], dtype=np.int64),
+            "pgc_number": np.asarray(
+                [-1 if v is None else v for v in columns[1]], dtype=np.int64
+            ),
+            # Geography longitudes are -180..180
+            "ra": np.asarray(columns[2], dtype=np.float64) % 360.0,
+            "dec": np.asarray(columns[3], dtype=np.float64),
+            "distance": np.asarray(columns[4], dtype=np.float32),
+        }
+        arrays["ipix"] = hp.ang2pix(
+            2**GLADE_INDEX_ORDER, arrays["ra"], arrays["dec"], nest=True, lonlat=True
+        ).astype(np.int64)
+
+        cls.save(directory, arrays)
+        return cls.load(directory)
+
+    def in_pixels(
+        self, nest_pixels: np.ndarray, order: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Positions (into the index arrays) of the galaxies in the given nested
+        pixels at order, with the pixel each falls in.
+
+        Returns:
+            Tuple of (galaxy positions, index into nest_pixels per galaxy)
+        """
+        shift = 2 * (GLADE_INDEX_ORDER - order)
+        nest_pixels = np.asarray(nest_pixels, dtype=np.int64)
+        starts = np.searchsorted(self.ipix, nest_pixels << shift)
+        ends = np.searchsorted(self.ipix, (nest_pixels + 1) << shift)
+        counts = ends - starts
+        # Concatenate the [start, end) ranges without a Python loop
+        which = np.repeat(np.arange(len(nest_pixels)), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+        return starts[which] + offsets, which
+
+    def top_galaxies(
+        self, layers: dict, limit: int, credible_level: float = 0.9
+    ) -> List[dict]:
+        """
+        Rank the galaxies in a skymap's credible region by probability.
+
+        With distance layers the score is the 3D probability density
+        prob * DISTNORM * N(distance; DISTMU, DISTSIGMA); otherwise it is the
+        2D pixel probability. Scores are normalised over the region.
+
+        Args:
+            layers: read_skymap_layers output
+            limit: Number of galaxies to return
+            credible_level: Credible region to select galaxies from
+
+        Returns:
+            Galaxies by descending probability
+        """
+        import healpy as hp
+        from server.utils.skymap import sorted_cumulative
+
+        prob = layers["prob"]
+        nside = hp.npix2nside(len(prob))
+        order, cumulative = sorted_cumulative(prob)
+        count = min(int(np.searchsorted(cumulative, credible_level)) + 1, len(order))
+        region = order[:count].astype(np.int64)
+
+        galaxies, which = self.in_pixels(
+            hp.ring2nest(nside, region), int(np.log2(nside))
+        )
+        if len(galaxies) == 0:
+            return []
+        pixels = region[which]
+
+        score = prob[pixels]
+        if "distmu" in layers:
+            mu = layers["distmu"][pixels]
+            sigma = layers["distsigma"][pixels]
+            norm = layers["distnorm"][pixels]
+            distance = self.distance[galaxies].astype(np.float64)
+            valid = np.isfinite(mu) & np.isfinite(sigma) & (sigma > 0)
+            density = np.zeros_like(score)
+            density[valid] = (
+                norm[valid]
+                * np.exp(-0.5 * ((distance[valid] - mu[valid]) / sigma[valid]) ** 2)
+                / (sigma[valid] * np.sqrt(2 * np.pi))
+            )
+            score = score * density
+
+        total = score.sum()
+        if total <= 0:
+            return []
+        top = np.argsort(score)[::-1][:limit]
+        top = top[score[top] > 0]
+        selected = galaxies[top]
+        return [
+            {
+                "id": int(galaxy_id),
+                "pgc_number": int(pgc),
+                "ra": float(ra),
+                "dec": float(dec),
+                "distance": float(distance),
+                "probability": float(p),
+            }
+            for galaxy_id, pgc, ra, dec, distance, p in zip(
+                self.id[selected],
+                self.pgc_number[selected],
+                self.ra[selected],
+                self.dec[selected],
+                self.distance[selected],
+                score[top] / total,
+            )
+        ]
+
+
+_glade_index: Optional[GladeIndex] = None
+_glade_index_lock = threading.Lock()
+
+
+def get_glade_index() -> Optional[GladeIndex]:
+    """
+    The process-wide GLADE index, memory-mapped from GLADE_INDEX_DIR, or None
+    when no snapshot has been built there. Requests never build the snapshot:
+    reading all of GLADE is a job for `python -m server.utils.glade_index`.
+    """
+    global _glade_index
+    if _glade_index is None:
+        with _glade_index_lock:
+            directory = settings.GLADE_INDEX_DIR
+            if _glade_index is None and directory and GladeIndex.exists(directory):
+                _glade_index = GladeIndex.load(directory)
+    return _glade_index
+
+
+def reload_glade_index() -> None:
+    """Drop the loaded index, so the next request maps the current snapshot."""
+    global _glade_index
+    with _glade_index_lock:
+        _glade_index = None
+
+
+if __name__ == "__main__":
+    from server.db.database import db_session
+
+    if not settings.GLADE_INDEX_DIR:
+        raise SystemExit("Set GLADE_INDEX_DIR to the snapshot directory")
+
+    with db_session() as db:
+        index = GladeIndex.build(db, settings.GLADE_INDEX_DIR)
+    print(
+        f"GLADE index with {len(index)} galaxies written to {settings.GLADE_INDEX_DIR}"
+    )
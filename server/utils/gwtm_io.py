@@ -3,6 +3,9 @@ import json
 import os
 import re
 import tempfile
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
 
 
 def _get_swift_conn(config):
@@ -123,6 +126,7 @@ def download_gwtm_file(filename, source="s3", config=None, decode=True):
     # download it directly rather than routing through the storage backend.
     if filename and filename.startswith(("http://", "https://")):
         import requests
+
         response = requests.get(filename, timeout=60)
         response.raise_for_status()
         content = response.content
@@ -177,6 +181,97 @@ def download_gwtm_file(filename, source="s3", config=None, decode=True):
         raise Exception(f"Error reading {source} file {filename}: {str(e)}")
 
 
+def get_gwtm_file_info(filename, source="s3", config=None):
+    """
+    Get the ETag and last-modified time of a stored file without downloading it.
+
+    Args:
+        filename: File path/name to look up
+        source: Storage source ('s3', 'abfs', 'swift', or 'local')
+        config: Configuration object with credentials
+
+    Returns:
+        Dict with 'etag' (as reported by the backend) and 'last_modified'
+        (datetime or None), or None if the file or its metadata is unavailable
+    """
+    try:
+        if source == "local":
+            stat = os.stat(_local_path(_get_local_dir(config), filename))
+            return {
+                "etag": f"{stat.st_mtime_ns:x}-{stat.st_size:x}",
+                "last_modified": datetime.fromtimestamp(stat.st_mtime, timezone.utc),
+            }
+
+        if source == "swift":
+            conn = _get_swift_conn(config)
+            headers = conn.head_object(config.OS_CONTAINER_NAME, filename)
+            last_modified = headers.get("last-modified")
+            return {
+                "etag": headers["etag"],
+                "last_modified": (
+                    parsedate_to_datetime(last_modified) if last_modified else None
+                ),
+            }
+
+        fs = _get_fs(source=source, config=config)
+        if source == "s3" and f"{config.AWS_BUCKET}/" not in filename:
+            filename = f"{config.AWS_BUCKET}/{filename}"
+        info = fs.info(filename)
+    except Exception:
+        return None
+
+    # s3fs reports ETag/LastModified, adlfs reports etag/last_modified
+    etag = info.get("ETag") or info.get("etag")
+    if not etag:
+        return None
+    return {
+        "etag": etag,
+        "last_modified": info.get("LastModified") or info.get("last_modified"),
+    }
+
+
+def presign_gwtm_file(filename, source="s3", config=None, expires=300):
+    """
+    Create a short-lived URL that downloads a stored file directly.
+
+    Args:
+        filename: File path/name to sign
+        source: Storage source ('s3', 'abfs', 'swift', or 'local')
+        config: Configuration object with credentials
+        expires: Lifetime of the URL in seconds
+
+    Returns:
+        An S3 pre-signed URL, Azure SAS URL or Swift TempURL, or None when the
+        backend cannot sign (local storage, missing keys or signing errors) and
+        the caller should stream the file itself
+    """
+    if _is_local(source, config):
+        return None
+
+    try:
+        if source == "swift":
+            from swiftclient.utils import generate_temp_url
+
+            if not config.OS_TEMP_URL_KEY or not config.OS_STORAGE_URL:
+                return None
+            storage_url = urlparse(config.OS_STORAGE_URL)
+            path = (
+                f"{storage_url.path.rstrip('/')}/{config.OS_CONTAINER_NAME}/{filename}"
+            )
+            signed = generate_temp_url(path, expires, config.OS_TEMP_URL_KEY, "GET")
+            return f"{storage_url.scheme}://{storage_url.netloc}{signed}"
+
+        fs = _get_fs(source=source, config=config)
+        if source == "abfs":
+            # adlfs returns the bare blob URL unless asked for a SAS token
+            return fs.url(filename, expires=expires, generate_sas=True)
+        if source == "s3" and f"{config.AWS_BUCKET}/" not in filename:
+            filename = f"{config.AWS_BUCKET}/{filename}"
+        return fs.url(filename, expires=expires)
+    except Exception:
+        return None
+
+
 def upload_gwtm_file(content, filename, source="s3", config=None):
     """
     Upload a file to GWTM storage.
@@ -409,6 +504,61 @@ def set_cached_file(key, contents, config):
         return False
 
 
+def get_cached_bytes(key, config):
+    """
+    Get a cached binary file from storage.
+
+    Args:
+        key: Cache key
+        config: Configuration object with credentials
+
+    Returns:
+        File content as bytes, or None if not found
+    """
+    source = config.STORAGE_BUCKET_SOURCE
+
+    # Local filesystem cache
+    if _is_local(source, config):
+        cache_file = os.path.join(_get_local_dir(config), "cache", key.split("/")[-1])
+        if os.path.exists(cache_file):
+            with open(cache_file, "rb") as f:
+                return f.read()
+        return None
+
+    try:
+        return download_gwtm_file(key, source, config, decode=False)
+    except Exception:
+        return None
+
+
+def set_cached_bytes(key, contents, config):
+    """
+    Set a cached binary file in storage.
+
+    Args:
+        key: Cache key
+        contents: Bytes to cache
+        config: Configuration object with credentials
+
+    Returns:
+        True if successful
+    """
+    source = config.STORAGE_BUCKET_SOURCE
+
+    # Local filesystem cache
+    if _is_local(source, config):
+        cache_dir = os.path.join(_get_local_dir(config), "cache")
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(os.path.join(cache_dir, key.split("/")[-1]), "wb") as f:
+            f.write(contents)
+        return True
+
+    try:
+        return upload_gwtm_file(contents, key, source, config)
+    except Exception:
+        return False
+
+
 def download_to_temp_file(filename, source="s3", config=None):
     """
     Download a file to a temporary file and return the path.
@@ -0,0 +1,110 @@
+"""HTTP validators (ETag) and conditional request helpers."""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Optional
+
+from fastapi import Request
+from fastapi.responses import RedirectResponse, Response
+
+from server.config import settings
+from server.utils.gwtm_io import get_gwtm_file_info, presign_gwtm_file
+
+# For responses addressed by an immutable version (e.g. an alert id)
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def strong_etag(content: bytes) -> str:
+    """Strong ETag for a response body, derived from its bytes."""
+    return f'"{hashlib.sha256(content).hexdigest()}"'
+
+
+def version_etag(*parts) -> str:
+    """Strong ETag for content fully determined by the given version parts."""
+    return strong_etag("|".join(str(part) for part in parts).encode())
+
+
+def quote_etag(value: str) -> str:
+    """Normalise a storage backend ETag (quoted or not) to a strong ETag."""
+    value = value[2:] if value.startswith("W/") else value
+    return '"' + value.strip('"') + '"'
+
+
+def http_date(value: datetime) -> str:
+    """Format a datetime for Last-Modified. Naive datetimes are taken as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def cache_headers(
+    etag: str,
+    last_modified: Optional[datetime] = None,
+    cache_control: Optional[str] = None,
+) -> dict:
+    """Validator and Cache-Control headers for a cacheable response."""
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    return headers
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match lists the given ETag (or is *)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [tag.strip() for tag in header.split(",")]
+    # Weak comparison, as RFC 9110 specifies for If-None-Match
+    bare = etag[2:] if etag.startswith("W/") else etag
+    return any(
+        tag == "*" or (tag[2:] if tag.startswith("W/") else tag) == bare
+        for tag in candidates
+    )
+
+
+def not_modified(etag: str, cache_control: Optional[str] = None) -> Response:
+    """Empty 304 response repeating the validators the client already holds."""
+    headers = {"ETag": etag}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    return Response(status_code=304, headers=headers)
+
+
+def storage_redirect(
+    filename: str, redirect: Optional[bool] = None, check_exists: bool = True
+) -> Optional[RedirectResponse]:
+    """
+    302 to a pre-signed storage URL for filename, so the bytes bypass the API.
+
+    redirect overrides the STORAGE_REDIRECT_DOWNLOADS setting. Returns None
+    when redirects are off, the backend cannot sign a URL (e.g. local
+    storage) or the file does not exist, in which case the caller streams the
+    file as before and reports a missing one itself. Signing does not look at
+    storage, so the file is checked with a HEAD request unless the caller has
+    already done so (check_exists=False).
+    """
+    if redirect is None:
+        redirect = settings.STORAGE_REDIRECT_DOWNLOADS
+    if not redirect:
+        return None
+    url = presign_gwtm_file(
+        filename,
+        source=settings.STORAGE_BUCKET_SOURCE,
+        config=settings,
+        expires=settings.STORAGE_PRESIGN_EXPIRES,
+    )
+    if url is None:
+        return None
+    if check_exists and (
+        get_gwtm_file_info(
+            filename, source=settings.STORAGE_BUCKET_SOURCE, config=settings
+        )
+        is None
+    ):
+        return None
+    # The signed URL expires, so the redirect itself must not be cached
+    return RedirectResponse(url, status_code=302, headers={"Cache-Control": "no-store"})
@@ -0,0 +1,182 @@
+"""Idempotency-Key support for retry-safe submission endpoints."""
+
+import hashlib
+from datetime import datetime, timedelta
+from typing import Optional
+
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from server.db.models.idempotency_key import IdempotencyKey
+from server.utils.error_handling import validation_exception, conflict_exception
+
+# How long a stored result is replayed for before the key can be reused
+IDEMPOTENCY_KEY_TTL = timedelta(hours=24)
+
+# How long a processing claim blocks retries. A claim older than this belongs
+# to a worker that died before completing or releasing it, and is taken over.
+# It must exceed the longest time a submission can take.
+IDEMPOTENCY_PROCESSING_TIMEOUT = timedelta(minutes=10)
+
+# How often the background worker deletes expired keys, and how many rows
+# each of its DELETE statements removes
+IDEMPOTENCY_PURGE_INTERVAL_SECONDS = 3600
+IDEMPOTENCY_PURGE_BATCH_SIZE = 1000
+
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+STATUS_PROCESSING = "processing"
+STATUS_COMPLETED = "completed"
+
+
+def request_fingerprint(request: BaseModel) -> str:
+    """Hash a validated request body so a reused key can be checked against it."""
+    return hashlib.sha256(request.model_dump_json().encode()).hexdigest()
+
+
+def claim_idempotency_key(
+    key: str, endpoint: str, user_id: int, fingerprint: str, db: Session
+) -> Optional[dict]:
+    """
+    Look up or claim an idempotency key for a user and endpoint.
+
+    A processing claim older than IDEMPOTENCY_PROCESSING_TIMEOUT is taken
+    over, so a crashed worker does not block retries until the key expires.
+
+    Returns:
+        The stored response if this key already completed with the same
+        payload, otherwise None after committing a processing claim
+
+    Raises:
+        HTTPException: if the key is reused with a different payload, or the
+        original request is still being processed
+    """
+    if not key or len(key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+        raise validation_exception(
+            message="Invalid Idempotency-Key",
+            errors=[
+                f"Idempotency-Key must be 1-{MAX_IDEMPOTENCY_KEY_LENGTH} characters"
+            ],
+        )
+
+    record = (
+        db.query(IdempotencyKey)
+        .filter(
+            IdempotencyKey.userid == user_id,
+            IdempotencyKey.endpoint == endpoint,
+            IdempotencyKey.key == key,
+        )
+        .first()
+    )
+
+    if record and record.datecreated < datetime.now() - IDEMPOTENCY_KEY_TTL:
+        db.delete(record)
+        db.commit()
+        record = None
+
+    if record:
+        if record.request_hash != fingerprint:
+            raise validation_exception(
+                message="Idempotency-Key reused with a different request",
+                errors=["Use a new Idempotency-Key for a different payload"],
+            )
+        if record.status == STATUS_COMPLETED:
+            return record.response
+        if record.datecreated >= datetime.now() - IDEMPOTENCY_PROCESSING_TIMEOUT:
+            raise conflict_exception(
+                "A request with this Idempotency-Key is still being processed"
+            )
+        # Renew the abandoned claim. Matching on its claim time lets only one
+        # of several concurrent retries win it.
+        taken = (
+            db.query(IdempotencyKey)
+            .filter(
+                IdempotencyKey.id == record.id,
+                IdempotencyKey.status == STATUS_PROCESSING,
+                IdempotencyKey.datecreated == record.datecreated,
+            )
+            .update({"datecreated": datetime.now()}, synchronize_session=False)
+        )
+        db.commit()
+        if not taken:
+            raise conflict_exception(
+                "A request with this Idempotency-Key is still being processed"
+            )
+        return None
+
+    db.add(
+        IdempotencyKey(
+            userid=user_id,
+            endpoint=endpoint,
+            key=key,
+            request_hash=fingerprint,
+            status=STATUS_PROCESSING,
+            datecreated=datetime.now(),
+        )
+    )
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent request claimed the same key first
+        db.rollback()
+        raise conflict_exception(
+            "A request with this Idempotency-Key is still being processed"
+        )
+    return None
+
+
+def store_idempotent_response(
+    key: str, endpoint: str, user_id: int, response: dict, db: Session
+) -> None:
+    """Record the response for a claimed key. The caller commits."""
+    db.query(IdempotencyKey).filter(
+        IdempotencyKey.userid == user_id,
+        IdempotencyKey.endpoint == endpoint,
+        IdempotencyKey.key == key,
+    ).update(
+        {"status": STATUS_COMPLETED, "response": response},
+        synchronize_session=False,
+    )
+
+
+def release_idempotency_key(key: str, endpoint: str, user_id: int, db: Session):
+    """Drop an unfinished claim after a failure so the client can retry."""
+    db.rollback()
+    db.query(IdempotencyKey).filter(
+        IdempotencyKey.userid == user_id,
+        IdempotencyKey.endpoint == endpoint,
+        IdempotencyKey.key == key,
+        IdempotencyKey.status == STATUS_PROCESSING,
+    ).delete(synchronize_session=False)
+    db.commit()
+
+
+def purge_expired_idempotency_keys(
+    db: Session, batch_size: int = IDEMPOTENCY_PURGE_BATCH_SIZE
+) -> int:
+    """
+    Delete keys older than IDEMPOTENCY_KEY_TTL, returning how many were deleted.
+
+    Rows are deleted and committed in batches so each statement holds its
+    locks briefly. Claims that old are long past IDEMPOTENCY_PROCESSING_TIMEOUT
+    and would be replaced on their next use anyway.
+    """
+    cutoff = datetime.now() - IDEMPOTENCY_KEY_TTL
+    deleted = 0
+    while True:
+        expired = (
+            select(IdempotencyKey.id)
+            .where(IdempotencyKey.datecreated < cutoff)
+            .limit(batch_size)
+        )
+        count = (
+            db.query(IdempotencyKey)
+            .filter(IdempotencyKey.id.in_(expired.scalar_subquery()))
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        deleted += count
+        if count < batch_size:
+            return deleted
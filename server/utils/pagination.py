@@ -0,0 +1,59 @@
+"""Keyset (cursor) pagination helpers."""
+
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import and_, or_, tuple_
+
+
+def encode_cursor(datecreated: Optional[datetime], row_id: int) -> str:
+    """Encode the (datecreated, id) of the last row served as an opaque token."""
+    raw = json.dumps([datecreated.isoformat() if datecreated else None, row_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[Optional[datetime], int]:
+    """
+    Decode a token produced by encode_cursor.
+
+    Raises:
+        ValueError: if the token is malformed
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        date_str, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if date_str is None:
+            return None, int(row_id)
+        return datetime.fromisoformat(date_str), int(row_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def keyset_order(date_column, id_column):
+    """
+    ORDER BY clauses for keyset pagination, newest first.
+
+    Rows without a date sort after every dated row, ordered by id, so they can
+    be encoded in a cursor like any other row.
+    """
+    return date_column.desc().nullslast(), id_column.desc()
+
+
+def keyset_after(date_column, id_column, cursor: Tuple[Optional[datetime], int]):
+    """
+    Predicate for rows after the cursor in keyset_order.
+
+    The row-value comparison lets PostgreSQL seek with a composite index on
+    (date_column DESC NULLS LAST, id_column DESC) instead of scanning and
+    discarding an OFFSET.
+    """
+    after_date, after_id = cursor
+    if after_date is None:
+        # Already among the undated rows at the end
+        return and_(date_column.is_(None), id_column < after_id)
+    return or_(
+        tuple_(date_column, id_column) < tuple_(after_date, after_id),
+        date_column.is_(None),
+    )
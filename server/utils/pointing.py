@@ -3,21 +3,39 @@ Pointing business logic utilities.
 Contains logic that requires database access and can't be moved to Pydantic validators.
 """
 
+import geoalchemy2.shape
+from sqlalchemy import insert, or_
 from sqlalchemy.orm import Session
-from typing import List, Optional, Tuple, TYPE_CHECKING
+from collections import Counter
+from typing import FrozenSet, Iterable, List, Optional, Set, Tuple, TYPE_CHECKING
 from datetime import datetime
 
 if TYPE_CHECKING:
     from server.schemas.pointing import PointingCreate
 
-from server.db.models.pointing import Pointing
+from server.db.models.pointing import Pointing, PointingCount
+from server.db.models.pointing_event import PointingEvent
 from server.db.models.instrument import Instrument
 from server.db.models.gw_alert import GWAlert
 from server.db.models.users import Users
 from server.db.models.doi_author import DOIAuthor
 from server.core.enums.pointingstatus import PointingStatus as pointing_status_enum
+from server.core.enums.bandpass import Bandpass as bandpass_enum
+from server.core.enums.depthunit import DepthUnit as depth_unit_enum
 from server.utils.error_handling import validation_exception, not_found_exception
-from server.utils.function import pointing_crossmatch, create_pointing_doi
+from server.utils.function import (
+    pointing_crossmatch,
+    sanatize_pointing,
+    float_or_none,
+)
+from server.utils.cache import TTLCache
+from server.utils import doi_queue
+
+# Name filter -> id set lookups, shared by pointing queries
+name_lookup_cache = TTLCache(ttl_seconds=300, maxsize=2048)
+
+# Rows per multi-row INSERT ... RETURNING statement when bulk inserting pointings
+BULK_INSERT_BATCH_SIZE = 1000
 
 
 def validate_graceid(graceid: str, db: Session) -> str:
@@ -104,6 +122,224 @@ def create_pointing_from_schema(
     return pointing
 
 
+def _coerce_enum(value, enum_cls, field: str):
+    """Coerce an enum name, value or member to the enum member, or raise."""
+    if value is None or isinstance(value, enum_cls):
+        return value
+    try:
+        if isinstance(value, int):
+            return enum_cls(value)
+        return enum_cls[str(value)]
+    except (KeyError, ValueError):
+        raise validation_exception(
+            message=f"Invalid {field}",
+            errors=[
+                f"'{value}' is not a valid {field}. Valid values are: {[e.name for e in enum_cls]}"
+            ],
+        )
+
+
+def pointing_row_from_schema(
+    pointing_data: "PointingCreate", user_id: int, instrument_id: int
+) -> dict:
+    """
+    Build a pointing insert row from schema data.
+
+    Enum fields are validated here so a bad value is reported against its own
+    row instead of failing the whole bulk INSERT.
+    """
+    return {
+        "position": pointing_data.position,
+        "depth": pointing_data.depth,
+        "depth_err": pointing_data.depth_err,
+        "depth_unit": _coerce_enum(
+            pointing_data.depth_unit, depth_unit_enum, "depth_unit"
+        ),
+        "status": _coerce_enum(
+            pointing_data.status or pointing_status_enum.completed,
+            pointing_status_enum,
+            "status",
+        ),
+        "band": _coerce_enum(pointing_data.band, bandpass_enum, "band"),
+        "central_wave": pointing_data.central_wave,
+        "bandwidth": pointing_data.bandwidth,
+        "instrumentid": instrument_id,
+        "pos_angle": pointing_data.pos_angle,
+        "time": pointing_data.time,
+        "submitterid": user_id,
+        "datecreated": datetime.now(),
+    }
+
+
+def pointing_duplicate_key(
+    status, instrumentid, band, time, pos_angle, position: str
+) -> tuple:
+    """Hashable key matching the exact comparison made by pointing_crossmatch."""
+    return (
+        status,
+        int(instrumentid),
+        band,
+        time,
+        float_or_none(pos_angle),
+        sanatize_pointing(position),
+    )
+
+
+def get_existing_pointing_keys(graceid: str, db: Session) -> Set[tuple]:
+    """
+    Get the duplicate keys of all pointings already submitted for a graceid.
+
+    Only the compared columns are loaded, and the keys go into a set so each
+    submitted pointing is checked in constant time rather than against every
+    existing pointing.
+    """
+    rows = (
+        db.query(
+            Pointing.status,
+            Pointing.instrumentid,
+            Pointing.band,
+            Pointing.time,
+            Pointing.pos_angle,
+            Pointing.position,
+        )
+        .filter(
+            Pointing.id == PointingEvent.pointingid,
+            PointingEvent.graceid == graceid,
+        )
+        .all()
+    )
+    return {
+        pointing_duplicate_key(
+            r.status,
+            r.instrumentid,
+            r.band,
+            r.time,
+            r.pos_angle,
+            str(geoalchemy2.shape.to_shape(r.position)),
+        )
+        for r in rows
+        if r.instrumentid is not None
+    }
+
+
+def bulk_insert_pointings(rows: List[dict], graceid: str, db: Session) -> List[int]:
+    """
+    Insert pointing rows and their pointing_event links in batches.
+
+    Each batch is one multi-row INSERT ... RETURNING for the pointings followed
+    by one executemany for pointing_event, instead of a flush per ORM object.
+
+    Returns:
+        The new pointing ids, in the same order as rows
+    """
+    pointing_ids = []
+    for start in range(0, len(rows), BULK_INSERT_BATCH_SIZE):
+        batch = rows[start : start + BULK_INSERT_BATCH_SIZE]
+        result = db.execute(
+            insert(Pointing).returning(Pointing.id, sort_by_parameter_order=True),
+            batch,
+        )
+        batch_ids = list(result.scalars())
+        db.execute(
+            insert(PointingEvent),
+            [{"pointingid": pid, "graceid": graceid} for pid in batch_ids],
+        )
+        pointing_ids.extend(batch_ids)
+
+    PointingCount.apply(
+        Counter((graceid, row["instrumentid"], row["status"]) for row in rows), db
+    )
+    return pointing_ids
+
+
+def submit_pointings(
+    pointings_to_process: List["PointingCreate"],
+    graceid: str,
+    user_id: int,
+    instruments_dict: dict,
+    existing_keys: Set[tuple],
+    db: Session,
+) -> Tuple[List[int], List]:
+    """
+    Apply planned pointing updates and bulk insert new pointings for an event.
+
+    The caller commits. Entries that fail validation or duplicate an existing
+    pointing are skipped and reported in the ERRORS format.
+
+    Returns:
+        Tuple of (pointing_ids in submission order, errors)
+    """
+    errors = []
+
+    # Planned pointing updates are applied through the ORM; new pointings are
+    # collected as rows and bulk inserted. Each accepted entry keeps its slot
+    # so pointing_ids are returned in submission order.
+    updated_points = []
+    new_rows = []
+    slots = []
+
+    for pointing_data in pointings_to_process:
+        try:
+            # Check if this is an update to a planned pointing
+            if hasattr(pointing_data, "id") and pointing_data.id:
+                # Handle planned pointing update
+                pointing_obj = handle_planned_pointing_update(
+                    pointing_data, user_id, db
+                )
+                slots.append(("updated", len(updated_points)))
+                updated_points.append(pointing_obj)
+            else:
+                # Validate and resolve instrument reference
+                instrument_id = validate_instrument_reference(
+                    pointing_data, instruments_dict
+                )
+
+                # Build the new pointing row
+                row = pointing_row_from_schema(pointing_data, user_id, instrument_id)
+
+                # Check for duplicates
+                key = pointing_duplicate_key(
+                    row["status"],
+                    instrument_id,
+                    row["band"],
+                    row["time"],
+                    row["pos_angle"],
+                    row["position"],
+                )
+                if key in existing_keys:
+                    errors.append(
+                        [
+                            f"Object: {pointing_data.dict()}",
+                            ["Pointing already submitted"],
+                        ]
+                    )
+                    continue
+
+                slots.append(("new", len(new_rows)))
+                new_rows.append(row)
+
+        except Exception as e:
+            errors.append([f"Object: {pointing_data.model_dump()}", [str(e)]])
+
+    # Insert new pointings and their pointing events in batches
+    new_ids = bulk_insert_pointings(new_rows, graceid, db)
+
+    # Updated planned pointings are linked to this event as well
+    count_deltas = PointingCount.status_change_deltas(
+        updated_points, pointing_status_enum.planned, db
+    )
+    for p in updated_points:
+        db.add(PointingEvent(pointingid=p.id, graceid=graceid))
+        count_deltas[(graceid, p.instrumentid, p.status)] += 1
+    PointingCount.apply(count_deltas, db)
+
+    pointing_ids = [
+        updated_points[i].id if kind == "updated" else new_ids[i] for kind, i in slots
+    ]
+
+    return pointing_ids, errors
+
+
 def handle_planned_pointing_update(
     pointing_data, user_id: int, db: Session
 ) -> Optional[Pointing]:
@@ -168,24 +404,85 @@ def prepare_doi_creators(
         return [{"name": f"{user.firstname} {user.lastname}", "affiliation": ""}]
 
 
-def create_doi_for_pointings(
-    pointings: List[Pointing], graceid: str, creators: List[dict], db: Session
-) -> Tuple[Optional[int], Optional[str]]:
-    """Create a DOI for a list of pointings."""
-    if not pointings:
-        return None, None
+def queue_doi_for_pointings(
+    pointings: List[Pointing],
+    graceid: str,
+    creators: List[dict],
+    user_id: int,
+    db: Session,
+):
+    """
+    Queue out-of-band DOI minting for a list of pointings.
 
-    # Get instruments for the pointings
+    The caller commits and then calls doi_queue.notify_worker(); the worker
+    fills in doi_id/doi_url on the pointings once the DOI is minted.
+    """
     insts = (
-        db.query(Instrument)
+        db.query(Instrument.instrument_name)
         .filter(Instrument.id.in_([p.instrumentid for p in pointings]))
         .all()
     )
     inst_set = list(set([i.instrument_name for i in insts]))
 
-    # Get normalized graceid
     normalized_gid = GWAlert.alternatefromgraceid(graceid, db)
 
-    # Create the DOI
-    result = create_pointing_doi(pointings, normalized_gid, creators, inst_set)
-    return result
+    return doi_queue.enqueue_pointing_doi(
+        [p.id for p in pointings], normalized_gid, creators, inst_set, user_id, db
+    )
+
+
+def resolve_user_ids(names: Iterable[str], db: Session) -> FrozenSet[int]:
+    """
+    Resolve user name fragments to the ids of matching users.
+
+    A user matches when any fragment is contained in their username, first name
+    or last name. The substring matches are served by trigram indexes and the
+    result is cached, so pointing queries can filter on submitterid with IN.
+    """
+    fragments = tuple(sorted({str(n).strip() for n in names if str(n).strip()}))
+    if not fragments:
+        return frozenset()
+
+    def lookup():
+        conditions = []
+        for f in fragments:
+            conditions.append(Users.username.contains(f))
+            conditions.append(Users.firstname.contains(f))
+            conditions.append(Users.lastname.contains(f))
+        rows = db.query(Users.id).filter(or_(*conditions)).all()
+        return frozenset(r.id for r in rows)
+
+    return name_lookup_cache.get_or_set(("users", fragments), lookup)
+
+
+def resolve_instrument_ids(
+    names: Iterable[str], db: Session, include_nicknames: bool = True
+) -> FrozenSet[int]:
+    """
+    Resolve instrument name fragments to the ids of matching instruments.
+
+    A fragment matches when it is contained in the instrument name, or in the
+    nickname when include_nicknames is set. Results are cached like
+    resolve_user_ids.
+    """
+    fragments = tuple(sorted({str(n).strip() for n in names if str(n).strip()}))
+    if not fragments:
+        return frozenset()
+
+    def lookup():
+        conditions = []
+        for f in fragments:
+            conditions.append(Instrument.instrument_name.contains(f))
+            if include_nicknames:
+                conditions.append(Instrument.nickname.contains(f))
+        rows = db.query(Instrument.id).filter(or_(*conditions)).all()
+        return frozenset(r.id for r in rows)
+
+    return name_lookup_cache.get_or_set(
+        ("instruments", include_nicknames, fragments), lookup
+    )
+
+
+def invalidate_name_lookups() -> None:
+    """Drop cached name lookups after users or instruments change."""
+    name_lookup_cache.invalidate()
@@ -0,0 +1,105 @@
+"""Derived skymap products: resampled HEALPix maps and credible-region MOCs."""
+
+import gzip
+import io
+from typing import Tuple
+
+import numpy as np
+
+# Largest NSIDE served by the resampling endpoint (12 * 1024**2 float32 = 48 MB)
+SKYMAP_MAX_NSIDE = 1024
+
+
+def read_skymap(content: bytes) -> np.ndarray:
+    """Read the probability column of a (gzipped) HEALPix FITS skymap, RING ordered."""
+    import healpy as hp
+    from astropy.io import fits
+
+    if content[:2] == b"\x1f\x8b":
+        content = gzip.decompress(content)
+    with fits.open(io.BytesIO(content)) as hdul:
+        return hp.read_map(hdul, field=0, nest=False, dtype=np.float64)
+
+
+def read_skymap_layers(content: bytes) -> dict:
+    """
+    Read a (gzipped) HEALPix FITS skymap with its distance layers, RING ordered.
+
+    Returns:
+        Dict with "prob" and, for 3D skymaps, "distmu", "distsigma" and
+        "distnorm" arrays
+    """
+    import healpy as hp
+    from astropy.io import fits
+
+    if content[:2] == b"\x1f\x8b":
+        content = gzip.decompress(content)
+    with fits.open(io.BytesIO(content)) as hdul:
+        names = [name.upper() for name in hdul[1].columns.names]
+        layers = ["DISTMU", "DISTSIGMA", "DISTNORM"]
+        if not all(layer in names for layer in layers):
+            return {"prob": hp.read_map(hdul, field=0, nest=False, dtype=np.float64)}
+        fields = [0] + [names.index(layer) for layer in layers]
+        maps = hp.read_map(hdul, field=fields, nest=False, dtype=np.float64)
+    return dict(zip(["prob", "distmu", "distsigma", "distnorm"], maps))
+
+
+def resample_skymap(prob: np.ndarray, nside: int) -> np.ndarray:
+    """
+    Resample a probability-per-pixel map to nside as float32, RING ordered.
+
+    power=-2 scales by the pixel area, so the total probability is preserved
+    when degrading and when upgrading.
+    """
+    import healpy as hp
+
+    prob = np.where(np.isfinite(prob) & (prob > 0), prob, 0.0)
+    resampled = hp.ud_grade(prob, nside, order_in="RING", power=-2)
+    return resampled.astype("<f4")
+
+
+def sorted_cumulative(prob: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pixels (RING) by descending probability, with the cumulative probability
+    fraction at each, as int32 and float32 arrays.
+    """
+    prob = np.where(np.isfinite(prob) & (prob > 0), prob, 0.0)
+    order = np.argsort(prob)[::-1]
+    cumulative = np.cumsum(prob[order]) / prob.sum()
+    return order.astype("<i4"), cumulative.astype("<f4")
+
+
+def encode_sorted_cumulative(order: np.ndarray, cumulative: np.ndarray) -> bytes:
+    """Serialise sorted_cumulative output as an uncompressed .npz."""
+    buffer = io.BytesIO()
+    np.savez(buffer, order=order, cumulative=cumulative)
+    return buffer.getvalue()
+
+
+def decode_sorted_cumulative(content: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    """Inverse of encode_sorted_cumulative."""
+    with np.load(io.BytesIO(content)) as arrays:
+        return arrays["order"], arrays["cumulative"]
+
+
+def credible_region_moc(
+    order: np.ndarray, cumulative: np.ndarray, credible_level: float
+) -> str:
+    """
+    MOC (JSON serialisation) of the smallest set of pixels holding credible_level
+    of the probability, at the map's own resolution, from sorted_cumulative output.
+    """
+    import healpy as hp
+    from mocpy import MOC
+
+    nside = hp.npix2nside(len(order))
+    depth = int(np.log2(nside))
+
+    # Include the pixel that crosses the level, so the region holds at least it
+    count = min(int(np.searchsorted(cumulative, credible_level)) + 1, len(order))
+    ipix = hp.ring2nest(nside, order[:count]).astype(np.uint64)
+
+    moc = MOC.from_healpix_cells(
+        ipix, np.full(len(ipix), depth, dtype=np.uint8), max_depth=depth
+    )
+    return moc.to_string(format="json")
@@ -0,0 +1,146 @@
+"""PostGIS spatial filter helpers for cone and polygon sky searches."""
+
+import json
+import math
+from typing import List, Tuple
+
+from sqlalchemy import func
+
+# PostGIS evaluates geography distances on a sphere of this radius (metres)
+# when use_spheroid is false, so angular radii convert exactly.
+POSTGIS_SPHERE_RADIUS_M = 6371008.7714
+
+
+def _parse_number_list(value) -> List[float]:
+    """Parse a JSON array or comma-separated string into a list of floats."""
+    if isinstance(value, (list, tuple)):
+        items = value
+    elif "[" in value and "]" in value:
+        items = json.loads(value.replace("(", "[").replace(")", "]"))
+    else:
+        items = [v.strip() for v in value.split(",") if v.strip()]
+    return [float(v) for v in items]
+
+
+def _normalize_ra(ra: float) -> float:
+    """Wrap RA into the -180..180 longitude range used by PostGIS geography."""
+    ra = ra % 360.0
+    return ra - 360.0 if ra > 180.0 else ra
+
+
+def degrees_to_meters(angle_deg: float) -> float:
+    """Convert an angular separation on the sky to a PostGIS sphere distance."""
+    return math.radians(angle_deg) * POSTGIS_SPHERE_RADIUS_M
+
+
+def meters_to_degrees(distance_m: float) -> float:
+    """Convert a PostGIS sphere distance to an angular separation on the sky."""
+    return math.degrees(distance_m / POSTGIS_SPHERE_RADIUS_M)
+
+
+def sky_point(ra: float, dec: float):
+    """Geography literal for a sky position."""
+    return func.ST_GeogFromText(f"SRID=4326;POINT({_normalize_ra(ra)} {dec})")
+
+
+def parse_cone(value) -> Tuple[float, float, float]:
+    """
+    Parse a cone search specification.
+
+    Args:
+        value: '[ra, dec, radius]' (JSON) or 'ra,dec,radius', all in degrees
+
+    Returns:
+        Tuple of (ra, dec, radius) in degrees
+
+    Raises:
+        ValueError: if the cone is malformed or out of range
+    """
+    numbers = _parse_number_list(value)
+    if len(numbers) != 3:
+        raise ValueError("cone must contain exactly three values: [ra, dec, radius]")
+
+    ra, dec, radius = numbers
+    if not -90.0 <= dec <= 90.0:
+        raise ValueError("cone dec must be between -90 and 90 degrees")
+    if not 0.0 < radius <= 180.0:
+        raise ValueError("cone radius must be greater than 0 and at most 180 degrees")
+
+    return ra, dec, radius
+
+
+def parse_polygon(value) -> str:
+    """
+    Parse a polygon specification into a closed WKT POLYGON.
+
+    Args:
+        value: WKT 'POLYGON((ra dec, ...))' or a JSON array of [ra, dec] vertices
+
+    Returns:
+        WKT polygon string with RA wrapped into the geography longitude range
+
+    Raises:
+        ValueError: if the polygon is malformed
+    """
+    if isinstance(value, str) and value.strip().upper().startswith("POLYGON"):
+        body = value.strip()[len("POLYGON") :].strip().lstrip("(").rstrip(")")
+        vertices = []
+        for pair in body.split(","):
+            coords = pair.strip().split()
+            if len(coords) != 2:
+                raise ValueError(f"Invalid polygon vertex: '{pair.strip()}'")
+            vertices.append((float(coords[0]), float(coords[1])))
+    else:
+        raw = json.loads(value) if isinstance(value, str) else value
+        vertices = [(float(v[0]), float(v[1])) for v in raw]
+
+    if vertices and vertices[0] == vertices[-1]:
+        vertices = vertices[:-1]
+    if len(vertices) < 3:
+        raise ValueError("polygon must have at least three distinct vertices")
+
+    for _, dec in vertices:
+        if not -90.0 <= dec <= 90.0:
+            raise ValueError("polygon dec values must be between -90 and 90 degrees")
+
+    ring = vertices + [vertices[0]]
+    coord_pairs = [f"{_normalize_ra(ra)} {dec}" for ra, dec in ring]
+    return f"POLYGON(({', '.join(coord_pairs)}))"
+
+
+def cone_filter(position_column, ra: float, dec: float, radius: float):
+    """
+    Build an index-assisted cone search predicate.
+
+    ST_DWithin on geography expands to a bounding-box test against the GiST
+    index on the position column before the exact distance check.
+    """
+    return within_filter(position_column, sky_point(ra, dec), radius)
+
+
+def within_filter(position_column, center, radius: float):
+    """ST_DWithin predicate for a geography center expression, radius in degrees."""
+    return func.ST_DWithin(position_column, center, degrees_to_meters(radius), False)
+
+
+def knn_order(position_column, center):
+    """
+    Nearest-first ORDER BY expression for a geography center expression.
+
+    The <-> operator lets PostgreSQL walk the GiST index on the position
+    column in distance order, so LIMIT k reads about k rows instead of
+    computing the distance to every row.
+    """
+    return position_column.op("<->")(center)
+
+
+def sphere_distance(position_column, center):
+    """Sphere distance in metres (convert with meters_to_degrees)."""
+    return func.ST_Distance(position_column, center, False)
+
+
+def polygon_filter(position_column, polygon_wkt: str):
+    """Build an index-assisted polygon containment predicate."""
+    return func.ST_Intersects(
+        position_column, func.ST_GeogFromText(f"SRID=4326;{polygon_wkt}")
+    )
@@ -171,6 +171,35 @@ class SpectralRangeHandler:
 
         return freq_min, freq_max
 
+    @staticmethod
+    def wavelengthBounds(spectral_min, spectral_max, spectral_type):
+        """
+        Translate a spectral range into the equivalent wavelength bounds in Angstroms.
+
+        A pointing lies inside [spectral_min, spectral_max] of any spectral type exactly
+        when its wavelength range lies inside the returned bounds, because energy and
+        frequency are monotonically decreasing in wavelength. This lets range filters
+        compare stored wavelength columns directly. A bound of None means unbounded.
+        Returns None if no pointing can satisfy the range.
+        """
+        if spectral_type == SpectralRangeHandler.spectralrangetype.wavelength:
+            return spectral_min, spectral_max
+
+        if spectral_type == SpectralRangeHandler.spectralrangetype.energy:
+            conversion = 12398
+        elif spectral_type == SpectralRangeHandler.spectralrangetype.frequency:
+            conversion = 2997924580000000000.0
+        else:
+            return None
+
+        if spectral_max <= 0:
+            return None
+
+        wave_low = conversion / spectral_max
+        wave_high = conversion / spectral_min if spectral_min > 0 else None
+
+        return wave_low, wave_high
+
 
 def waveToFreq(wave: float) -> float:
     """
@@ -74,3 +74,36 @@ class TestAdminEndpoints:
             self.get_url("/admin/fixdata"), headers={"api_token": self.invalid_token}
         )
         assert response.status_code == 401
+
+    def test_rebuild_pointing_count_as_admin(self):
+        """Test rebuilding the pointing counters leaves correct totals unchanged."""
+
+        def counts():
+            response = requests.get(
+                self.get_url("/query_alerts"),
+                params={"instrument_id": 2, "include_pointing_count": True},
+                headers={"api_token": self.admin_token},
+            )
+            assert response.status_code == status.HTTP_200_OK
+            return {a["graceid"]: a["pointing_count"] for a in response.json()}
+
+        before = counts()
+        response = requests.post(
+            self.get_url("/admin/rebuild_pointing_count"),
+            headers={"api_token": self.admin_token},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["message"] == "success"
+        assert counts() == before
+
+    def test_rebuild_pointing_count_as_non_admin(self):
+        """Test that non-admin users cannot rebuild the pointing counters."""
+        response = requests.post(
+            self.get_url("/admin/rebuild_pointing_count"),
+            headers={"api_token": self.user_token},
+        )
+        assert response.status_code == 403
+
+        response = requests.post(self.get_url("/admin/rebuild_pointing_count"))
+        assert response.status_code == 401
@@ -195,6 +195,48 @@ class TestCandidateEndpoints:
                 mag = candidate["discovery_magnitude"]
                 assert 20.0 < mag < 23.0
 
+    def test_get_candidates_by_cone(self):
+        """Test getting candidates within a cone around candidate 1."""
+        response = requests.get(
+            self.get_url("/candidate"),
+            params={"cone": "[122.0, -11.5, 0.5]"},
+            headers={"api_token": self.admin_token},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        ids = {c["id"] for c in response.json()}
+        assert 1 in ids
+        assert 2 not in ids
+
+    def test_get_candidates_by_polygon(self):
+        """Test getting candidates inside a WKT polygon."""
+        response = requests.get(
+            self.get_url("/candidate"),
+            params={
+                "polygon": "POLYGON((231 -22, 233 -22, 233 -21, 231 -21, 231 -22))"
+            },
+            headers={"api_token": self.admin_token},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        ids = {c["id"] for c in response.json()}
+        assert 2 in ids
+        assert 1 not in ids
+
+    def test_get_candidates_with_fields(self):
+        """Test that 'fields' limits the returned candidate keys."""
+        response = requests.get(
+            self.get_url("/candidate"),
+            params={"fields": "id,candidate_name,position", "id": 1},
+            headers={"api_token": self.admin_token},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert len(data) == 1
+        assert set(data[0].keys()) == {"id", "candidate_name", "position"}
+        assert data[0]["position"].startswith("POINT")
+
     def test_post_single_candidate(self):
         """Test posting a single candidate."""
         candidate_data = {
@@ -0,0 +1,79 @@
+"""
+Test celestial endpoints with real requests to the FastAPI application.
+"""
+
+import os
+import requests
+from fastapi import status
+
+# Test configuration
+API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
+API_V1_PREFIX = "/api/v1"
+
+
+class TestCelestialEndpoints:
+    """Test class for sun and moon position endpoints."""
+
+    TIMES = ["2019-04-25T08:18:26.000000Z", "2019-04-26T15:21:55.000000Z"]
+
+    def get_url(self, endpoint):
+        """Get full URL for an endpoint."""
+        return f"{API_BASE_URL}{API_V1_PREFIX}{endpoint}"
+
+    def test_sun_moon_positions_batch(self):
+        """Test batch positions match the single-time endpoint."""
+        response = requests.post(
+            self.get_url("/sun_moon_positions_batch"), json={"times": self.TIMES}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["times"] == self.TIMES
+        assert len(data["sun_ra"]) == len(data["moon_dec"]) == 2
+        assert data["sun_separation"] is None
+
+        single = requests.get(
+            self.get_url("/sun_moon_positions"),
+            params={"time_of_signal": self.TIMES[0]},
+        ).json()
+        # The batch endpoint rounds to the minute
+        assert abs(single["sun_ra"] - data["sun_ra"][0]) < 0.01
+        assert abs(single["moon_dec"] - data["moon_dec"][0]) < 0.1
+
+    def test_sun_moon_positions_batch_separations(self):
+        """Test separations from pointings placed on the sun."""
+        positions = requests.post(
+            self.get_url("/sun_moon_positions_batch"), json={"times": self.TIMES}
+        ).json()
+
+        response = requests.post(
+            self.get_url("/sun_moon_positions_batch"),
+            json={
+                "times": self.TIMES,
+                "ra": positions["sun_ra"],
+                "dec": positions["sun_dec"],
+            },
+        )
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert all(sep < 1e-6 for sep in data["sun_separation"])
+        assert all(0 < sep <= 180 for sep in data["moon_separation"])
+
+    def test_sun_moon_positions_batch_invalid(self):
+        """Test ra/dec must be given together with one value per time."""
+        for body in [
+            {"times": self.TIMES, "ra": [10.0, 20.0], "dec": [5.0]},
+            {"times": self.TIMES, "ra": [10.0, 20.0]},
+            {"times": ["not a time"]},
+        ]:
+            response = requests.post(
+                self.get_url("/sun_moon_positions_batch"), json=body
+            )
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_sun_moon_positions_batch_too_many_times(self):
+        """Test batches over the per-request limit are rejected."""
+        response = requests.post(
+            self.get_url("/sun_moon_positions_batch"),
+            json={"times": [self.TIMES[0]] * 2001},
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -322,6 +322,38 @@ class TestGWGalaxyEndpoints:
         assert isinstance(data, list)
         # Should return galaxies sorted by distance from the specified position
 
+    def test_get_glade_galaxies_within_radius(self):
+        """Test the nearest-galaxy search limited to a radius."""
+        response = requests.get(
+            self.get_url("/glade"),
+            params={"ra": 120.1, "dec": -10.0, "radius": 1.0},
+            headers={"api_token": self.admin_token},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [galaxy["pgc_number"] for galaxy in data] == [1234567]
+
+    def test_get_glade_nearest_batch(self):
+        """Test matching a batch of positions to their nearest galaxies."""
+        response = requests.post(
+            self.get_url("/glade_nearest"),
+            json={
+                "positions": [[120.1, -10.0], [340.0, 30.5], [0.0, -80.0]],
+                "radius": 2.0,
+            },
+            headers={"api_token": self.admin_token},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert len(data) == 3
+        assert [g["pgc_number"] for g in data[0]["galaxies"]] == [1234567]
+        assert [g["pgc_number"] for g in data[1]["galaxies"]] == [3456789]
+        assert abs(data[1]["galaxies"][0]["separation"] - 0.5) < 0.01
+        # Nothing within the radius
+        assert data[2]["galaxies"] == []
+
     def test_get_glade_galaxies_by_name(self):
         """Test getting GLADE galaxies by name."""
         response = requests.get(
@@ -354,12 +386,58 @@ class TestGWGalaxyEndpoints:
                         break
                 assert has_name_match
 
+    def test_get_glade_galaxies_by_alias_ranked(self):
+        """Test the name search matches any alias, best match first."""
+        response = requests.get(
+            self.get_url("/glade"),
+            params={"name": "HyperLEDA_3"},
+            headers={"api_token": self.admin_token},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert [g["pgc_number"] for g in response.json()] == [3456789]
+
+        # "_" is matched literally, not as a LIKE wildcard
+        response = requests.get(
+            self.get_url("/glade"),
+            params={"name": "GWGC_TEST"},
+            headers={"api_token": self.admin_token},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        # Galaxy 2 is beyond the 100 Mpc the endpoint serves
+        assert sorted(g["pgc_number"] for g in response.json()) == [1234567, 3456789]
+
+    def test_get_glade_top(self):
+        """Test ranking GLADE galaxies by an event's skymap."""
+        response = requests.get(
+            self.get_url("/glade_top"),
+            params={"graceid": "S190425z", "limit": 5},
+            headers={"api_token": self.admin_token},
+        )
+        # The skymap file or the index snapshot may not be present
+        assert response.status_code in [
+            status.HTTP_200_OK,
+            status.HTTP_404_NOT_FOUND,
+            status.HTTP_503_SERVICE_UNAVAILABLE,
+        ]
+        if response.status_code == status.HTTP_200_OK:
+            data = response.json()
+            assert len(data) <= 5
+            probabilities = [g["probability"] for g in data]
+            assert probabilities == sorted(probabilities, reverse=True)
+
+        response = requests.get(
+            self.get_url("/glade_top"),
+            params={"graceid": "S190425z", "credible_level": 1.5},
+            headers={"api_token": self.admin_token},
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
     def test_public_read_access(self):
         """Test authentication requirements for GW galaxy endpoints."""
         # GLADE endpoint requires authentication (returns user-specific catalog access)
         response = requests.get(self.get_url("/glade"))
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
-            
+
         # Test event_galaxies endpoint - also requires authentication
         response = requests.get(self.get_url("/event_galaxies?graceid=S190425z"))
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
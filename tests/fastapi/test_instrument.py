@@ -176,6 +176,43 @@ class TestInstrumentAPI:
         # Store the created instrument ID for cleanup in other tests
         self._created_instrument_id = created["id"]
 
+    def test_metadata_bundle_etag(self):
+        """Test the metadata bundle revalidates and changes with new instruments."""
+        response = requests.get(self.get_url("/metadata"))
+        assert response.status_code == status.HTTP_200_OK
+        etag = response.headers["ETag"]
+        data = response.json()
+        assert "observing_runs" in data["alert_filter_options"]
+        assert "bandpass" in data["enums"]
+        assert 1 in [inst["id"] for inst in data["instruments"]]
+
+        response = requests.get(
+            self.get_url("/metadata"), headers={"If-None-Match": etag}
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["ETag"] == etag
+
+        response = requests.post(
+            self.get_url("/instruments"),
+            json={
+                "instrument_name": "Metadata Test Telescope",
+                "instrument_type": InstrumentType.photometric.value,
+                "footprint_type": "Circular",
+                "unit": "deg",
+                "radius": 1.0,
+            },
+            headers={"api_token": self.admin_token},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        created_id = response.json()["instrument"]["id"]
+
+        response = requests.get(
+            self.get_url("/metadata"), headers={"If-None-Match": etag}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] != etag
+        assert created_id in [inst["id"] for inst in response.json()["instruments"]]
+
     def test_create_instrument_as_different_user(self):
         """Test creating an instrument as a different user."""
         new_instrument = {
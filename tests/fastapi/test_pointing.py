@@ -2,7 +2,9 @@
 Test pointing endpoints with real requests to the FastAPI application.
 Tests use specific data from test-data.sql.
 """
+import json
 import os
+import uuid
 import pytest
 import requests
 
@@ -257,6 +259,31 @@ class TestPointingEndpoints:
         assert isinstance(data, list)
         # Should find pointings submitted by admin user
 
+    def test_get_pointings_by_instrument_names(self):
+        """Test instrument name filters resolve nicknames to instrument IDs."""
+        response = requests.get(
+            self.get_url("/pointings"),
+            params={"instruments": '["TOT", "TXO"]'},
+            headers={"api_token": self.admin_token}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert len(data) > 0
+        for pointing in data:
+            assert pointing.get("instrumentid") in (1, 2)
+
+    def test_get_pointings_by_unknown_username(self):
+        """Test a user name that matches nobody returns no pointings."""
+        response = requests.get(
+            self.get_url("/pointings"),
+            params={"user": "no_such_user_xyz"},
+            headers={"api_token": self.admin_token}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == []
+
     def test_get_pointings_by_time_range(self):
         """Test getting pointings filtered by time range."""
         response = requests.get(
@@ -294,6 +321,111 @@ class TestPointingEndpoints:
             if depth is not None:
                 assert 19.0 < depth < 22.0
 
+    def test_get_pointings_by_frequency_regime(self):
+        """Test getting pointings filtered by a frequency range."""
+        response = requests.get(
+            self.get_url("/pointings"),
+            params={"frequency_regime": "[400, 550]", "frequency_unit": "THz"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        ids = {p["id"] for p in response.json()}
+        # r-band pointing 1 spans ~419-529 THz; g-band pointing 2 extends past 550 THz
+        assert 1 in ids
+        assert 2 not in ids
+
+    def test_get_pointings_with_fields(self):
+        """Test that 'fields' limits the returned keys."""
+        response = requests.get(
+            self.get_url("/pointings"),
+            params={"fields": "id,ra,dec,time,instrumentid", "id": 1},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert len(data) == 1
+        assert set(data[0].keys()) == {"id", "ra", "dec", "time", "instrumentid"}
+        assert abs(data[0]["ra"] - 123.456) < 1e-6
+        assert abs(data[0]["dec"] - -12.345) < 1e-6
+
+    def test_get_pointings_with_invalid_fields(self):
+        """Test that unknown field names are rejected."""
+        response = requests.get(
+            self.get_url("/pointings"),
+            params={"fields": "id,not_a_field"},
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_get_pointings_by_cone(self):
+        """Test getting pointings within a cone around (151, -30)."""
+        response = requests.get(
+            self.get_url("/pointings"),
+            params={"cone": "[151.0, -30.0, 1.5]"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        ids = {p["id"] for p in data}
+        # Pointings 5, 6 and 7 lie at (150..152, -30)
+        assert {5, 6, 7}.issubset(ids)
+        assert 1 not in ids
+
+    def test_get_pointings_by_polygon(self):
+        """Test getting pointings inside a polygon."""
+        response = requests.get(
+            self.get_url("/pointings"),
+            params={"polygon": "[[149.5, -31], [151.5, -31], [151.5, -29], [149.5, -29]]"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        ids = {p["id"] for p in response.json()}
+        assert {5, 6}.issubset(ids)
+        assert 7 not in ids
+
+    def test_get_pointings_invalid_cone(self):
+        """Test that a malformed cone is rejected."""
+        response = requests.get(
+            self.get_url("/pointings"),
+            params={"cone": "[151.0, -30.0]"},
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_export_pointings_csv(self):
+        """Test exporting pointings as CSV with the /pointings filters."""
+        response = requests.get(
+            self.get_url("/pointings/export"),
+            params={"format": "csv", "ids": "[5, 6, 7]", "fields": "id,ra,dec,time"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/csv")
+        lines = response.text.strip().splitlines()
+        assert lines[0] == "id,ra,dec,time"
+        assert len(lines) == 4
+
+    def test_export_pointings_parquet(self):
+        """Test exporting pointings as Parquet."""
+        response = requests.get(
+            self.get_url("/pointings/export"),
+            params={"format": "parquet", "graceid": "S190425z"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/vnd.apache.parquet"
+        # Parquet files start and end with the PAR1 magic bytes
+        assert response.content[:4] == b"PAR1"
+        assert response.content[-4:] == b"PAR1"
+
+    def test_export_pointings_invalid_format(self):
+        """Test that an unknown export format is rejected."""
+        response = requests.get(
+            self.get_url("/pointings/export"), params={"format": "xlsx"}
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
     def test_post_single_pointing(self):
         """Test posting a single pointing."""
 
@@ -370,6 +502,147 @@ class TestPointingEndpoints:
         # Should have no errors
         assert len(data.get("ERRORS", [])) == 0
 
+    def test_post_bulk_pointings(self):
+        """Test a large submission is inserted in order with per-row errors."""
+
+        pointings = [
+            {
+                "ra": 200.0 + i * 0.01,
+                "dec": -40.0,
+                "instrumentid": 1,
+                "depth": 21.0,
+                "depth_unit": "ab_mag",
+                "time": "2019-04-25T15:00:00.000000",
+                "status": "completed",
+                "pos_angle": 0.0,
+                "band": "r"
+            }
+            for i in range(1500)
+        ]
+        # One row with an unknown instrument should be reported, not inserted
+        pointings[10]["instrumentid"] = 99999
+
+        response = requests.post(
+            self.get_url("/pointings"),
+            json={"graceid": "S190425z", "pointings": pointings},
+            headers={"api_token": self.admin_token}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert len(data["pointing_ids"]) == 1499
+        assert data["pointing_ids"] == sorted(data["pointing_ids"])
+        assert len(data["ERRORS"]) == 1
+        assert data["ERRORS"][0][0].startswith("Object:")
+
+    def test_post_pointings_idempotency_key_replay(self):
+        """Test a retry with the same Idempotency-Key replays the stored result."""
+        key = f"test-replay-{uuid.uuid4()}"
+        pointing_data = {
+            "graceid": "S190425z",
+            "pointing": {
+                "ra": 220.5,
+                "dec": -35.5,
+                "instrumentid": 1,
+                "depth": 20.5,
+                "depth_unit": "ab_mag",
+                "time": "2019-04-25T18:00:00.000000",
+                "status": "completed",
+                "band": "z"
+            }
+        }
+        headers = {"api_token": self.admin_token, "Idempotency-Key": key}
+
+        first = requests.post(self.get_url("/pointings"), json=pointing_data, headers=headers)
+        retry = requests.post(self.get_url("/pointings"), json=pointing_data, headers=headers)
+
+        assert first.status_code == status.HTTP_200_OK
+        assert retry.status_code == status.HTTP_200_OK
+        assert len(first.json()["pointing_ids"]) == 1
+        assert retry.json() == first.json()
+
+        # Reusing the key for a different payload is rejected
+        pointing_data["pointing"]["ra"] = 221.5
+        changed = requests.post(self.get_url("/pointings"), json=pointing_data, headers=headers)
+        assert changed.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_upload_pointings_ndjson(self):
+        """Test uploading pointings as an NDJSON stream."""
+        rows = [
+            {
+                "ra": 210.0 + i * 0.01,
+                "dec": -45.0,
+                "instrumentid": 1,
+                "depth": 21.0,
+                "depth_unit": "ab_mag",
+                "time": "2019-04-25T16:00:00.000000",
+                "status": "completed",
+                "band": "g"
+            }
+            for i in range(5)
+        ]
+        body = "\n".join(json.dumps(r) for r in rows) + "\nnot json\n"
+
+        response = requests.post(
+            self.get_url("/pointings/upload"),
+            params={"graceid": "S190425z", "format": "ndjson"},
+            data=body.encode(),
+            headers={"api_token": self.admin_token, "Content-Type": "application/x-ndjson"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        lines = [json.loads(l) for l in response.text.strip().split("\n")]
+        assert len(lines[0]["pointing_ids"]) == 5
+        assert len(lines[0]["ERRORS"]) == 1
+        assert lines[-1] == {"done": True, "rows": 6, "inserted": 5, "errors": 1}
+
+    def test_upload_pointings_invalid_utf8(self):
+        """Test a line that is not UTF-8 is reported as a row error."""
+        row = {
+            "ra": 211.0,
+            "dec": -45.5,
+            "instrumentid": 1,
+            "depth": 21.0,
+            "depth_unit": "ab_mag",
+            "time": "2019-04-25T16:30:00.000000",
+            "status": "completed",
+            "band": "r"
+        }
+        body = json.dumps(row).encode() + b"\n\xff\xfe not utf-8\n"
+
+        response = requests.post(
+            self.get_url("/pointings/upload"),
+            params={"graceid": "S190425z", "format": "ndjson"},
+            data=body,
+            headers={"api_token": self.admin_token, "Content-Type": "application/x-ndjson"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        lines = [json.loads(l) for l in response.text.strip().split("\n")]
+        assert len(lines[0]["pointing_ids"]) == 1
+        assert "Invalid UTF-8" in lines[0]["ERRORS"][0][1][0]
+        assert lines[-1] == {"done": True, "rows": 2, "inserted": 1, "errors": 1}
+
+    def test_upload_pointings_csv(self):
+        """Test uploading pointings as CSV with a header row."""
+        body = (
+            "ra,dec,instrumentid,depth,depth_unit,time,status,band\n"
+            "215.0,-45.0,1,21.0,ab_mag,2019-04-25T17:00:00,completed,i\n"
+            "215.1,-45.0,1,21.0,ab_mag,2019-04-25T17:00:00,completed,i\n"
+        )
+
+        response = requests.post(
+            self.get_url("/pointings/upload"),
+            params={"graceid": "S190425z", "format": "csv"},
+            data=body.encode(),
+            headers={"api_token": self.admin_token, "Content-Type": "text/csv"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        summary = json.loads(response.text.strip().split("\n")[-1])
+        assert summary["inserted"] == 2
+        assert summary["errors"] == 0
+
     def test_post_planned_pointing(self):
         """Test posting a planned pointing."""
 
@@ -612,6 +885,72 @@ class TestPointingEndpoints:
         assert "Updated" in data["message"]
         assert "3" in data["message"]  # Should cancel 3 pointings
 
+    def test_pointing_counts_follow_status_changes(self):
+        """Test reported pointing counts track new and cancelled pointings."""
+
+        def completed_count():
+            response = requests.get(
+                self.get_url("/query_alerts"),
+                params={"instrument_id": 2, "include_pointing_count": True},
+                headers={"api_token": self.admin_token}
+            )
+            assert response.status_code == status.HTTP_200_OK
+            counts = {a["graceid"]: a["pointing_count"] for a in response.json()}
+            return counts.get("S190425z", 0)
+
+        before = completed_count()
+
+        pointing_data = {
+            "graceid": "S190425z",
+            "pointings": [
+                {
+                    "ra": 60.0,
+                    "dec": -30.0,
+                    "instrumentid": 2,
+                    "depth": 21.0,
+                    "depth_unit": "ab_mag",
+                    "time": "2019-04-25T19:00:00.000000",
+                    "status": "completed",
+                    "band": "r"
+                },
+                {
+                    "ra": 61.0,
+                    "dec": -31.0,
+                    "instrumentid": 2,
+                    "depth": 21.0,
+                    "depth_unit": "ab_mag",
+                    "time": "2019-04-25T19:05:00.000000",
+                    "status": "planned",
+                    "band": "r"
+                }
+            ]
+        }
+        response = requests.post(
+            self.get_url("/pointings"),
+            json=pointing_data,
+            headers={"api_token": self.admin_token}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        planned_id = response.json()["pointing_ids"][1]
+        assert completed_count() == before + 1
+
+        response = requests.get(
+            self.get_url("/instruments"),
+            params={"reporting_only": True},
+            headers={"api_token": self.admin_token}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert 2 in [inst["id"] for inst in response.json()]
+
+        # Cancelling the planned pointing leaves the completed count unchanged
+        response = requests.post(
+            self.get_url("/update_pointings"),
+            json={"status": "cancelled", "ids": [planned_id]},
+            headers={"api_token": self.admin_token}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert completed_count() == before + 1
+
     @pytest.mark.skip(reason="Skipping test that requires external Zenodo API calls")
     def test_request_doi_for_pointings(self):
         """Test requesting DOI for existing pointings."""
@@ -678,6 +1017,8 @@ class TestPointingEndpoints:
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
         assert "DOI" in data
+        # Minting is queued, so the request returns before a DOI exists
+        assert data["DOI_STATUS"] == "pending"
 
     def test_pointing_public_access(self):
         """Test that GET pointings endpoint is publicly accessible."""
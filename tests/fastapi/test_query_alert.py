@@ -91,6 +91,36 @@ class TestEventEndpoints:
             assert alert["graceid"] == "S190425z"
             assert alert["alert_type"] == "Initial"
 
+    def test_query_alerts_cursor(self):
+        """Test capped simple results continue from the X-Next-Cursor token."""
+        response = requests.get(
+            self.get_url("/query_alerts"),
+            params={"limit": 1},
+            headers={"api_token": self.admin_token},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        first_page = response.json()
+        assert len(first_page) == 1
+        cursor = response.headers["X-Next-Cursor"]
+
+        response = requests.get(
+            self.get_url("/query_alerts"),
+            params={"limit": 1, "cursor": cursor},
+            headers={"api_token": self.admin_token},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        second_page = response.json()
+        assert len(second_page) == 1
+        assert second_page[0]["id"] != first_page[0]["id"]
+
+        response = requests.get(
+            self.get_url("/query_alerts"),
+            params={"cursor": "not-a-cursor"},
+            headers={"api_token": self.admin_token},
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
     def test_post_alert(self):
         """Test posting a new alert (admin only)."""
         alert_data = {
@@ -156,6 +186,52 @@ class TestEventEndpoints:
         else:
             assert "Error retrieving skymap file" in response.json()["message"]
 
+    def test_get_gw_skymap_redirect(self):
+        """Test redirect=true returns a pre-signed URL or falls back to the file."""
+        response = requests.get(
+            self.get_url("/gw_skymap"),
+            params={"graceid": "S190425z", "redirect": True},
+            headers={"api_token": self.admin_token},
+            allow_redirects=False,
+        )
+
+        # Backends that cannot sign URLs (local storage) stream the file instead
+        assert response.status_code in [200, 302, 404]
+        if response.status_code == status.HTTP_302_FOUND:
+            assert response.headers["Location"].startswith("http")
+            assert response.headers["Cache-Control"] == "no-store"
+
+    def test_get_gw_skymap_products(self):
+        """Test the resampled skymap and credible-region MOC endpoints."""
+        response = requests.get(
+            self.get_url("/gw_skymap_healpix"),
+            params={"graceid": "S190425z", "nside": 8},
+            headers={"api_token": self.admin_token},
+        )
+        assert response.status_code in [200, 404]
+        if response.status_code == status.HTTP_200_OK:
+            assert response.headers["X-HEALPix-NSIDE"] == "8"
+            assert response.headers["X-HEALPix-Ordering"] == "RING"
+            # 12 * nside**2 float32 values
+            assert len(response.content) == 12 * 8**2 * 4
+
+        response = requests.get(
+            self.get_url("/gw_skymap_moc"),
+            params={"graceid": "S190425z", "credible_level": 0.9},
+            headers={"api_token": self.admin_token},
+        )
+        assert response.status_code in [200, 404]
+        if response.status_code == status.HTTP_200_OK:
+            assert isinstance(response.json(), dict)
+
+        # NSIDE must be a power of 2
+        response = requests.get(
+            self.get_url("/gw_skymap_healpix"),
+            params={"graceid": "S190425z", "nside": 6},
+            headers={"api_token": self.admin_token},
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
     def test_get_gw_contour(self):
         """Test getting alert contour data."""
         response = requests.get(
@@ -459,6 +535,32 @@ class TestEventAPIIntegration:
             self.get_url("/del_test_alerts"), headers={"api_token": self.admin_token}
         )
 
+    def test_skymap_path_follows_latest_alert(self):
+        """Test skymap lookups use the latest alert type and its repeat count."""
+        event_id = f"TEST{datetime.now().strftime('%Y%m%d%H%M%S')}_HEAD"
+
+        for alert_type in ["Initial", "Update", "Update"]:
+            response = requests.post(
+                self.get_url("/post_alert"),
+                json={"graceid": event_id, "alert_type": alert_type, "role": "test"},
+                headers={"api_token": self.admin_token},
+            )
+            assert response.status_code == status.HTTP_200_OK
+
+        response = requests.get(
+            self.get_url("/gw_skymap"),
+            params={"graceid": event_id},
+            headers={"api_token": self.admin_token},
+        )
+
+        # The file is not in test storage; the error names the resolved path
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert f"test/{event_id}-Update1.fits.gz" in response.json()["message"]
+
+        requests.post(
+            self.get_url("/del_test_alerts"), headers={"api_token": self.admin_token}
+        )
+
 
 class TestEventSpecificData:
     """Test event endpoints with specific test data values."""
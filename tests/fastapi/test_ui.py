@@ -282,6 +282,45 @@ class TestUIEndpoints:
         # If we get here, no alerts were found
         pytest.skip("No alerts found in test data")
 
+    def test_ajax_event_galaxy_info(self):
+        """Test event galaxy markers and their lazily fetched popup info."""
+        for graceid in self.KNOWN_GRACEIDS:
+            response = requests.get(
+                self.get_url("/ajax_event_galaxies"),
+                params={"alertid": graceid},
+                headers={"api_token": self.admin_token},
+            )
+            assert response.status_code == status.HTTP_200_OK
+            markers = [m for group in response.json() for m in group["markers"]]
+            if not markers:
+                continue
+
+            marker = markers[0]
+            assert set(marker) == {"id", "name", "ra", "dec"}
+            assert 0 <= marker["ra"] < 360
+
+            response = requests.get(
+                self.get_url("/ajax_event_galaxy_info"),
+                params={"id": marker["id"]},
+                headers={"api_token": self.admin_token},
+            )
+            assert response.status_code == status.HTTP_200_OK
+            data = response.json()
+            assert data["name"] == marker["name"]
+            assert "<b>Rank: </b>" in data["info"]
+            return
+
+        pytest.skip("No event galaxies found in test data")
+
+    def test_ajax_event_galaxy_info_not_found(self):
+        """Test getting popup info for a nonexistent event galaxy."""
+        response = requests.get(
+            self.get_url("/ajax_event_galaxy_info"),
+            params={"id": 999999999},
+            headers={"api_token": self.admin_token},
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
     def test_ajax_candidate(self):
         """Test getting candidates by graceid."""
         for graceid in self.KNOWN_GRACEIDS:
@@ -326,6 +365,21 @@ class TestUIEndpoints:
                 data = response.json()
                 assert "hidden_alertid" in data
                 assert "detection_overlays" in data
+
+                # Complete payloads (contours found) are immutable and
+                # revalidate to a 304; without contours they are refetched
+                etag = response.headers.get("ETag")
+                if etag is None:
+                    assert response.headers["Cache-Control"] == "no-cache"
+                    return
+                assert "immutable" in response.headers["Cache-Control"]
+                response = requests.get(
+                    self.get_url("/ajax_alerttype"),
+                    params={"urlid": url_id},
+                    headers={"api_token": self.admin_token, "If-None-Match": etag},
+                )
+                assert response.status_code == status.HTTP_304_NOT_MODIFIED
+                assert response.headers["ETag"] == etag
                 return  # Found an alert, test passes
 
         # If we get here, no alerts were found
@@ -24,6 +24,8 @@ TRUNCATE TABLE public.usergroups CASCADE;
 TRUNCATE TABLE public.groups CASCADE;
 TRUNCATE TABLE public.users CASCADE;
 TRUNCATE TABLE public.gw_alert CASCADE;
+TRUNCATE TABLE public.gw_alert_head CASCADE;
+TRUNCATE TABLE public.pointing_count CASCADE;
 TRUNCATE TABLE public.glade_2p3 CASCADE;
 
 -- ===========================================
@@ -214,5 +216,11 @@ SELECT setval('public.icecube_notice_coinc_event_id_seq', 10);
 SELECT setval('public.gw_candidate_id_seq', 10);
 SELECT setval('public.useractions_id_seq', 10);
 
+-- Build the latest-alert-per-graceid rows for the alerts inserted above
+SELECT public.backfill_gw_alert_head();
+
+-- Count the pointings inserted above per event, instrument and status
+SELECT public.rebuild_pointing_count();
+
 -- Analyze tables to update statistics
 ANALYZE;
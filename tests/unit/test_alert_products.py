@@ -0,0 +1,239 @@
+"""
+Test the alert product precompute pipeline in server.services.alert_products
+and its scheduling from post_alert.
+Storage, the database and the Fermi spacecraft state are replaced by
+in-memory fakes, so these need no server.
+"""
+
+import asyncio
+import gzip
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from types import SimpleNamespace
+
+import healpy as hp
+import numpy as np
+import pytest
+from fastapi import BackgroundTasks
+
+from server.routes.gw_alert import post_alert as post_alert_module
+from server.routes.ui import fermi_coverage
+from server.services import alert_products
+from server.services.alert_products import (
+    SkymapProducts,
+    healpix_product,
+    moc_product,
+    precompute_alert_products,
+    precompute_skymap_products,
+)
+
+NSIDE = 128
+PATH_INFO = "S190425z-Initial"
+SKYMAP_PATH = "fit/S190425z-Initial.fits.gz"
+TRIGGER_TIME = datetime(2019, 4, 25, 8, 18, 26)
+FERMI_STATE = {
+    "earth_ra": 200.0,
+    "earth_dec": 10.0,
+    "earth_radius": 67.0,
+    "spacecraft_lon": 0.0,
+    "spacecraft_lat": 0.0,
+    "spacecraft_elevation": 530.0,
+}
+
+
+@pytest.fixture(scope="module")
+def skymap_fits(tmp_path_factory) -> bytes:
+    """A gzipped FITS skymap with a Gaussian blob of probability."""
+    npix = hp.nside2npix(NSIDE)
+    ra, dec = hp.pix2ang(NSIDE, np.arange(npix), lonlat=True)
+    distance = hp.rotator.angdist([150.0, 30.0], [ra, dec], lonlat=True)
+    prob = np.exp(-0.5 * (np.degrees(distance) / 10.0) ** 2)
+    prob /= prob.sum()
+
+    path = tmp_path_factory.mktemp("skymap") / "skymap.fits"
+    hp.write_map(str(path), prob, nest=False, dtype=np.float64)
+    return gzip.compress(path.read_bytes())
+
+
+@pytest.fixture
+def storage(monkeypatch, skymap_fits):
+    """In-memory storage holding the skymap, and the product caches."""
+    files = {SKYMAP_PATH: skymap_fits}
+    cache = {}
+    downloads = []
+
+    def download_gwtm_file(filename, source, config, decode=True):
+        downloads.append(filename)
+        if filename not in files:
+            raise FileNotFoundError(filename)
+        return files[filename]
+
+    monkeypatch.setattr(alert_products, "download_gwtm_file", download_gwtm_file)
+    monkeypatch.setattr(
+        alert_products, "get_cached_bytes", lambda key, cfg: cache.get(key)
+    )
+    monkeypatch.setattr(
+        alert_products,
+        "set_cached_bytes",
+        lambda key, content, cfg: cache.__setitem__(key, content),
+    )
+    monkeypatch.setattr(
+        fermi_coverage, "get_cached_file", lambda key, cfg: cache.get(key)
+    )
+    monkeypatch.setattr(
+        fermi_coverage,
+        "set_cached_file",
+        lambda key, content, cfg: cache.__setitem__(key, content),
+    )
+    monkeypatch.setattr(fermi_coverage, "get_fermi_state", lambda t: FERMI_STATE)
+    monkeypatch.setattr(fermi_coverage.settings, "FERMI_MOC_ORDER", 3)
+    return SimpleNamespace(files=files, cache=cache, downloads=downloads)
+
+
+@pytest.fixture
+def alert_head(monkeypatch):
+    """The head row of one alert, read through a stand-in session."""
+    head = SimpleNamespace(path_info=PATH_INFO, skymap_path=SKYMAP_PATH)
+
+    @contextmanager
+    def db_session():
+        yield None
+
+    monkeypatch.setattr(alert_products, "db_session", db_session)
+    monkeypatch.setattr(
+        alert_products.GWAlertHead,
+        "get",
+        staticmethod(lambda graceid, db: head if graceid == "S190425z" else None),
+    )
+    monkeypatch.setattr(
+        alert_products, "get_trigger_time", lambda graceid, db: TRIGGER_TIME
+    )
+    return head
+
+
+def product_key(product: str) -> str:
+    return SkymapProducts(PATH_INFO, SKYMAP_PATH).key(product)
+
+
+class TestSkymapProducts:
+    """Test products are built from one download and served from the cache."""
+
+    def test_product_names(self):
+        """Test credible levels are cached per whole percent."""
+        assert healpix_product(64) == "nside64.f32"
+        assert moc_product(0.29) == "cl29.moc.json"
+        assert moc_product(0.9) == "cl90.moc.json"
+
+    def test_precompute_skymap_products(self, storage):
+        """Test ingest builds the resampled maps, sorted map and 50/90% MOCs."""
+        precompute_skymap_products(PATH_INFO, SKYMAP_PATH)
+
+        assert set(storage.cache) == {
+            product_key("nside64.f32"),
+            product_key("nside128.f32"),
+            product_key("sorted.npz"),
+            product_key("cl50.moc.json"),
+            product_key("cl90.moc.json"),
+        }
+        # Not upsampled past the skymap's own resolution
+        assert product_key("nside256.f32") not in storage.cache
+        assert storage.downloads == [SKYMAP_PATH]
+
+        nside64 = np.frombuffer(storage.cache[product_key("nside64.f32")], "<f4")
+        assert len(nside64) == hp.nside2npix(64)
+        assert np.isclose(nside64.sum(), 1.0, atol=1e-4)
+
+    def test_cached_products_skip_download(self, storage):
+        """Test a second instance reads the products without the skymap."""
+        precompute_skymap_products(PATH_INFO, SKYMAP_PATH)
+        products = SkymapProducts(PATH_INFO, SKYMAP_PATH)
+        assert products.moc(0.9) == storage.cache[product_key("cl90.moc.json")]
+        assert products.healpix(64) == storage.cache[product_key("nside64.f32")]
+        assert storage.downloads == [SKYMAP_PATH]
+
+
+class TestPrecomputeAlertProducts:
+    """Test the background task run after post_alert."""
+
+    def test_products_and_overlays_cached(self, storage, alert_head):
+        """Test the skymap products and GRB overlays end up in the cache."""
+        asyncio.run(precompute_alert_products("S190425z"))
+
+        assert product_key("cl90.moc.json") in storage.cache
+        overlay_keys = [k for k in storage.cache if k.startswith("grb_overlays_")]
+        assert len(overlay_keys) == 1
+        names = [o["name"] for o in storage.cache[overlay_keys[0]]]
+        assert names == ["Fermi/GBM", "Fermi/LAT"]
+
+    def test_missing_skymap_is_logged(self, storage, alert_head, caplog):
+        """Test a skymap not uploaded yet is logged, not raised."""
+        del storage.files[SKYMAP_PATH]
+        with caplog.at_level(logging.WARNING, logger=alert_products.__name__):
+            asyncio.run(precompute_alert_products("S190425z"))
+
+        assert "Could not precompute skymap products" in caplog.text
+        assert not any(k.startswith("cache/skymap_") for k in storage.cache)
+        # The GRB overlays do not need the skymap
+        assert any(k.startswith("grb_overlays_") for k in storage.cache)
+
+    def test_unknown_alert(self, storage, alert_head):
+        """Test an alert without a head row builds nothing."""
+        asyncio.run(precompute_alert_products("S000000a"))
+        assert storage.cache == {} and storage.downloads == []
+
+
+class FakeSession:
+    """Session stand-in recording what post_alert adds."""
+
+    def __init__(self):
+        self.added = []
+
+    def add(self, instance):
+        self.added.append(instance)
+
+    def flush(self):
+        pass
+
+    def commit(self):
+        pass
+
+    def refresh(self, instance):
+        pass
+
+    def execute(self, statement):
+        pass
+
+
+class TestPostAlertSchedulesPrecompute:
+    """Test post_alert queues precompute_alert_products as a background task."""
+
+    ALERT = {"graceid": "S190425z", "alert_type": "Initial", "role": "observation"}
+
+    @pytest.fixture(autouse=True)
+    def no_head_refresh(self, monkeypatch):
+        monkeypatch.setattr(
+            post_alert_module.GWAlertHead,
+            "refresh",
+            staticmethod(lambda graceid, db: None),
+        )
+
+    def post(self, monkeypatch, enabled: bool) -> BackgroundTasks:
+        monkeypatch.setattr(
+            post_alert_module.settings, "ALERT_PRECOMPUTE_ENABLED", enabled
+        )
+        tasks = BackgroundTasks()
+        alert = post_alert_module.GWAlertSchema(**self.ALERT)
+        asyncio.run(
+            post_alert_module.post_alert(alert, tasks, db=FakeSession(), user=None)
+        )
+        return tasks
+
+    def test_scheduled_when_enabled(self, monkeypatch):
+        tasks = self.post(monkeypatch, True)
+        assert [(t.func, t.args) for t in tasks.tasks] == [
+            (precompute_alert_products, ("S190425z",))
+        ]
+
+    def test_not_scheduled_when_disabled(self, monkeypatch):
+        assert self.post(monkeypatch, False).tasks == []
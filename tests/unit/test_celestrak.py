@@ -0,0 +1,200 @@
+"""
+Test the Fermi TLE store and selection logic in server.utils.celestrak.
+These run against the module directly and need no network or database.
+"""
+
+import io
+from datetime import datetime, timedelta
+
+import pytest
+
+from server.utils import celestrak
+from server.utils.celestrak import TLEStore, parse_tle_text, tle_epoch
+
+LINE2 = "2 33053  25.5830 150.0000 0012000 200.0000 160.0000 15.12345678600005"
+# Epochs 2019-04-24 12:00 and 2019-04-26 00:00
+LINE1_A = "1 33053U 08029A   19114.50000000  .00000500  00000-0  20000-4 0  9995"
+LINE1_B = "1 33053U 08029A   19116.00000000  .00000500  00000-0  20000-4 0  9992"
+# Another satellite, to be skipped
+ISS_LINE1 = "1 25544U 98067A   19114.50000000  .00000500  00000-0  20000-4 0  9992"
+ISS_LINE2 = "2 25544  51.6400 150.0000 0012000 200.0000 160.0000 15.50000000600003"
+
+
+@pytest.fixture
+def fermi_store(monkeypatch, tmp_path):
+    """An empty Fermi TLE store with CelesTrak reachable and no backoff."""
+    store = TLEStore()
+    monkeypatch.setattr(celestrak, "fermi_tle_store", store)
+    monkeypatch.setattr(celestrak, "_fermi_tle_dir_loaded", True)
+    monkeypatch.setattr(celestrak, "_last_celestrak_attempt", -1e9)
+    monkeypatch.setattr(celestrak.settings, "FERMI_TLE_DIR", str(tmp_path))
+    monkeypatch.setattr(celestrak.settings, "FERMI_TLE_OFFLINE", False)
+    monkeypatch.setattr(celestrak.settings, "FERMI_TLE_MAX_AGE_DAYS", 3.0)
+    return store
+
+
+def current_line1() -> str:
+    """A Fermi line 1 with today's epoch. Its checksum is not validated here."""
+    now = datetime.utcnow()
+    day = now.timetuple().tm_yday + (now.hour * 3600 + now.minute * 60) / 86400
+    return (
+        f"1 33053U 08029A   {now:%y}{day:012.8f}  .00000500  00000-0  20000-4 0  9990"
+    )
+
+
+class TestTLEParsing:
+    """Test TLE epoch and file parsing."""
+
+    def test_tle_epoch(self):
+        """Test the epoch is read from line 1."""
+        assert tle_epoch(LINE1_A) == datetime(2019, 4, 24, 12, 0)
+        assert tle_epoch(LINE1_B) == datetime(2019, 4, 26)
+
+    def test_tle_epoch_year_pivot(self):
+        """Test two-digit years 57-99 are 1900s and 00-56 are 2000s."""
+        assert tle_epoch(LINE1_A.replace("19114.5", "57001.0")).year == 1957
+        assert tle_epoch(LINE1_A.replace("19114.5", "56001.0")).year == 2056
+
+    def test_parse_two_line(self):
+        """Test sets without name lines get the default name."""
+        tles = parse_tle_text(f"{LINE1_A}\n{LINE2}\n\n{LINE1_B}\n{LINE2}\n")
+        assert tles == [("FERMI", LINE1_A, LINE2), ("FERMI", LINE1_B, LINE2)]
+
+    def test_parse_three_line(self):
+        """Test name lines, with or without the "0 " prefix, are kept."""
+        text = f"0 FERMI GLAST\n{LINE1_A}\n{LINE2}\nFERMI\n{LINE1_B}\n{LINE2}\n"
+        tles = parse_tle_text(text)
+        assert tles == [("FERMI GLAST", LINE1_A, LINE2), ("FERMI", LINE1_B, LINE2)]
+
+    def test_parse_skips_other_satellites(self):
+        """Test sets for other catalog numbers are dropped."""
+        text = f"ISS\n{ISS_LINE1}\n{ISS_LINE2}\nFERMI\n{LINE1_A}\n{LINE2}\n"
+        assert parse_tle_text(text) == [("FERMI", LINE1_A, LINE2)]
+
+
+class TestTLEStore:
+    """Test the epoch-keyed TLE store."""
+
+    def test_closest_epoch(self):
+        """Test the set nearest in time is returned on either side."""
+        store = TLEStore()
+        assert store.closest(datetime(2019, 4, 25)) is None
+        store.load_text(f"{LINE1_B}\n{LINE2}\n{LINE1_A}\n{LINE2}\n")
+
+        epoch, tle = store.closest(datetime(2019, 4, 25, 2))
+        assert epoch == datetime(2019, 4, 24, 12) and tle[1] == LINE1_A
+        epoch, _ = store.closest(datetime(2019, 4, 25, 8))
+        assert epoch == datetime(2019, 4, 26)
+        # Before the first and after the last epoch
+        assert store.closest(datetime(2010, 1, 1))[0] == datetime(2019, 4, 24, 12)
+        assert store.closest(datetime(2030, 1, 1))[0] == datetime(2019, 4, 26)
+
+    def test_duplicate_epochs(self):
+        """Test loading the same set twice stores it once."""
+        store = TLEStore()
+        assert store.load_text(f"{LINE1_A}\n{LINE2}\n") == 1
+        assert store.load_text(f"{LINE1_A}\n{LINE2}\n") == 0
+        assert len(store) == 1
+
+    def test_load_dir(self, tmp_path):
+        """Test *.tle and *.txt files are bulk-loaded and others ignored."""
+        (tmp_path / "a.tle").write_text(f"{LINE1_A}\n{LINE2}\n")
+        (tmp_path / "b.txt").write_text(f"FERMI\n{LINE1_B}\n{LINE2}\n")
+        (tmp_path / "c.json").write_text(f"{LINE1_B}\n{LINE2}\n")
+        store = TLEStore()
+        assert store.load_dir(str(tmp_path)) == 2
+        assert len(store) == 2
+
+
+class TestGetFermiTLE:
+    """Test when get_fermi_tle uses stored sets and when it asks CelesTrak."""
+
+    def test_stored_set_within_max_age(self, fermi_store, monkeypatch):
+        """Test a stored set close enough is used without contacting CelesTrak."""
+        fermi_store.load_text(f"{LINE1_A}\n{LINE2}\n")
+        monkeypatch.setattr(
+            celestrak, "urlopen", lambda *a, **k: pytest.fail("CelesTrak contacted")
+        )
+        assert celestrak.get_fermi_tle(datetime(2019, 4, 25))[1] == LINE1_A
+
+    def test_historical_trigger_falls_back_to_nearest(self, fermi_store, monkeypatch):
+        """Test CelesTrak is not asked for old triggers, which it cannot serve."""
+        fermi_store.load_text(f"{LINE1_A}\n{LINE2}\n")
+        monkeypatch.setattr(
+            celestrak, "urlopen", lambda *a, **k: pytest.fail("CelesTrak contacted")
+        )
+        assert celestrak.get_fermi_tle(datetime(2018, 1, 1))[1] == LINE1_A
+
+    def test_offline(self, fermi_store, monkeypatch):
+        """Test FERMI_TLE_OFFLINE never contacts CelesTrak, even for new triggers."""
+        monkeypatch.setattr(celestrak.settings, "FERMI_TLE_OFFLINE", True)
+        monkeypatch.setattr(
+            celestrak, "urlopen", lambda *a, **k: pytest.fail("CelesTrak contacted")
+        )
+        assert celestrak.get_fermi_tle(datetime.utcnow()) is None
+
+    def test_recent_trigger_downloads_and_saves(
+        self, fermi_store, monkeypatch, tmp_path
+    ):
+        """Test a recent trigger without a close stored set downloads one."""
+        line1 = current_line1()
+        monkeypatch.setattr(
+            celestrak,
+            "urlopen",
+            lambda *a, **k: io.BytesIO(f"FERMI\n{line1}\n{LINE2}\n".encode()),
+        )
+        assert celestrak.get_fermi_tle(datetime.utcnow()) == ("FERMI", line1, LINE2)
+        assert len(fermi_store) == 1
+        assert line1 in (tmp_path / "celestrak.tle").read_text()
+
+    def test_download_backoff(self, fermi_store, monkeypatch):
+        """Test a failed download is not retried within CELESTRAK_RETRY_SECONDS."""
+        calls = []
+
+        def failing_urlopen(*args, **kwargs):
+            calls.append(args)
+            raise OSError("unreachable")
+
+        monkeypatch.setattr(celestrak, "urlopen", failing_urlopen)
+        assert celestrak.get_fermi_tle(datetime.utcnow()) is None
+        assert celestrak.get_fermi_tle(datetime.utcnow() - timedelta(hours=1)) is None
+        assert len(calls) == 1
+
+
+class TestGetFermiState:
+    """Test the per-trigger-time memoization of the Fermi spacecraft state."""
+
+    def test_state_computed_once(self, monkeypatch):
+        """Test repeated lookups for one trigger time reuse the cached state."""
+        calls = []
+
+        def fake_coverage(datetime_obj):
+            calls.append(datetime_obj)
+            return {"earth_ra": 10.0, "earth_dec": -5.0, "earth_radius": 67.0}
+
+        monkeypatch.setattr(celestrak, "calculate_fermi_gbm_coverage", fake_coverage)
+        celestrak.fermi_state_cache.invalidate()
+        trigger = datetime(2019, 4, 25, 8, 18, 26)
+        try:
+            first = celestrak.get_fermi_state(trigger)
+            assert celestrak.get_fermi_state(trigger) is first
+            assert calls == [trigger]
+            celestrak.get_fermi_state(trigger + timedelta(seconds=1))
+            assert len(calls) == 2
+        finally:
+            celestrak.fermi_state_cache.invalidate()
+
+    def test_failure_not_cached(self, monkeypatch):
+        """Test a failed calculation is retried on the next lookup."""
+        calls = []
+
+        def failing_coverage(datetime_obj):
+            calls.append(datetime_obj)
+            return None
+
+        monkeypatch.setattr(celestrak, "calculate_fermi_gbm_coverage", failing_coverage)
+        celestrak.fermi_state_cache.invalidate()
+        trigger = datetime(2019, 4, 25, 8, 18, 26)
+        assert celestrak.get_fermi_state(trigger) is None
+        assert celestrak.get_fermi_state(trigger) is None
+        assert len(calls) == 2
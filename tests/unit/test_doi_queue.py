@@ -0,0 +1,266 @@
+"""
+Test the DOI minting queue in server.utils.doi_queue and the resumable
+Zenodo deposition in server.utils.doi.
+These run against an in-memory SQLite database and need no server.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine, event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session, declarative_base
+from sqlalchemy.pool import StaticPool
+
+from server.db.models.doi_task import DOITask
+from server.utils import doi, doi_queue
+
+Base = declarative_base()
+
+
+class PointingRow(Base):
+    """Stand-in for Pointing, whose geography columns SQLite cannot create."""
+
+    __tablename__ = "pointing"
+    __table_args__ = {"schema": "public"}
+
+    id = Column(Integer, primary_key=True)
+    doi_id = Column(Integer)
+    doi_url = Column(String(100))
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    """SQLite engine with the doi_task table, used by the worker's sessions."""
+    engine = create_engine(
+        "sqlite://",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+
+    @event.listens_for(engine, "connect")
+    def attach_public(dbapi_connection, connection_record):
+        dbapi_connection.execute("ATTACH DATABASE ':memory:' AS public")
+
+    DOITask.__table__.create(engine)
+    Base.metadata.create_all(engine)
+
+    @contextmanager
+    def db_session():
+        with Session(engine) as db:
+            yield db
+
+    monkeypatch.setattr(doi_queue, "db_session", db_session)
+    monkeypatch.setattr(doi_queue, "Pointing", PointingRow)
+    return engine
+
+
+def add_task(engine, **fields) -> int:
+    """Insert a pointing DOI task and return its id."""
+    now = datetime.now()
+    values = dict(
+        target_type=doi_queue.TARGET_POINTINGS,
+        target_ids=[1],
+        payload={"graceid": "S190425z", "creators": [], "instrument_names": ["X"]},
+        status=doi_queue.STATUS_PENDING,
+        attempts=0,
+        next_attempt_at=now,
+        datecreated=now,
+        dateupdated=now,
+    )
+    values.update(fields)
+    with Session(engine) as db:
+        task = DOITask(**values)
+        db.add(task)
+        db.commit()
+        return task.id
+
+
+def get_task(engine, task_id: int) -> DOITask:
+    with Session(engine, expire_on_commit=False) as db:
+        return db.get(DOITask, task_id)
+
+
+class TestClaimDueTasks:
+    """Test which tasks the worker claims."""
+
+    def test_claim_query_skips_locked_rows(self, engine):
+        """Test claims lock rows with SKIP LOCKED so workers never share a task."""
+        with Session(engine) as db:
+            query = doi_queue.due_tasks_query(db, datetime.now(), 5)
+            sql = str(query.statement.compile(dialect=postgresql.dialect()))
+        assert "FOR UPDATE SKIP LOCKED" in sql
+
+    def test_claims_due_and_stale_tasks(self, engine):
+        """Test due pending and stale running tasks are claimed, others are not."""
+        now = datetime.now()
+        stale = now - doi_queue.DOI_TASK_STALE_AFTER - timedelta(minutes=1)
+        due = add_task(engine)
+        add_task(engine, next_attempt_at=now + timedelta(hours=1))
+        add_task(engine, status=doi_queue.STATUS_RUNNING, attempts=1)
+        taken_over = add_task(
+            engine, status=doi_queue.STATUS_RUNNING, attempts=1, dateupdated=stale
+        )
+        add_task(engine, status=doi_queue.STATUS_COMPLETED)
+
+        with Session(engine) as db:
+            claimed = doi_queue.claim_due_tasks(db)
+        assert sorted(claimed) == [due, taken_over]
+
+        assert get_task(engine, due).status == doi_queue.STATUS_RUNNING
+        assert get_task(engine, due).attempts == 1
+        assert get_task(engine, taken_over).attempts == 2
+        with Session(engine) as db:
+            assert doi_queue.claim_due_tasks(db) == []
+
+
+class TestProcessTask:
+    """Test retries, permanent failures and resumed depositions."""
+
+    def test_retry_delay(self):
+        """Test the backoff doubles per failure up to DOI_RETRY_MAX_SECONDS."""
+        base = doi_queue.DOI_RETRY_BASE_SECONDS
+        assert doi_queue.retry_delay(1) == timedelta(seconds=base)
+        assert doi_queue.retry_delay(3) == timedelta(seconds=base * 4)
+        assert doi_queue.retry_delay(50) == timedelta(
+            seconds=doi_queue.DOI_RETRY_MAX_SECONDS
+        )
+
+    def test_failure_is_retried_then_failed(self, engine, monkeypatch):
+        """Test failures back off until DOI_TASK_MAX_ATTEMPTS, then fail."""
+
+        def failing_mint(task, db):
+            raise RuntimeError("Zenodo unavailable")
+
+        monkeypatch.setattr(doi_queue, "_mint", failing_mint)
+        task_id = add_task(engine, status=doi_queue.STATUS_RUNNING, attempts=1)
+        doi_queue.process_task(task_id)
+
+        task = get_task(engine, task_id)
+        assert task.status == doi_queue.STATUS_PENDING
+        assert task.last_error == "Zenodo unavailable"
+        assert task.next_attempt_at > datetime.now() + timedelta(seconds=20)
+
+        task_id = add_task(
+            engine,
+            status=doi_queue.STATUS_RUNNING,
+            attempts=doi_queue.DOI_TASK_MAX_ATTEMPTS,
+        )
+        doi_queue.process_task(task_id)
+        assert get_task(engine, task_id).status == doi_queue.STATUS_FAILED
+
+    def test_retry_resumes_deposition(self, engine, monkeypatch):
+        """Test a retry after the deposition was created reuses it."""
+        calls = []
+
+        def fake_create_pointing_doi(
+            points, graceid, creators, instrument_names, deposition_id, on_created
+        ):
+            calls.append(deposition_id)
+            if deposition_id is None:
+                on_created(1234)
+                raise TimeoutError("publish timed out")
+            return deposition_id, "https://doi.org/10.5281/zenodo.1234"
+
+        monkeypatch.setattr(doi, "create_pointing_doi", fake_create_pointing_doi)
+        task_id = add_task(engine, status=doi_queue.STATUS_RUNNING, attempts=1)
+
+        doi_queue.process_task(task_id)
+        task = get_task(engine, task_id)
+        assert task.status == doi_queue.STATUS_PENDING
+        assert task.payload["deposition_id"] == 1234
+
+        doi_queue.process_task(task_id)
+        task = get_task(engine, task_id)
+        assert calls == [None, 1234]
+        assert task.status == doi_queue.STATUS_COMPLETED
+        assert task.doi_id == 1234
+
+
+class FakeResponse:
+    def __init__(self, body, status_code=200):
+        self.body = body
+        self.status_code = status_code
+
+    def json(self):
+        return self.body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakeZenodo:
+    """Records the Zenodo calls create_doi makes."""
+
+    def __init__(self, deposition):
+        self.deposition = deposition
+        self.calls = []
+
+    def _call(self, method, url, **kwargs):
+        self.calls.append((method, url.rsplit("depositions", 1)[1]))
+        if url.endswith("/actions/publish"):
+            return FakeResponse({"doi_url": "https://doi.org/10.5281/zenodo.7"})
+        return FakeResponse(self.deposition)
+
+    def get(self, url, **kwargs):
+        return self._call("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self._call("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self._call("PUT", url, **kwargs)
+
+
+class TestCreateDOI:
+    """Test create_doi creates a deposition once and resumes it afterwards."""
+
+    PAYLOAD = {
+        "data": {"metadata": {}},
+        "data_file": {"name": "completed_pointings_S190425z.json"},
+        "files": {"file": "[]"},
+        "headers": {"Content-Type": "application/json"},
+    }
+
+    def test_new_deposition_reports_its_id(self, monkeypatch):
+        """Test on_created gets the deposition id before the later steps."""
+        zenodo = FakeZenodo({"id": 7, "files": []})
+        monkeypatch.setattr(doi, "get_http_session", lambda: zenodo)
+        created = []
+
+        assert doi.create_doi(self.PAYLOAD, on_created=created.append) == (
+            7,
+            "https://doi.org/10.5281/zenodo.7",
+        )
+        assert created == [7]
+        assert [c[0] for c in zenodo.calls] == ["POST", "POST", "PUT", "POST"]
+
+    def test_resume_published_deposition(self, monkeypatch):
+        """Test a published deposition is only read back."""
+        zenodo = FakeZenodo(
+            {"id": 7, "submitted": True, "doi_url": "https://doi.org/x"}
+        )
+        monkeypatch.setattr(doi, "get_http_session", lambda: zenodo)
+
+        assert doi.create_doi(self.PAYLOAD, deposition_id=7) == (7, "https://doi.org/x")
+        assert zenodo.calls == [("GET", "/7")]
+
+    def test_resume_draft_deposition(self, monkeypatch):
+        """Test a draft skips the uploaded file and is published."""
+        zenodo = FakeZenodo(
+            {
+                "id": 7,
+                "submitted": False,
+                "files": [{"filename": "completed_pointings_S190425z.json"}],
+            }
+        )
+        monkeypatch.setattr(doi, "get_http_session", lambda: zenodo)
+
+        assert doi.create_doi(self.PAYLOAD, deposition_id=7)[0] == 7
+        assert zenodo.calls == [
+            ("GET", "/7"),
+            ("PUT", "/7"),
+            ("POST", "/7/actions/publish"),
+        ]
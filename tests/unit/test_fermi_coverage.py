@@ -0,0 +1,135 @@
+"""
+Test the Fermi GBM and LAT visibility MOCs and coverage caching in
+server.routes.ui.fermi_coverage.
+These run against the module directly and need no network or database.
+"""
+
+import math
+from datetime import datetime
+
+import astropy.units as u
+import pytest
+from mocpy import MOC
+
+from server.routes.ui import fermi_coverage
+from server.routes.ui.fermi_coverage import (
+    LAT_FOV_RADIUS,
+    cone_moc,
+    gbm_visibility_moc,
+    lat_fov_moc,
+    moc_to_json,
+)
+
+ORDER = 8
+
+
+def cap_fraction(radius: float) -> float:
+    """Sky fraction of a spherical cap of the given radius in degrees."""
+    return (1 - math.cos(math.radians(radius))) / 2
+
+
+def json_to_moc(moc_json) -> MOC:
+    """Parse the Aladin JSON form back into a MOC."""
+    return MOC.from_json(moc_json)
+
+
+class TestFermiCoverageMOCs:
+    """Test the cone, GBM and LAT MOCs."""
+
+    def test_cone_moc_sky_fraction(self):
+        """Test a cone covers the area of its spherical cap."""
+        for radius in [10, 65, 120]:
+            moc = cone_moc(30.0, -20.0, radius, ORDER)
+            assert math.isclose(moc.sky_fraction, cap_fraction(radius), rel_tol=0.01)
+            assert moc.contains_lonlat(30.0 * u.deg, -20.0 * u.deg)[0]
+
+    def test_moc_to_json_round_trip(self):
+        """Test the JSON form is normalised and parses back to the same MOC."""
+        moc = cone_moc(150.0, 45.0, 20, ORDER)
+        moc_json = moc_to_json(moc)
+        assert all(isinstance(cells, list) for cells in moc_json.values())
+        # Normalised: far fewer cells than one per order-8 pixel
+        assert sum(len(cells) for cells in moc_json.values()) < 2000
+        assert json_to_moc(moc_json) == moc
+
+    def test_gbm_visibility_is_earth_complement(self):
+        """Test GBM sees everything outside the Earth disk."""
+        earth_ra, earth_dec, earth_radius = 200.0, 10.0, 67.0
+        visible = json_to_moc(
+            gbm_visibility_moc(earth_ra, earth_dec, earth_radius, ORDER)
+        )
+        earth = cone_moc(earth_ra, earth_dec, earth_radius, ORDER)
+
+        assert math.isclose(
+            visible.sky_fraction, 1 - cap_fraction(earth_radius), rel_tol=0.01
+        )
+        assert visible.intersection(earth).empty()
+        assert visible.union(earth).sky_fraction == 1.0
+        # The point opposite the geocenter is visible
+        anti_ra, anti_dec = (earth_ra + 180) % 360, -earth_dec
+        assert visible.contains_lonlat(anti_ra * u.deg, anti_dec * u.deg)[0]
+        assert not visible.contains_lonlat(earth_ra * u.deg, earth_dec * u.deg)[0]
+
+    def test_lat_fov(self):
+        """Test the LAT field of view is a LAT_FOV_RADIUS cone."""
+        assert LAT_FOV_RADIUS == 65
+        fov = json_to_moc(lat_fov_moc(80.0, 60.0, ORDER))
+        assert fov == cone_moc(80.0, 60.0, LAT_FOV_RADIUS, ORDER)
+        assert math.isclose(
+            fov.sky_fraction, cap_fraction(LAT_FOV_RADIUS), rel_tol=0.01
+        )
+
+
+class TestCoverageCaching:
+    """Test coverage is cached only when built from a spacecraft state."""
+
+    STATE = {
+        "earth_ra": 200.0,
+        "earth_dec": 10.0,
+        "earth_radius": 67.0,
+        "spacecraft_lon": 0.0,
+        "spacecraft_lat": 0.0,
+        "spacecraft_elevation": 530.0,
+    }
+
+    @pytest.fixture
+    def storage(self, monkeypatch):
+        """Empty coverage cache with no pre-computed coverage in storage."""
+        stored = {}
+
+        def download_gwtm_file(*args, **kwargs):
+            raise FileNotFoundError("not in storage")
+
+        monkeypatch.setattr(fermi_coverage, "get_cached_file", lambda key, cfg: None)
+        monkeypatch.setattr(
+            fermi_coverage,
+            "set_cached_file",
+            lambda key, data, cfg: stored.__setitem__(key, data),
+        )
+        monkeypatch.setattr(fermi_coverage, "download_gwtm_file", download_gwtm_file)
+        monkeypatch.setattr(fermi_coverage.settings, "FERMI_MOC_ORDER", 3)
+        return stored
+
+    def test_no_state_is_not_cached(self, storage, monkeypatch):
+        """Test the no-data placeholders are returned but never cached."""
+        monkeypatch.setattr(fermi_coverage, "get_fermi_state", lambda t: None)
+        trigger = datetime(2019, 4, 25, 8, 18, 26)
+
+        overlays = fermi_coverage.grb_overlays("S190425z", trigger)
+        assert [o["name"] for o in overlays] == [
+            "Fermi in South Atlantic Anomaly",
+            "Fermi/LAT - No data",
+        ]
+        gbm = fermi_coverage.fermi_coverage("S190425z", "gbm", trigger)
+        assert gbm["overlays"][0]["json"] is None
+        assert storage == {}
+
+    def test_state_is_cached(self, storage, monkeypatch):
+        """Test overlays built from a spacecraft state are cached."""
+        monkeypatch.setattr(fermi_coverage, "get_fermi_state", lambda t: self.STATE)
+        trigger = datetime(2019, 4, 25, 8, 18, 26)
+
+        overlays = fermi_coverage.grb_overlays("S190425z", trigger)
+        assert [o["name"] for o in overlays] == ["Fermi/GBM", "Fermi/LAT"]
+        fermi_coverage.fermi_coverage("S190425z", "lat", trigger)
+        assert len(storage) == 2
@@ -0,0 +1,84 @@
+"""
+Test the Idempotency-Key expiry purge in server.utils.idempotency.
+These run against an in-memory SQLite database and need no server.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from server.db.models.idempotency_key import IdempotencyKey
+from server.utils import idempotency
+
+
+@pytest.fixture
+def db():
+    """SQLite session with the idempotency_key table."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+
+    @event.listens_for(engine, "connect")
+    def attach_public(dbapi_connection, connection_record):
+        dbapi_connection.execute("ATTACH DATABASE ':memory:' AS public")
+
+    IdempotencyKey.__table__.create(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def add_key(db, key: str, age: timedelta, status: str) -> None:
+    db.add(
+        IdempotencyKey(
+            userid=1,
+            endpoint="/pointings",
+            key=key,
+            request_hash="0" * 64,
+            status=status,
+            datecreated=datetime.now() - age,
+        )
+    )
+    db.commit()
+
+
+def remaining_keys(db) -> set:
+    return {k for (k,) in db.query(IdempotencyKey.key)}
+
+
+def test_purge_deletes_only_expired_keys(db):
+    ttl = idempotency.IDEMPOTENCY_KEY_TTL
+    add_key(db, "fresh", timedelta(minutes=1), idempotency.STATUS_COMPLETED)
+    add_key(db, "old-claim", timedelta(hours=1), idempotency.STATUS_PROCESSING)
+    add_key(db, "expired", ttl + timedelta(minutes=1), idempotency.STATUS_COMPLETED)
+    add_key(db, "expired-claim", ttl + timedelta(days=3), idempotency.STATUS_PROCESSING)
+
+    assert idempotency.purge_expired_idempotency_keys(db) == 2
+    assert remaining_keys(db) == {"fresh", "old-claim"}
+    assert idempotency.purge_expired_idempotency_keys(db) == 0
+
+
+def test_purge_runs_in_batches(db):
+    expired = idempotency.IDEMPOTENCY_KEY_TTL + timedelta(hours=1)
+    for i in range(7):
+        add_key(db, f"expired-{i}", expired, idempotency.STATUS_COMPLETED)
+    add_key(db, "fresh", timedelta(0), idempotency.STATUS_COMPLETED)
+
+    assert idempotency.purge_expired_idempotency_keys(db, batch_size=3) == 7
+    assert remaining_keys(db) == {"fresh"}
+
+
+def test_expired_key_is_claimed_again(db):
+    add_key(
+        db,
+        "reused",
+        idempotency.IDEMPOTENCY_KEY_TTL + timedelta(minutes=1),
+        idempotency.STATUS_COMPLETED,
+    )
+
+    stored = idempotency.claim_idempotency_key("reused", "/pointings", 1, "1" * 64, db)
+
+    assert stored is None
+    record = db.query(IdempotencyKey).one()
+    assert record.status == idempotency.STATUS_PROCESSING
+    assert record.request_hash == "1" * 64
@@ -0,0 +1,89 @@
+"""
+Test the streaming record parsers in server.routes.pointing.upload_pointings.
+These feed the parsers a fake request body and need no server.
+"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from server.routes.pointing import upload_pointings
+from server.routes.pointing.upload_pointings import (
+    _describe,
+    _iter_csv_records,
+    _iter_ndjson_records,
+)
+
+
+class FakeRequest:
+    """Request whose body arrives in the given pieces."""
+
+    def __init__(self, *pieces: bytes):
+        self.pieces = pieces
+
+    async def stream(self):
+        for piece in self.pieces:
+            yield piece
+
+
+def collect(records) -> list:
+    async def run():
+        return [record async for record in records]
+
+    return asyncio.run(run())
+
+
+class TestCSVRecords:
+    """Test CSV rows are parsed by one reader across the streamed body."""
+
+    def test_quoted_newlines(self):
+        """Test quoted fields keep their newlines, even across body pieces."""
+        request = FakeRequest(
+            b'ra,dec,band\n1.0,2.0,"multi\n',
+            b'\nline"\n\n3.0,,"say ""hi"""\n',
+        )
+        assert collect(_iter_csv_records(request)) == [
+            {"ra": "1.0", "dec": "2.0", "band": "multi\n\nline"},
+            {"ra": "3.0", "dec": None, "band": 'say "hi"'},
+        ]
+
+    def test_crlf_and_no_trailing_newline(self):
+        """Test CRLF line endings and a last row without a newline."""
+        request = FakeRequest(b"ra,dec\r\n1.0,2.0\r\n3.0,4.0")
+        assert collect(_iter_csv_records(request)) == [
+            {"ra": "1.0", "dec": "2.0"},
+            {"ra": "3.0", "dec": "4.0"},
+        ]
+
+    def test_invalid_utf8_and_unterminated_quote(self):
+        """Test bad rows are reported as records with an _error."""
+        request = FakeRequest(b'ra,dec\n\xff,1\n1.0,"open\n')
+        records = collect(_iter_csv_records(request))
+        assert "Invalid UTF-8" in records[0]["_error"]
+        assert records[1]["_error"] == "Unterminated quoted CSV field"
+
+    def test_unterminated_quote_is_bounded(self, monkeypatch):
+        """Test an open quoted field cannot buffer more than one line's limit."""
+        monkeypatch.setattr(upload_pointings, "UPLOAD_MAX_LINE_BYTES", 64)
+        request = FakeRequest(b'ra\n"' + b"x" * 40 + b"\n" + b"x" * 40 + b"\n")
+        with pytest.raises(HTTPException):
+            collect(_iter_csv_records(request))
+
+
+class TestNDJSONRecords:
+    """Test NDJSON lines are parsed one by one."""
+
+    def test_records_and_errors(self):
+        """Test objects, blank lines, bad JSON and non-objects."""
+        request = FakeRequest(b'{"ra": 1}\n\n  \nnot json\n[1]\n{"ra"', b": 2}")
+        records = collect(_iter_ndjson_records(request))
+        assert records[0] == {"ra": 1}
+        assert records[1]["_error"].startswith("Invalid JSON")
+        assert records[2] == {"_raw": "[1]"}
+        assert records[3] == {"ra": 2}
+
+    def test_error_record_is_truncated(self):
+        """Test ERRORS quote a bounded prefix of a rejected record."""
+        text = _describe({"band": "x" * 10000})
+        assert len(text) < 250 and text.endswith("...")